@@ -0,0 +1,19 @@
+// Enlace CTA: abrir /reservar/?email=...&tipo=kit (la URL viene en data-url)
+document.addEventListener('DOMContentLoaded', function(){
+  var btn = document.getElementById('cta-reserve');
+  var input = document.getElementById('cta-email');
+  if(btn){
+    btn.addEventListener('click', function(){
+      var email = input.value || '';
+      window.location.href = btn.dataset.url + (email ? ('?email=' + encodeURIComponent(email) + '&tipo=kit') : '?tipo=kit');
+    });
+  }
+  // También permitir presionar Enter en el input
+  if(input){
+    input.addEventListener('keypress', function(e){
+      if(e.key === 'Enter'){
+        btn.click();
+      }
+    });
+  }
+});
@@ -0,0 +1,58 @@
+// Resumen de la reserva: título, precio, depósito y texto del botón según `tipo`.
+// Los precios vienen del catálogo (Producto) en <script id="catalogo-precios">.
+document.addEventListener('DOMContentLoaded', function(){
+  const chosenTitle = document.getElementById('chosen-title');
+  const datos = document.getElementById('catalogo-precios');
+  if(!chosenTitle || !datos) return; // solo en /reservar/
+  const catalogo = JSON.parse(datos.textContent);
+  const tipoSelect = document.querySelector('select[name="tipo"]');
+  const chosenPrice = document.getElementById('chosen-price');
+  const depositDisplay = document.getElementById('deposit-amount');
+  const submitBtn = document.getElementById('reservar-submit');
+  function updateChosen(){
+    const v = getTipoValue();
+    const producto = v && catalogo[v];
+    if(!producto) return; // nothing selected yet
+    const deposit = producto.deposito;
+    chosenTitle.textContent = producto.titulo;
+    if(chosenPrice) chosenPrice.textContent = producto.precio;
+    if(depositDisplay) depositDisplay.textContent = deposit;
+    if(submitBtn){
+      if(producto.sin_deposito){
+        submitBtn.innerText = 'Solicitar piloto empresarial';
+      } else {
+        submitBtn.innerText = 'Reservar y pagar depósito reembolsable ' + deposit;
+      }
+    }
+  }
+  // soporte para select o radios
+  function getTipoValue(){
+    if(tipoSelect) return tipoSelect.value;
+    // buscar radios
+    const radios = document.querySelectorAll('input[name="tipo"]');
+    if(radios && radios.length){
+      for(const r of radios){ if(r.checked) return r.value }
+      return radios[0].value;
+    }
+    return null;
+  }
+
+  // delegate change events: handle select or radio changes reliably
+  document.addEventListener('change', function(e){
+    const t = e.target;
+    if(!t) return;
+    if(t.name === 'tipo'){
+      updateChosen();
+    }
+  });
+
+  // inicializar con el valor actual (respects select or radio)
+  updateChosen();
+
+  // adicional: poll para detectar cambios en casos edge (render diferentes)
+  let lastTipo = getTipoValue();
+  setInterval(function(){
+    const cur = getTipoValue();
+    if(cur !== lastTipo){ lastTipo = cur; updateChosen(); }
+  }, 250);
+});
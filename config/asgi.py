@@ -13,4 +13,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+from landing.preload import EarlyHints  # noqa: E402 (necesita Django configurado)
+
+# 103 Early Hints en servidores ASGI que lo soportan (ver landing/preload.py)
+application = EarlyHints(get_asgi_application())
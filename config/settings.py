@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,7 +50,7 @@ else:
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'landing.apps.LandingAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -59,14 +60,25 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # primero: latencia y códigos de estado de la petición completa (/metrics)
+    'landing.middleware.MetricasPrometheusMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise con soporte async (ver EstaticosMiddleware)
+    'landing.middleware.EstaticosMiddleware',
+    # 503 barato para home/empresas si el worker está saturado (LANDING_ADMISION)
+    'landing.admision.AdmisionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    # 429 para los POST que exceden LANDING_RATELIMIT, antes de CSRF y formularios
+    'landing.limites.RateLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Link: rel=preload precalculado por página (landing/preload.py)
+    'landing.preload.PreloadMiddleware',
+    # al final: mide consultas, SQL, plantillas y vista por nombre de URL
+    'landing.middleware.PresupuestoSQLMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -89,6 +101,88 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Vistas async de la landing (las activa start.sh con DJANGO_SERVER_MODE=asgi)
+LANDING_ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS', 'False').lower() in ('1', 'true', 'yes')
+
+# Write-behind: los POST de reservar/feedback se anotan en un journal en disco
+# y se vuelcan a la BD por lotes (ver landing/journal.py). En Render el
+# directorio debe estar en el disco persistente (/opt/render/data/journal).
+LANDING_WRITE_BEHIND = os.getenv('DJANGO_WRITE_BEHIND', 'False').lower() in ('1', 'true', 'yes')
+LANDING_JOURNAL_DIR = os.getenv('DJANGO_JOURNAL_DIR') or (BASE_DIR / 'journal')
+LANDING_JOURNAL_FLUSH_SECONDS = float(os.getenv('DJANGO_JOURNAL_FLUSH_SECONDS', '1'))
+LANDING_JOURNAL_BATCH = 500
+
+# Presupuesto de SQL por vista (nombre de URL, opcionalmente con método:
+# 'POST landing:reservar'). Al excederlo se loguea un warning con las consultas.
+# Son los peores casos medidos (landing/tests/test_presupuestos.py): los POST
+# hacen 5 consultas (INSERT, BEGIN, 2 UPDATE de Metrica y el upsert de los
+# buckets de Resumen, también en la primera de la hora) y 8 si faltan filas
+# de Metrica (INSERT de las que faltan y sus 2 UPDATE).
+LANDING_SQL_BUDGETS = {
+    'landing:home': {'queries': 3, 'sql_ms': 25},
+    'GET landing:reservar': {'queries': 0},
+    'POST landing:reservar': {'queries': 8, 'sql_ms': 50},
+    'landing:feedback': {'queries': 8, 'sql_ms': 50},
+    'landing:empresas': {'queries': 0},
+    'landing:gracias': {'queries': 0},
+    # sesión + usuario del admin y, sin cache, cuatro lecturas de rollups
+    'admin:landing_dashboard': {'queries': 6, 'sql_ms': 50},
+    '*': {'queries': 20, 'sql_ms': 200},
+}
+# Métricas Prometheus en /metrics: un archivo mmap por proceso en este
+# directorio (se limpia al arrancar gunicorn). Con token, se exige
+# 'Authorization: Bearer <token>'; sin token solo responde con DEBUG (404 en
+# producción).
+LANDING_METRICS_DIR = os.getenv('DJANGO_METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'teclafacil-metrics')
+LANDING_METRICS_TOKEN = os.getenv('DJANGO_METRICS_TOKEN', '')
+
+# Rate limiting de POST (landing/limites.py): por vista, bucket por IP y
+# global como (capacidad, tokens por segundo). El estado es un mmap
+# compartido por los workers en LANDING_RATELIMIT_DIR. Con
+# LANDING_RATELIMIT_PROXIES > 0 la IP sale de X-Forwarded-For (Render: 1).
+LANDING_RATELIMIT = {
+    'landing:reservar': {'ip': (5, 1 / 60), 'global': (60, 2.0)},
+    'landing:feedback': {'ip': (3, 1 / 60), 'global': (30, 1.0)},
+}
+LANDING_RATELIMIT_DIR = os.getenv('DJANGO_RATELIMIT_DIR') or os.path.join(tempfile.gettempdir(), 'teclafacil-ratelimit')
+LANDING_RATELIMIT_PROXIES = int(os.getenv('DJANGO_TRUSTED_PROXIES', '1' if os.getenv('RENDER') else '0'))
+
+# Hilos por worker de gunicorn (start.sh pasa --threads; con más de uno usa
+# gthread). Con workers sync cada uno atiende una petición a la vez.
+LANDING_WORKER_THREADS = int(os.getenv('DJANGO_WORKER_THREADS', '1'))
+if os.getenv('DJANGO_SERVER_MODE', 'wsgi') == 'asgi':
+    # uvicorn no pone tope a las peticiones simultáneas de un worker
+    _MAX_EN_CURSO = 8
+else:
+    # saturado = todos los hilos ocupados; con un solo hilo nunca hay más de
+    # una en curso y el umbral queda desactivado (decide la latencia)
+    _MAX_EN_CURSO = LANDING_WORKER_THREADS - 1
+
+# Control de admisión (landing/admision.py): si el worker tiene más de
+# `max_en_curso` peticiones en curso, su latencia reciente (EWMA, segundos,
+# solo de las vistas de `medidas`) pasa de `max_latencia` o la petición
+# esperó más de `max_espera` en la cola del proxy (X-Request-Start), los GET
+# de `rutas` reciben un 503 con Retry-After. Un umbral en 0 queda
+# desactivado. Los POST siempre pasan.
+LANDING_ADMISION = {
+    'rutas': ('landing:home', 'landing:empresas'),
+    # las páginas de la landing; el admin, los exports, /metrics y las
+    # descargas tienen otra latencia y no deben disparar descartes
+    'medidas': ('landing:home', 'landing:empresas', 'landing:reservar', 'landing:gracias', 'landing:feedback'),
+    'max_en_curso': int(os.getenv('DJANGO_ADMISION_MAX_EN_CURSO', str(_MAX_EN_CURSO))),
+    'max_latencia': float(os.getenv('DJANGO_ADMISION_MAX_LATENCIA', '1.5')),
+    'max_espera': float(os.getenv('DJANGO_ADMISION_MAX_ESPERA', '5')),
+    'vida_media': 5.0,
+    'retry_after': 5,
+}
+
+# Dashboard del admin (/admin/landing/dashboard/): segundos que se reutiliza
+# lo calculado desde los rollups y los contadores de /metrics
+LANDING_DASHBOARD_CACHE_SECONDS = 60
+
+# Header Server-Timing con sql/tpl/view en cada respuesta
+LANDING_SERVER_TIMING = os.getenv('DJANGO_SERVER_TIMING', str(DEBUG)).lower() in ('1', 'true', 'yes')
+
 
 # Database
 # Try to get DATABASE_URL (Postgres) from env, otherwise fall back to SQLite
@@ -97,6 +191,15 @@ if DATABASE_URL:
     DATABASES = {
         'default': dj_database_url.parse(DATABASE_URL, conn_max_age=600),
     }
+    # Pool por proceso: DATABASE_URL=postgres://...?pool=true&pool_max_size=5
+    # (más pool_timeout, pool_max_lifetime, pool_max_idle, pool_pre_ping; ver
+    # landing/backends/postgresql). Cada petición devuelve su conexión al pool.
+    _opciones_db = DATABASES['default'].get('OPTIONS', {})
+    if (
+        DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql'
+        and str(_opciones_db.get('pool', '')).lower() in ('1', 'true', 'yes')
+    ):
+        DATABASES['default'].update({'ENGINE': 'landing.backends.postgresql', 'CONN_MAX_AGE': 0})
 else:
     # If on Render with a persistent disk, you can set DJANGO_SQLITE_PATH to
     # /opt/render/data/db.sqlite3 and it will be used for SQLite storage.
@@ -107,6 +210,40 @@ else:
             'NAME': SQLITE_PATH,
         }
     }
+    # Perfil de producción: los 3 workers de gunicorn comparten el archivo.
+    # WAL deja leer mientras otro escribe; ver landing/backends/sqlite3.
+    # Opt-in con DJANGO_SQLITE_PROFILE=True (Render lo activa, ver README_deploy.md);
+    # landing/tests/test_concurrencia.py lo prueba con escritores en paralelo.
+    LANDING_SQLITE_PROFILE = {
+        'ENGINE': 'landing.backends.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -32000,  # KiB
+                'temp_store': 'MEMORY',
+                'busy_timeout': 5000,  # ms
+            },
+            'transaction_mode': 'IMMEDIATE',
+            'lock_retries': 5,
+            'lock_backoff': 0.05,
+        },
+    }
+    if os.getenv('DJANGO_SQLITE_PROFILE', 'False').lower() in ('1', 'true', 'yes'):
+        DATABASES['default'].update(LANDING_SQLITE_PROFILE)
+
+
+# Cache
+# Debe ser compartido entre los workers de gunicorn (fragmentos y versiones
+# se invalidan desde cualquier proceso). Por defecto: cache en disco local.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION') or os.path.join(tempfile.gettempdir(), 'teclafacil-cache'),
+    }
+}
 
 
 # Password validation
@@ -149,6 +286,51 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Use WhiteNoise to serve static files in production
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    # variantes AVIF/WebP de LANDING_IMAGENES, generadas al correr collectstatic
+    'landing.imagenes.VariantesFinder',
+    # landing/bundle.css y landing/bundle.js (LANDING_BUNDLES)
+    'landing.bundles.BundlesFinder',
+]
+
+# Bundles generados por landing/bundles.py: nombre estático -> fuentes, que se
+# buscan en LANDING_ASSETS_DIR y luego en los estáticos. Las de
+# LANDING_BUNDLES_PURGAR se recortan a las clases/ids que usan las plantillas.
+LANDING_ASSETS_DIR = BASE_DIR / 'assets'
+LANDING_BUNDLES = {
+    'landing/bundle.css': ['vendor/bootstrap-5.3.2/bootstrap.min.css', 'landing/styles.css'],
+    'landing/bundle.js': ['js/cta.js', 'js/reservar.js'],
+}
+LANDING_BUNDLES_PURGAR = {'vendor/bootstrap-5.3.2/bootstrap.min.css'}
+LANDING_BUNDLES_DIR = BASE_DIR / 'build' / 'bundles'
+
+# Imágenes con variantes responsivas ({% responsive_image %}): ruta estática ->
+# anchos en px a generar. Se generan en LANDING_IMAGENES_DIR (incremental).
+LANDING_IMAGENES = {
+    'landing/img.png': (480, 768, 1088),
+    'landing/img_1.png': (400, 752),
+    # se muestra con 70px de alto: 1x, 2x y 3x
+    'landing/logoTeclaFacil.png': (70, 140, 210),
+}
+LANDING_IMAGENES_DIR = BASE_DIR / 'build' / 'imagenes'
+
+# Hojas cuyo CSS crítico se inserta en línea por página ({% critical_css %});
+# `manage.py build_critical_css` lo genera en LANDING_CRITICAL_CSS_DIR.
+LANDING_CRITICAL_CSS = ['landing/bundle.css']
+LANDING_CRITICAL_CSS_DIR = BASE_DIR / 'build' / 'critico'
+# por página; por encima de esto build_critical_css falla (el bundle completo pesa ~35 KB)
+LANDING_CRITICAL_CSS_MAX_BYTES = 16 * 1024
+
+# Archivos grandes servidos por /descargas/<nombre> (landing/descargas.py):
+# nombre público -> ruta estática. Las descargas se cuentan en Metrica desde
+# un hilo por worker cada LANDING_DESCARGAS_FLUSH_SECONDS.
+LANDING_DESCARGAS = {
+    'teclafacil.pdf': 'landing/teclafacil.pdf',
+}
+LANDING_DESCARGAS_MAX_AGE = 7 * 24 * 3600
+LANDING_DESCARGAS_FLUSH_SECONDS = float(os.getenv('DJANGO_DESCARGAS_FLUSH_SECONDS', '5'))
 
 # If behind a proxy like Render, honor X-Forwarded-Proto header for request.is_secure()
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -157,3 +339,7 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# `manage.py test` escribe lo generado (bundles, variantes, CSS crítico, cache,
+# buckets) en un directorio temporal y no en build/ ni en /tmp compartido
+TEST_RUNNER = 'landing.tests.runner.LandingTestRunner'
@@ -0,0 +1,39 @@
+# Configuración de gunicorn (start.sh la carga con -c).
+import os
+
+
+def on_starting(server):
+    # arranque limpio de los contadores de /metrics (archivos mmap por worker)
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    django.setup()
+    from landing import prometheus
+
+    prometheus.limpiar()
+
+
+def post_worker_init(worker):
+    # cada worker precalienta plantillas, URLs y conexión a BD antes de
+    # empezar a atender peticiones
+    from django.conf import settings
+    from landing.warmup import warmup
+
+    resumen = warmup()
+    worker.log.info('[warmup] worker %s listo: %s', worker.pid, resumen)
+
+    if settings.LANDING_WRITE_BEHIND:
+        # vuelca también lo que dejen workers caídos aunque no lleguen POST nuevos
+        from landing import journal
+
+        journal.iniciar_flusher()
+
+
+def worker_exit(server, worker):
+    # descargas contadas en memoria que el hilo aún no volcó a Metrica
+    from landing import descargas
+
+    try:
+        descargas.volcar()
+    except Exception:
+        worker.log.exception('[descargas] no se pudieron volcar los contadores')
@@ -1,10 +1,39 @@
 from django.contrib import admin
-from .models import Reserva
+from .export import respuesta
+from .models import Feedback, Producto, Reserva
+from .search import BusquedaIndexadaMixin
+
+
+@admin.action(description='Exportar seleccionados a CSV')
+def exportar_csv(modeladmin, request, queryset):
+    return respuesta(queryset, 'csv')
+
+
+@admin.action(description='Exportar seleccionados a NDJSON')
+def exportar_ndjson(modeladmin, request, queryset):
+    return respuesta(queryset, 'ndjson')
 
 
 @admin.register(Reserva)
-class ReservaAdmin(admin.ModelAdmin):
+class ReservaAdmin(BusquedaIndexadaMixin, admin.ModelAdmin):
     list_display = ('nombre', 'email', 'tipo', 'deposito', 'creado')
     list_filter = ('tipo', 'creado')
     search_fields = ('nombre', 'email')
+    ordering = ('-creado',)
+    actions = (exportar_csv, exportar_ndjson)
+
+
+@admin.register(Feedback)
+class FeedbackAdmin(BusquedaIndexadaMixin, admin.ModelAdmin):
+    list_display = ('nombre', 'email', 'rating', 'creado')
+    list_filter = ('rating', 'creado')
+    search_fields = ('nombre', 'email', 'comentario')
+    ordering = ('-creado',)
+    actions = (exportar_csv, exportar_ndjson)
+
 
+@admin.register(Producto)
+class ProductoAdmin(admin.ModelAdmin):
+    # los cambios llegan a todos los workers en ~1 s (landing.catalogo)
+    list_display = ('tipo', 'titulo', 'precio', 'deposito')
+    list_editable = ('precio', 'deposito')
@@ -0,0 +1,185 @@
+"""
+Control de admisión: descarta páginas no críticas cuando el worker se satura.
+
+Cada proceso lleva la cuenta de peticiones en curso y un promedio móvil
+(EWMA) de la latencia de las páginas de la landing que admitió
+(LANDING_ADMISION['medidas']: el admin, los exports y las descargas no
+cuentan); el promedio decae con vida media
+LANDING_ADMISION['vida_media'] mientras no se completen peticiones, para que
+después de un pico el worker vuelva a admitir solo. Si un proxy agrega la
+hora de llegada (`X-Request-Start: t=<epoch>`), también se mide cuánto
+esperó la petición en la cola del socket.
+
+Cuando se cruza algún umbral, los GET/HEAD de LANDING_ADMISION['rutas']
+(home, empresas) reciben un 503 fijo con Retry-After y sin tocar plantillas
+ni base de datos; el resto (los POST de reservar, el admin, /metrics) se
+atiende siempre. Con workers sync cada uno tiene a lo sumo una petición en
+curso, así que ahí `max_en_curso` viene desactivado (settings lo deriva de
+LANDING_WORKER_THREADS y del modo de servidor) y el indicador útil es la
+latencia/espera: responder barato a lo descartable vacía el backlog antes de
+que el proxy de Render corte por timeout.
+"""
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+from . import prometheus
+
+MOTIVOS = prometheus.MOTIVOS_ADMISION
+# peso de cada petición nueva en el promedio de latencia
+ALFA = 0.2
+
+CUERPO_503 = (
+    '<!doctype html><html lang="es"><head><meta charset="utf-8">'
+    '<meta name="viewport" content="width=device-width, initial-scale=1">'
+    '<title>TeclaFácil</title></head><body style="font-family:sans-serif;text-align:center;padding:3rem 1rem">'
+    '<h1>Estamos con mucha demanda</h1><p>Vuelve a intentar en unos segundos.</p>'
+    '<p><a href="/reservar/">Reservar tu TeclaFácil</a></p></body></html>\n'
+).encode()
+
+
+class _Estado:
+    """Peticiones en curso y latencia reciente de este proceso."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.en_curso = 0
+        self.latencia = 0.0
+        self.actualizado = 0.0
+
+    def entrar(self):
+        with self.lock:
+            self.en_curso += 1
+            return self.en_curso
+
+    def salir(self, segundos=None):
+        with self.lock:
+            self.en_curso -= 1
+            if segundos is not None:
+                ahora = time.monotonic()
+                self.latencia = self._latencia(ahora) * (1 - ALFA) + segundos * ALFA
+                self.actualizado = ahora
+            return self.en_curso
+
+    def _latencia(self, ahora):
+        vida_media = settings.LANDING_ADMISION['vida_media']
+        return self.latencia * 0.5 ** ((ahora - self.actualizado) / vida_media)
+
+    def latencia_reciente(self):
+        with self.lock:
+            return self._latencia(time.monotonic())
+
+
+estado = _Estado()
+
+
+def espera_en_cola(request):
+    """Segundos desde que el proxy recibió la petición (X-Request-Start), o None."""
+    valor = request.META.get('HTTP_X_REQUEST_START', '')
+    try:
+        inicio = float(valor[2:] if valor.startswith('t=') else valor)
+    except ValueError:
+        return None
+    # nginx manda segundos con decimales; otros proxies, ms o µs
+    if inicio > 1e14:
+        inicio /= 1e6
+    elif inicio > 1e11:
+        inicio /= 1e3
+    return max(0.0, time.time() - inicio)
+
+
+def motivo_descarte(request, en_curso):
+    """Primer umbral de LANDING_ADMISION cruzado (ver MOTIVOS), o None."""
+    config = settings.LANDING_ADMISION
+    if config['max_en_curso'] and en_curso > config['max_en_curso']:
+        return 'en_curso'
+    if config['max_latencia'] and estado.latencia_reciente() > config['max_latencia']:
+        return 'latencia'
+    if config['max_espera']:
+        espera = espera_en_cola(request)
+        if espera is not None and espera > config['max_espera']:
+            return 'espera'
+    return None
+
+
+def respuesta_503():
+    response = HttpResponse(CUERPO_503, status=503, content_type='text/html; charset=utf-8')
+    response['Retry-After'] = str(settings.LANDING_ADMISION['retry_after'])
+    # que ningún CDN guarde la página de sobrecarga
+    response['Cache-Control'] = 'no-store'
+    # bajo sobrecarga no se escribe un log de error por cada descarte (ya están en /metrics)
+    response._has_been_logged = True
+    return response
+
+
+class AdmisionMiddleware:
+    """
+    Cuenta las peticiones en curso y la latencia de las páginas medidas, y
+    en process_view descarta con 503 las rutas no críticas si el worker está
+    saturado. Va después de MetricasPrometheusMiddleware (los 503 quedan en
+    /metrics) y de WhiteNoise (los estáticos no cuentan).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django adapta process_view al modo del handler: la versión
+            # async evita un salto de hilo por petición
+            self.process_view = self._aprocess_view
+        self.rutas = frozenset(settings.LANDING_ADMISION['rutas'])
+        self.medidas = frozenset(settings.LANDING_ADMISION['medidas'])
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        prometheus.registrar_en_curso(estado.entrar())
+        inicio = time.perf_counter()
+        segundos = None
+        try:
+            response = self.get_response(request)
+            segundos = self._latencia(request, inicio)
+            return response
+        finally:
+            prometheus.registrar_en_curso(estado.salir(segundos))
+
+    async def __acall__(self, request):
+        prometheus.registrar_en_curso(estado.entrar())
+        inicio = time.perf_counter()
+        segundos = None
+        try:
+            response = await self.get_response(request)
+            segundos = self._latencia(request, inicio)
+            return response
+        finally:
+            prometheus.registrar_en_curso(estado.salir(segundos))
+
+    @staticmethod
+    def _latencia(request, inicio):
+        if getattr(request, '_landing_medida', False) and not getattr(request, '_landing_descartada', False):
+            return time.perf_counter() - inicio
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        vista = request.resolver_match.view_name
+        request._landing_medida = vista in self.medidas
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if vista not in self.rutas:
+            return None
+        motivo = motivo_descarte(request, estado.en_curso)
+        if motivo is None:
+            return None
+        request._landing_descartada = True
+        prometheus.registrar_descarte(vista, motivo)
+        return respuesta_503()
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return AdmisionMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
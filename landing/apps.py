@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.contrib.admin.apps import AdminConfig
 
 
 class LandingConfig(AppConfig):
@@ -6,3 +7,11 @@ class LandingConfig(AppConfig):
     name = 'landing'
     verbose_name = 'Landing TeclaFácil'
 
+    def ready(self):
+        # registrar señales que mantienen las métricas desnormalizadas
+        from . import signals  # noqa: F401
+
+
+class LandingAdminConfig(AdminConfig):
+    # admin con el dashboard de la landing (reemplaza a django.contrib.admin)
+    default_site = 'landing.sites.LandingAdminSite'
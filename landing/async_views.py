@@ -0,0 +1,88 @@
+"""
+Versiones async de las vistas de la landing, para servir con un worker ASGI
+(`DJANGO_SERVER_MODE=asgi` en start.sh). Reutilizan los helpers de
+`views` y solo cambian el acceso a la base de datos por el ORM async.
+
+Límites en Django 4.2: el ORM async pasa cada consulta por
+sync_to_async(thread_sensitive=True), así que las consultas de una petición
+corren una tras otra en un mismo hilo (no bloquean el event loop, pero no
+van en paralelo). Los middlewares de la landing aceptan los dos modos y no
+cambian de hilo; los de Django (sesiones, CSRF, auth, mensajes, ...) sí
+ejecutan su process_request/process_response en un hilo, y Django también
+renderiza ahí las TemplateResponse.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import reverse
+
+from . import catalogo, journal, views
+from .conditional import acondition, catalogo_etag, catalogo_last_modified, home_etag
+from .forms import ReservaForm
+from .models import Feedback, Metrica
+
+
+async def _stats_home():
+    return views._stats_desde(await Metrica.objects.aleer(*views.CLAVES_HOME))
+
+
+async def _testimonios():
+    return [fb async for fb in views._testimonios()]
+
+
+@acondition(etag_func=home_etag)
+async def home(request):
+    # la plantilla recibe datos ya evaluados porque no puede consultar el
+    # ORM desde el event loop
+    stats = await _stats_home()
+    published_feedbacks = await _testimonios()
+    actual = await sync_to_async(catalogo.obtener)()
+    context = {
+        'stats': stats,
+        'cta_email': request.GET.get('email', ''),
+        'published_feedbacks': published_feedbacks,
+        'catalogo': actual.productos,
+        'fb_error': request.GET.get('fb_error', ''),
+    }
+    return TemplateResponse(request, 'landing/home.html', context)
+
+
+async def reservar(request):
+    if request.method == 'POST':
+        form = ReservaForm(request.POST)
+        if form.is_valid():
+            if settings.LANDING_WRITE_BEHIND:
+                await sync_to_async(journal.anotar)('reserva', form.cleaned_data)
+            else:
+                # Reserva.save() toma el depósito del catálogo
+                await form.save(commit=False).asave()
+            return redirect(reverse('landing:gracias'))
+    else:
+        form = views._form_inicial(request)
+    # el catálogo puede tener que recargarse desde la base
+    contexto = await sync_to_async(views._contexto_reservar)(request, form)
+    return TemplateResponse(request, 'landing/reservar.html', contexto)
+
+
+@acondition(
+    etag_func=catalogo_etag('landing/empresas.html', 'landing/base.html'),
+    last_modified_func=catalogo_last_modified('landing/empresas.html', 'landing/base.html'),
+)
+async def empresas(request):
+    actual = await sync_to_async(catalogo.obtener)()
+    return TemplateResponse(request, 'landing/empresas.html', {'catalogo': actual.productos})
+
+
+async def feedback(request):
+    if request.method == 'POST':
+        datos = views._datos_feedback(request)
+        # nombre obligatorio para publicar feedback
+        if not datos['nombre']:
+            return redirect(reverse('landing:home') + '?fb_error=1')
+        if datos['rating'] and 1 <= datos['rating'] <= 5:
+            if settings.LANDING_WRITE_BEHIND:
+                await sync_to_async(journal.anotar)('feedback', datos)
+            else:
+                await Feedback.objects.acreate(**datos)
+    return redirect(reverse('landing:home'))
@@ -0,0 +1,70 @@
+"""
+Backend PostgreSQL (psycopg2) con pool de conexiones por proceso.
+
+Se activa con `?pool=true` en DATABASE_URL (ver config/settings.py); el
+resto de los parámetros `pool_*` de la URL configuran el pool:
+`pool_max_size`, `pool_timeout`, `pool_max_lifetime`, `pool_max_idle` (en
+segundos) y `pool_pre_ping`. Con CONN_MAX_AGE=0 Django "cierra" la conexión
+al terminar cada petición, lo que aquí la devuelve al pool.
+"""
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.creation import DatabaseCreation as BaseDatabaseCreation
+
+from .pool import cerrar_pools, pool_para
+
+# nombre en OPTIONS / DATABASE_URL -> (argumento del Pool, conversión)
+OPCIONES_POOL = {
+    'pool_max_size': ('max_size', int),
+    'pool_timeout': ('timeout', float),
+    'pool_max_lifetime': ('max_lifetime', float),
+    'pool_max_idle': ('max_idle', float),
+    'pool_pre_ping': ('pre_ping', lambda v: str(v).lower() in ('1', 'true', 'yes')),
+}
+
+
+class DatabaseCreation(BaseDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # DROP DATABASE falla si quedan conexiones libres en el pool
+        cerrar_pools(lambda clave: clave[1] == test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def _clave_pool(self):
+        s = self.settings_dict
+        return (self.alias, s['NAME'], s['HOST'], s['PORT'], s['USER'])
+
+    @property
+    def pool(self):
+        opciones = self.settings_dict['OPTIONS']
+        config = {
+            argumento: convertir(opciones[nombre])
+            for nombre, (argumento, convertir) in OPCIONES_POOL.items()
+            if nombre in opciones
+        }
+        return pool_para(self._clave_pool(), **config)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        for nombre in OPCIONES_POOL:
+            params.pop(nombre, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        crear = super().get_new_connection
+        conexion = self.pool.obtener(lambda: crear(conn_params))
+        # super() fija isolation_level solo al crear; al reusar se recalcula igual
+        nivel = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = base.IsolationLevel(nivel) if nivel is not None else base.IsolationLevel.READ_COMMITTED
+        return conexion
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.devolver(self.connection)
+
+    def estadisticas_pool(self):
+        return self.pool.estadisticas()
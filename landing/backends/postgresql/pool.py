@@ -0,0 +1,202 @@
+"""
+Pool de conexiones psycopg2 por proceso (y por base de datos).
+
+Acotado (`max_size`): si todas están en uso, `obtener` espera hasta
+`timeout` segundos y luego falla. Las conexiones libres se entregan en orden
+LIFO, así las que sobran quedan al fondo y se cierran al superar `max_idle`;
+ninguna vive más de `max_lifetime`. Con `pre_ping` se valida cada conexión
+con un SELECT 1 antes de entregarla.
+"""
+import collections
+import os
+import threading
+import time
+
+from psycopg2 import Error, extensions
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolAgotado(Error):
+    pass
+
+
+def _cerrar(conexion):
+    try:
+        conexion.close()
+    except Error:
+        pass
+
+
+class Pool:
+    def __init__(self, max_size=10, timeout=10.0, max_lifetime=1800.0, max_idle=300.0, pre_ping=True):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.pre_ping = pre_ping
+        self._cond = threading.Condition()
+        # (conexión, creada, devuelta) en orden de devolución
+        self._libres = collections.deque()
+        self._creadas = {}
+        self._total = 0
+        self._cerrado = False
+        self.contadores = dict.fromkeys(
+            ('creadas', 'cerradas', 'checkouts', 'esperas', 'timeouts', 'pings_fallidos'), 0
+        )
+
+    def _vencida(self, creada, ahora):
+        return self.max_lifetime and ahora - creada > self.max_lifetime
+
+    def _cosechar(self, ahora):
+        """Saca (con el lock tomado) las libres ociosas o vencidas; las cierra quien llama."""
+        cosechadas = []
+        while self._libres:
+            conexion, creada, devuelta = self._libres[0]
+            if not (self.max_idle and ahora - devuelta > self.max_idle) and not self._vencida(creada, ahora):
+                break
+            self._libres.popleft()
+            cosechadas.append(conexion)
+        for conexion in cosechadas:
+            self._olvidar(conexion)
+        return cosechadas
+
+    def _olvidar(self, conexion):
+        self._creadas.pop(id(conexion), None)
+        self._total -= 1
+        self.contadores['cerradas'] += 1
+        self._cond.notify()
+
+    def _valida(self, conexion, creada):
+        if conexion.closed or self._vencida(creada, time.monotonic()):
+            return False
+        if conexion.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if self.pre_ping:
+            try:
+                with conexion.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except Error:
+                with self._cond:
+                    self.contadores['pings_fallidos'] += 1
+                return False
+        return True
+
+    def obtener(self, crear):
+        """Entrega una conexión libre y válida, o crea una con `crear()` si hay cupo."""
+        limite = time.monotonic() + self.timeout
+        while True:
+            nueva = False
+            with self._cond:
+                cosechadas = self._cosechar(time.monotonic())
+                espero = False
+                while not self._libres and self._total >= self.max_size:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self.contadores['timeouts'] += 1
+                        raise PoolAgotado(
+                            f'Pool de conexiones agotado ({self.max_size} en uso por {self.timeout}s)'
+                        )
+                    espero = True
+                    self._cond.wait(restante)
+                if espero:
+                    self.contadores['esperas'] += 1
+                if self._libres:
+                    conexion, creada, _ = self._libres.pop()
+                else:
+                    self._total += 1
+                    nueva = True
+            for vieja in cosechadas:
+                _cerrar(vieja)
+
+            if nueva:
+                try:
+                    conexion = crear()
+                except BaseException:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._creadas[id(conexion)] = time.monotonic()
+                    self.contadores['creadas'] += 1
+                    self.contadores['checkouts'] += 1
+                return conexion
+
+            if self._valida(conexion, creada):
+                with self._cond:
+                    self.contadores['checkouts'] += 1
+                return conexion
+            _cerrar(conexion)
+            with self._cond:
+                self._olvidar(conexion)
+
+    def devolver(self, conexion):
+        with self._cond:
+            creada = self._creadas.get(id(conexion))
+        if creada is None:
+            # no es de este pool (p. ej. heredada de antes de un fork)
+            return
+        ok = not self._cerrado and not conexion.closed and not self._vencida(creada, time.monotonic())
+        if ok and conexion.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conexion.rollback()
+            except Error:
+                ok = False
+        if not ok:
+            _cerrar(conexion)
+            with self._cond:
+                self._olvidar(conexion)
+            return
+        with self._cond:
+            self._libres.append((conexion, creada, time.monotonic()))
+            cosechadas = self._cosechar(time.monotonic())
+            self._cond.notify()
+        for vieja in cosechadas:
+            _cerrar(vieja)
+
+    def cerrar(self):
+        """Cierra las conexiones libres (las que están en uso se cierran al devolverse)."""
+        with self._cond:
+            libres = [conexion for conexion, _, _ in self._libres]
+            self._libres.clear()
+            for conexion in libres:
+                self._olvidar(conexion)
+            self._cerrado = True
+        for conexion in libres:
+            _cerrar(conexion)
+
+    def estadisticas(self):
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'en_uso': self._total - len(self._libres),
+                'libres': len(self._libres),
+                **self.contadores,
+            }
+
+
+def pool_para(clave, **opciones):
+    """Pool del proceso actual para `clave`; tras un fork se crea uno nuevo."""
+    clave = (os.getpid(), clave)
+    pool = _pools.get(clave)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(clave, Pool(**opciones))
+    return pool
+
+
+def pools():
+    pid = os.getpid()
+    return {clave: pool for (pid_pool, clave), pool in list(_pools.items()) if pid_pool == pid}
+
+
+def cerrar_pools(filtro=lambda clave: True):
+    """Cierra y descarta los pools del proceso cuya clave cumpla `filtro`."""
+    pid = os.getpid()
+    with _pools_lock:
+        elegidos = [(pid_pool, clave) for pid_pool, clave in _pools if pid_pool == pid and filtro(clave)]
+        descartados = [_pools.pop(clave) for clave in elegidos]
+    for pool in descartados:
+        pool.cerrar()
@@ -0,0 +1,80 @@
+"""
+Backend SQLite para producción (varios workers de gunicorn sobre un archivo).
+
+Sobre el backend estándar agrega, en OPTIONS:
+- `pragmas`: se aplican al crear cada conexión (WAL, synchronous, mmap...).
+- `transaction_mode`: 'IMMEDIATE' hace que los bloques atomic tomen el
+  candado de escritura al empezar (BEGIN IMMEDIATE). Así una transacción no
+  falla a mitad de camino al querer escribir sobre una lectura vieja, que
+  es el caso que busy_timeout no puede resolver.
+- `lock_retries` / `lock_backoff`: si aun así una sentencia fuera de una
+  transacción (o el BEGIN) recibe "database is locked", se reintenta con
+  backoff exponencial con jitter.
+"""
+import logging
+import random
+import time
+
+from django.db.backends.sqlite3 import base
+
+logger = logging.getLogger('landing.sqlite')
+
+OPCIONES_PROPIAS = ('pragmas', 'transaction_mode', 'lock_retries', 'lock_backoff')
+
+
+def _es_bloqueo(error):
+    mensaje = str(error)
+    return 'database is locked' in mensaje or 'database table is locked' in mensaje
+
+
+class CursorConReintentos(base.SQLiteCursorWrapper):
+    def __init__(self, conexion, reintentos, espera):
+        super().__init__(conexion)
+        self.reintentos = reintentos
+        self.espera = espera
+
+    def _reintentar(self, metodo, *args):
+        intento = 0
+        while True:
+            try:
+                return metodo(*args)
+            except base.Database.OperationalError as e:
+                # dentro de una transacción ya abierta no es seguro repetir la
+                # sentencia sola: el error sube y atomic hace rollback
+                if intento >= self.reintentos or self.connection.in_transaction or not _es_bloqueo(e):
+                    raise
+                espera = self.espera * 2 ** intento * (0.5 + random.random())
+                intento += 1
+                logger.info('sqlite bloqueada, reintento %s en %.3fs', intento, espera)
+                time.sleep(espera)
+
+    def execute(self, query, params=None):
+        return self._reintentar(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        # el iterable se materializa para poder repetirlo
+        return self._reintentar(super().executemany, query, list(param_list))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for clave in OPCIONES_PROPIAS:
+            params.pop(clave, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, valor in self.settings_dict['OPTIONS'].get('pragmas', {}).items():
+            conn.execute(f'PRAGMA {pragma} = {valor}')
+        return conn
+
+    def create_cursor(self, name=None):
+        opciones = self.settings_dict['OPTIONS']
+        reintentos = opciones.get('lock_retries', 0)
+        espera = opciones.get('lock_backoff', 0.05)
+        return self.connection.cursor(factory=lambda conn: CursorConReintentos(conn, reintentos, espera))
+
+    def _start_transaction_under_autocommit(self):
+        modo = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {modo}' if modo else 'BEGIN')
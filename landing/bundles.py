@@ -0,0 +1,246 @@
+"""
+Bundles de CSS y JS de la landing.
+
+Cada entrada de LANDING_BUNDLES es un estático generado (`landing/bundle.css`,
+`landing/bundle.js`) a partir de una lista de fuentes, que se buscan primero
+en LANDING_ASSETS_DIR (fuera de static/: no se publican sueltas) y si no con
+los finders normales.
+
+Las fuentes de LANDING_BUNDLES_PURGAR (Bootstrap) se recortan a las reglas
+cuyas clases e ids aparecen en las plantillas, en los `attrs` de los widgets
+de landing/*.py y en los JS del bundle (ver `usados`). El CSS se minifica
+conservando el comentario de licencia `/*! ... */`; el JS solo pierde
+sangría, líneas vacías y comentarios de línea completa.
+
+`BundlesFinder` engancha la generación a collectstatic (y a runserver, donde
+se regenera si cambia alguna fuente o plantilla; fuera de DEBUG buscar un
+bundle nunca lo genera). Los bundles pasan por
+CompressedManifestStaticFilesStorage, así que salen con hash de contenido en
+el nombre y WhiteNoise los sirve con caché de un año. Igual que en
+imagenes.py, `manifest.json` guarda la firma de lo generado y solo se
+reescribe lo que cambió.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles import finders, utils
+from django.core.files.storage import FileSystemStorage
+
+from . import critico
+
+VERSION = 1  # subirla fuerza a regenerar todo
+
+_lock = threading.Lock()
+_cache = {}
+
+_ATRIBUTO_HTML = re.compile(r'''\b(class|id)\s*=\s*(["'])(.*?)\2''', re.S)
+_ATRIBUTO_PY = re.compile(r'''['"](class|id)['"]\s*:\s*(["'])(.*?)\2''')
+_CLASSLIST = re.compile(r'''classList\.(?:add|toggle|replace)\(([^)]*)\)''')
+_CADENA = re.compile(r'''"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*\'''')
+_TAG_PLANTILLA = re.compile(r'\{[{%#].*?[}%#]\}', re.S)
+_COMENTARIO = re.compile(r'/\*.*?\*/', re.S)
+_MINIFICABLE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|\s*([{};,>])\s*|\s+''')
+_LICENCIA = re.compile(r'/\*!.*?\*/', re.S)
+_CHARSET = re.compile(r'@charset\s+[^;]+;')
+
+
+def _directorio():
+    return str(settings.LANDING_BUNDLES_DIR)
+
+
+def _raiz_estaticos():
+    return os.path.join(_directorio(), 'static')
+
+
+def _ruta_manifest():
+    return os.path.join(_directorio(), 'manifest.json')
+
+
+def _fuente(ruta):
+    propia = os.path.join(str(settings.LANDING_ASSETS_DIR), ruta)
+    if os.path.exists(propia):
+        return propia
+    return finders.find(ruta)
+
+
+def _leer(ruta):
+    archivo = _fuente(ruta)
+    if not archivo:
+        raise FileNotFoundError(f'Fuente de bundle no encontrada: {ruta}')
+    with open(archivo, encoding='utf-8') as f:
+        return f.read()
+
+
+def _archivos_escaneados():
+    """Plantillas, módulos de landing y JS de los bundles donde se buscan clases e ids."""
+    archivos = []
+    for plantillas in settings.TEMPLATES[0]['DIRS']:
+        for raiz, _, nombres in os.walk(plantillas):
+            archivos += [os.path.join(raiz, n) for n in nombres if n.endswith('.html')]
+    app = os.path.dirname(__file__)
+    archivos += [os.path.join(app, n) for n in os.listdir(app) if n.endswith('.py')]
+    for fuentes in settings.LANDING_BUNDLES.values():
+        archivos += [_fuente(r) for r in fuentes if r.endswith('.js') and _fuente(r)]
+    return sorted(archivos)
+
+
+def usados():
+    """(clases, ids) que pueden aparecer en el HTML de la landing."""
+    clases, ids = set(), set()
+    for archivo in _archivos_escaneados():
+        with open(archivo, encoding='utf-8') as f:
+            texto = f.read()
+        if archivo.endswith('.html'):
+            # `{% if x %}activo{% endif %}` deja "activo"; lo dinámico de {{ }} se pierde
+            atributos = _ATRIBUTO_HTML.findall(texto)
+            atributos = [(a, q, _TAG_PLANTILLA.sub(' ', v)) for a, q, v in atributos]
+        elif archivo.endswith('.py'):
+            atributos = _ATRIBUTO_PY.findall(texto)
+        else:
+            atributos = [
+                ('class', '', cadena[1:-1])
+                for argumentos in _CLASSLIST.findall(texto)
+                for cadena in _CADENA.findall(argumentos)
+            ]
+        for atributo, _, valor in atributos:
+            (clases if atributo == 'class' else ids).update(valor.split())
+    return clases, ids
+
+
+def _minificar_css(css):
+    def reemplazar(m):
+        # las cadenas ("a, b") quedan intactas
+        return m.group(1) or m.group(2) or ' '
+
+    return _MINIFICABLE.sub(reemplazar, css).replace(';}', '}').strip()
+
+
+def _construir_css(fuentes, clases, ids):
+    licencias, cuerpos = [], []
+    for ruta in fuentes:
+        css = _leer(ruta)
+        licencias += _LICENCIA.findall(css)
+        css = _CHARSET.sub('', css)
+        if ruta in settings.LANDING_BUNDLES_PURGAR:
+            css = critico.reglas_usadas(css, clases, ids)
+        else:
+            css = _COMENTARIO.sub('', css)
+        cuerpos.append(_minificar_css(css))
+    return '@charset "UTF-8";' + '\n'.join(licencias + [''.join(cuerpos)]) + '\n'
+
+
+def _construir_js(fuentes):
+    bloques = []
+    for ruta in fuentes:
+        lineas = (linea.strip() for linea in _leer(ruta).splitlines())
+        codigo = '\n'.join(linea for linea in lineas if linea and not linea.startswith('//'))
+        bloques.append(f'/* {ruta} */\n{codigo}\n;')
+    return '\n'.join(bloques) + '\n'
+
+
+def _firma(nombre, fuentes, clases, ids):
+    h = hashlib.sha256(repr((VERSION, nombre, fuentes, sorted(settings.LANDING_BUNDLES_PURGAR))).encode())
+    for ruta in fuentes:
+        h.update(_leer(ruta).encode() + b'\0')
+    if nombre.endswith('.css'):
+        h.update(repr((sorted(clases), sorted(ids))).encode())
+    return h.hexdigest()
+
+
+def leer_manifest():
+    try:
+        with open(_ruta_manifest(), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def generar(forzar=False):
+    """
+    Escribe los bundles que falten o estén desactualizados. Devuelve
+    {nombre: (bytes, regenerado)}.
+    """
+    with _lock:
+        manifest = leer_manifest()
+        clases, ids = usados()
+        nuevo, resultado = {}, {}
+        for nombre, fuentes in settings.LANDING_BUNDLES.items():
+            fuentes = list(fuentes)
+            destino = os.path.join(_raiz_estaticos(), nombre)
+            firma = _firma(nombre, fuentes, clases, ids)
+            if not forzar and manifest.get(nombre) == firma and os.path.exists(destino):
+                nuevo[nombre] = firma
+                resultado[nombre] = (os.path.getsize(destino), False)
+                continue
+            if nombre.endswith('.css'):
+                contenido = _construir_css(fuentes, clases, ids)
+            else:
+                contenido = _construir_js(fuentes)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            with open(destino + '.tmp', 'w', encoding='utf-8') as archivo:
+                archivo.write(contenido)
+            os.replace(destino + '.tmp', destino)
+            nuevo[nombre] = firma
+            resultado[nombre] = (len(contenido.encode()), True)
+        for nombre in manifest.keys() - nuevo.keys():
+            try:
+                os.remove(os.path.join(_raiz_estaticos(), nombre))
+            except FileNotFoundError:
+                pass
+        if nuevo != manifest:
+            os.makedirs(_directorio(), exist_ok=True)
+            with open(_ruta_manifest() + '.tmp', 'w', encoding='utf-8') as archivo:
+                json.dump(nuevo, archivo, indent=1)
+            os.replace(_ruta_manifest() + '.tmp', _ruta_manifest())
+        return resultado
+
+
+def _mtimes_fuentes():
+    archivos = _archivos_escaneados()
+    for fuentes in settings.LANDING_BUNDLES.values():
+        archivos += [_fuente(r) for r in fuentes]
+    return {a: os.path.getmtime(a) for a in archivos if a}
+
+
+def asegurar(nombre):
+    """
+    Ruta del bundle generado, o None si no existe. En DEBUG (runserver) se
+    regenera si cambió alguna fuente; fuera de DEBUG solo lo generan
+    collectstatic y build_critical_css, nunca una búsqueda.
+    """
+    destino = os.path.join(_raiz_estaticos(), nombre)
+    if settings.DEBUG:
+        mtimes = _mtimes_fuentes()
+        if _cache.get('mtimes') != mtimes:
+            generar()
+            _cache['mtimes'] = mtimes
+    return destino if os.path.exists(destino) else None
+
+
+class BundlesFinder(finders.BaseFinder):
+    """Expone los bundles generados a collectstatic y a runserver."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=_raiz_estaticos())
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, all=False):
+        if path not in settings.LANDING_BUNDLES:
+            return []
+        ruta = asegurar(path)
+        if not ruta:
+            return []
+        return [ruta] if all else ruta
+
+    def list(self, ignore_patterns):
+        generar()
+        if os.path.isdir(_raiz_estaticos()):
+            for path in utils.get_files(self.storage, ignore_patterns):
+                yield path, self.storage
@@ -0,0 +1,85 @@
+"""
+Catálogo de precios (Producto) cacheado por proceso.
+
+Cada worker guarda el catálogo completo en un dict inmutable junto con los
+montos ya formateados (`CLP $350.000`) y el JSON que usa bundle.js. Las
+ediciones desde el admin cambian el sello de versión de `landing.Producto`
+en el cache compartido (las mismas señales que invalidan fragmentos); cada
+worker lo consulta como mucho una vez por INTERVALO_VERSION segundos y solo
+vuelve a leer la base si cambió. En régimen, `reservar` no hace ninguna
+consulta de precios.
+"""
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.utils.html import json_script
+
+from . import fragments
+
+LABEL = 'landing.Producto'
+INTERVALO_VERSION = 1.0
+# precio/depósito para un tipo que no esté en el catálogo (como antes el `else`)
+TIPO_POR_DEFECTO = 'teclado'
+ID_JSON = 'catalogo-precios'
+
+Catalogo = namedtuple('Catalogo', 'version productos json')
+
+_lock = threading.Lock()
+_actual = None
+_comprobado = 0.0
+
+
+def formatear_clp(monto):
+    return 'CLP $' + f'{int(monto):,}'.replace(',', '.')
+
+
+def _cargar(version):
+    from .models import Producto
+
+    productos = {}
+    for p in Producto.objects.all():
+        productos[p.tipo] = MappingProxyType({
+            'titulo': p.titulo,
+            'precio': p.precio,
+            'deposito': p.deposito,
+            'precio_clp': formatear_clp(p.precio),
+            'deposito_clp': formatear_clp(p.deposito),
+        })
+    datos_js = {
+        tipo: {'titulo': p['titulo'], 'precio': p['precio_clp'], 'deposito': p['deposito_clp'],
+               'sin_deposito': not p['deposito']}
+        for tipo, p in productos.items()
+    }
+    return Catalogo(version, MappingProxyType(productos), json_script(datos_js, ID_JSON))
+
+
+def obtener():
+    """Catálogo vigente; como mucho una lectura del cache por segundo y proceso."""
+    global _actual, _comprobado
+    ahora = time.monotonic()
+    if _actual is not None and ahora - _comprobado < INTERVALO_VERSION:
+        return _actual
+    with _lock:
+        if _actual is not None and ahora - _comprobado < INTERVALO_VERSION:
+            return _actual
+        # la versión se lee antes que la tabla: si una edición cae entre
+        # medio, el próximo chequeo ve un sello nuevo y vuelve a cargar
+        version = fragments.versiones([LABEL])[0]
+        if _actual is None or version is None or version != _actual.version:
+            _actual = _cargar(version)
+        _comprobado = ahora
+        return _actual
+
+
+def producto(tipo):
+    """Entrada del catálogo para `tipo` (o la del tipo por defecto), o None."""
+    productos = obtener().productos
+    return productos.get(tipo) or productos.get(TIPO_POR_DEFECTO)
+
+
+def deposito(tipo):
+    entrada = producto(tipo)
+    return entrada['deposito'] if entrada else Decimal('0')
@@ -0,0 +1,151 @@
+"""
+Validadores baratos para GET condicional (ETag / Last-Modified).
+
+Nada aquí consulta la base de datos: la página de inicio usa los sellos de
+versión de `fragments` (cache compartido) y las páginas estáticas la fecha de
+modificación de sus plantillas.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from functools import lru_cache, wraps
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import get_template
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import fragments
+
+HOME_TEMPLATES = (
+    'landing/home.html',
+    'landing/base.html',
+    'snippets/home/stats_section.html',
+    'snippets/home/testimonials_section.html',
+    'snippets/home/cta_section.html',
+)
+HOME_MODELS = ('landing.Reserva', 'landing.Feedback', 'landing.Producto')
+# páginas de plantillas que además muestran precios del catálogo
+CATALOGO_MODELS = ('landing.Producto',)
+
+
+def _mtime_plantillas(nombres):
+    mtimes = [os.path.getmtime(get_template(n).origin.name) for n in nombres]
+    # un collectstatic nuevo cambia las URLs con hash del manifest
+    manifest = getattr(staticfiles_storage, 'manifest_name', None)
+    if manifest and staticfiles_storage.exists(manifest):
+        mtimes.append(os.path.getmtime(staticfiles_storage.path(manifest)))
+    return max(mtimes)
+
+
+_mtime_plantillas_cacheado = lru_cache(maxsize=None)(_mtime_plantillas)
+
+
+def mtime_plantillas(nombres):
+    # las plantillas solo cambian con un deploy (reinicio); en DEBUG se recalcula
+    if settings.DEBUG:
+        return _mtime_plantillas(tuple(nombres))
+    return _mtime_plantillas_cacheado(tuple(nombres))
+
+
+def _como_fecha(segundos):
+    return datetime.fromtimestamp(int(segundos), tz=timezone.utc)
+
+
+def plantillas_last_modified(*nombres):
+    """Función `last_modified_func` para vistas que solo renderizan plantillas."""
+    def last_modified(request, *args, **kwargs):
+        return _como_fecha(mtime_plantillas(nombres))
+    return last_modified
+
+
+def plantillas_etag(*nombres):
+    def etag(request, *args, **kwargs):
+        return f'tpl-{int(mtime_plantillas(nombres) * 1000):x}'
+    return etag
+
+
+def _versiones(request, modelos):
+    # etag_func y last_modified_func comparten una sola lectura del cache
+    if not hasattr(request, '_landing_versiones'):
+        request._landing_versiones = {}
+    if modelos not in request._landing_versiones:
+        request._landing_versiones[modelos] = fragments.versiones(modelos)
+    return request._landing_versiones[modelos]
+
+
+def catalogo_etag(*nombres):
+    """Como `plantillas_etag`, pero también cambia al editar el catálogo de precios."""
+    def etag(request, *args, **kwargs):
+        sellos = _versiones(request, CATALOGO_MODELS)
+        if None in sellos:
+            return None
+        return f'tpl-{int(mtime_plantillas(nombres) * 1000):x}-{sellos[0]:x}'
+    return etag
+
+
+def catalogo_last_modified(*nombres):
+    def last_modified(request, *args, **kwargs):
+        sellos = _versiones(request, CATALOGO_MODELS)
+        if None in sellos:
+            return None
+        return _como_fecha(max(sellos[0] / 1e9, mtime_plantillas(nombres)))
+    return last_modified
+
+
+def home_etag(request, *args, **kwargs):
+    """
+    ETag de la home. La página incluye el formulario de feedback con un token
+    CSRF derivado de la cookie, así que el validador depende de la cookie y
+    no hay Last-Modified (una fecha no distingue cookies). Sin cookie, la
+    respuesta crea una nueva y debe renderizarse: sin validador.
+    """
+    cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+    if not cookie:
+        return None
+    sellos = _versiones(request, HOME_MODELS)
+    if None in sellos:
+        # cache sin sellos (DummyCache o caído): sin validador
+        return None
+    # también depende de la query string (email del CTA, fb_error)
+    partes = [
+        *(str(v) for v in sellos),
+        str(mtime_plantillas(HOME_TEMPLATES)),
+        request.get_full_path(),
+        cookie,
+    ]
+    return hashlib.md5('|'.join(partes).encode()).hexdigest()
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    Equivalente de `django.views.decorators.http.condition` para vistas
+    async (Django 4.2 no lo soporta). Los validadores son síncronos y se
+    calculan juntos en un hilo para no bloquear el event loop.
+    """
+    def validadores(request, *args, **kwargs):
+        etag = etag_func(request, *args, **kwargs) if etag_func else None
+        fecha = last_modified_func(request, *args, **kwargs) if last_modified_func else None
+        return (
+            quote_etag(etag) if etag is not None else None,
+            int(fecha.timestamp()) if fecha else None,
+        )
+
+    def decorator(func):
+        @wraps(func)
+        async def inner(request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validadores)(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await func(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
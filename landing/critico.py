@@ -0,0 +1,358 @@
+"""
+CSS crítico por página para `landing/base.html`.
+
+`manage.py build_critical_css` (start.sh, después de collectstatic) renderiza
+cada página de PAGINAS con su vista, toma los elementos "sobre el pliegue"
+(el header y los primeros ELEMENTOS_PLIEGUE elementos de <main>) y se queda
+con las reglas de LANDING_CRITICAL_CSS cuyos selectores pueden aplicarles.
+El resultado se guarda en LANDING_CRITICAL_CSS_DIR con nombre
+`<plantilla>-<hash>.css`, donde el hash cubre las hojas de estilo y el
+código de la plantilla (con las que extiende e incluye), así un cambio en
+cualquiera invalida solo lo que corresponde. `build_critical_css` falla si
+alguna página supera LANDING_CRITICAL_CSS_MAX_BYTES.
+
+En cada petición `{% critical_css %}` solo busca ese archivo (cacheado en
+memoria por plantilla + hash): lo inserta en un <style> y carga las hojas
+completas sin bloquear el render. Si no hay CSS crítico para la plantilla
+o el hash actual, deja los <link> normales.
+
+El emparejamiento es conservador: una regla se conserva si todas las
+clases, ids, etiquetas y nombres de atributo de su selector aparecen sobre
+el pliegue (sin evaluar combinadores ni pseudo-clases), así que puede
+sobrar algo pero no faltar. Los estados de interacción (:hover, :focus...)
+no hacen falta para el primer render y quedan para la hoja completa.
+"""
+import hashlib
+import os
+import posixpath
+import re
+import types
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template import Context
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.templatetags.static import static
+
+# el header y lo que entra en la primera pantalla de un teléfono; con 60 el
+# CSS crítico de reservar pesaba 24 KB (dos tercios del bundle completo)
+ELEMENTOS_PLIEGUE = 20
+# plantilla -> nombre de la vista en landing.views que la renderiza
+PAGINAS = {
+    'landing/home.html': 'home',
+    'landing/reservar.html': 'reservar',
+    'landing/empresas.html': 'empresas',
+    'landing/gracias.html': 'gracias',
+}
+
+_cache = {}
+
+_COMENTARIO = re.compile(r'/\*.*?\*/', re.S)
+_PSEUDO_FUNCION = re.compile(r'::?[\w-]+\([^)]*\)')
+_PSEUDO = re.compile(r'::?[\w-]+')
+_ATRIBUTO = re.compile(r'\[[^\]]*\]')
+_NOMBRE_ATRIBUTO = re.compile(r'\[\s*([\w-]+)')
+_ESTADO = re.compile(r':(?:hover|active|focus|focus-visible|focus-within|visited)\b')
+_CLASE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+_ID = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+_ETIQUETA = re.compile(r'^([a-zA-Z][\w-]*)')
+_COMBINADOR = re.compile(r'\s*[>+~]\s*|\s+')
+_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_KEYFRAMES = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+
+class _Pliegue(HTMLParser):
+    """Etiquetas, clases, ids y atributos del documento hasta el pliegue."""
+
+    def __init__(self, limite):
+        super().__init__()
+        self.limite = limite
+        self.en_main = 0
+        self.contados = 0
+        self.etiquetas, self.clases, self.ids, self.atributos = set(), set(), set(), set()
+
+    def handle_starttag(self, tag, attrs):
+        if self.contados >= self.limite:
+            return
+        if self.en_main:
+            self.contados += 1
+        if tag == 'main':
+            self.en_main = 1
+        self.etiquetas.add(tag)
+        for nombre, valor in attrs:
+            self.atributos.add(nombre)
+            if nombre == 'class' and valor:
+                self.clases.update(valor.split())
+            elif nombre == 'id' and valor:
+                self.ids.add(valor)
+
+
+def _bloques(css):
+    """(preludio, cuerpo) de primer nivel; cuerpo None en sentencias como @import."""
+    inicio = i = profundidad = 0
+    comilla = None
+    cuerpo = preludio = None
+    while i < len(css):
+        c = css[i]
+        if comilla:
+            if c == '\\':
+                i += 1
+            elif c == comilla:
+                comilla = None
+        elif c in '"\'':
+            comilla = c
+        elif c == '{':
+            if profundidad == 0:
+                preludio, cuerpo = css[inicio:i].strip(), i + 1
+            profundidad += 1
+        elif c == '}':
+            profundidad -= 1
+            if profundidad == 0:
+                yield preludio, css[cuerpo:i]
+                inicio = i + 1
+        elif c == ';' and profundidad == 0:
+            yield css[inicio:i].strip(), None
+            inicio = i + 1
+        i += 1
+
+
+def _separar_selectores(preludio):
+    partes, profundidad, actual = [], 0, ''
+    for c in preludio:
+        if c == ',' and profundidad == 0:
+            partes.append(actual.strip())
+            actual = ''
+            continue
+        profundidad += (c == '(') - (c == ')')
+        actual += c
+    partes.append(actual.strip())
+    return [p for p in partes if p]
+
+
+def _aplica(selector, pliegue):
+    sin_funciones = _PSEUDO_FUNCION.sub('', selector)
+    # de los atributos solo se exige el nombre ([data-bs-theme=dark] sin ningún
+    # data-bs-theme sobre el pliegue no aplica); el valor no se evalúa
+    if not set(_NOMBRE_ATRIBUTO.findall(sin_funciones)) <= pliegue.atributos:
+        return False
+    # sin pseudo-clases ni atributos; `:root` o `*` quedan vacíos y se conservan
+    limpio = _PSEUDO.sub('', _ATRIBUTO.sub('', sin_funciones))
+    if not set(_CLASE.findall(limpio)) <= pliegue.clases:
+        return False
+    if not set(_ID.findall(limpio)) <= pliegue.ids:
+        return False
+    for compuesto in _COMBINADOR.split(limpio):
+        m = _ETIQUETA.match(compuesto)
+        if m and m.group(1).lower() not in pliegue.etiquetas:
+            return False
+    return True
+
+
+def _filtrar(css, pliegue, primer_render=True):
+    """
+    Con `primer_render` se omiten @media print y los selectores de estados de
+    interacción (:hover, :focus...), que llegan con la hoja completa.
+    """
+    salida = []
+    for preludio, cuerpo in _bloques(css):
+        if cuerpo is None:
+            if preludio.startswith(('@import', '@charset')):
+                salida.append(preludio + ';')
+            continue
+        if preludio.startswith(('@media', '@supports')):
+            if primer_render and preludio.split(None, 1)[-1].strip() == 'print':
+                continue
+            interno = _filtrar(cuerpo, pliegue, primer_render)
+            if interno:
+                salida.append(f'{preludio}{{{interno}}}')
+        elif preludio.startswith('@font-face'):
+            salida.append(f'{preludio}{{{cuerpo.strip()}}}')
+        elif preludio.startswith('@'):
+            # @keyframes se agregan después si alguna regla conservada los usa
+            continue
+        else:
+            selectores = [
+                s for s in _separar_selectores(preludio)
+                if _aplica(s, pliegue) and not (primer_render and _ESTADO.search(s))
+            ]
+            if selectores:
+                salida.append(f"{','.join(selectores)}{{{cuerpo.strip()}}}")
+    return ''.join(salida)
+
+
+def _keyframes(css, usado):
+    salida = []
+    for preludio, cuerpo in _bloques(css):
+        m = _KEYFRAMES.match(preludio or '')
+        if m and cuerpo is not None and re.search(rf'\b{re.escape(m.group(1))}\b', usado):
+            salida.append(f'{preludio}{{{cuerpo.strip()}}}')
+    return ''.join(salida)
+
+
+def _absolutizar(css, ruta_estatica):
+    # el CSS pasa de /static/<dir>/ al HTML de la página: las url() relativas se reescriben
+    carpeta = posixpath.dirname(ruta_estatica)
+
+    def reemplazar(m):
+        url = m.group(2)
+        if url.startswith(('data:', 'http:', 'https:', '/', '#')):
+            return m.group(0)
+        return f'url("{static(posixpath.normpath(posixpath.join(carpeta, url)))}")'
+
+    return _URL.sub(reemplazar, css)
+
+
+def _leer_fuentes():
+    fuentes = []
+    for ruta in settings.LANDING_CRITICAL_CSS:
+        archivo = finders.find(ruta)
+        if archivo:
+            with open(archivo, encoding='utf-8') as f:
+                fuentes.append((ruta, archivo, f.read()))
+    return fuentes
+
+
+def _firma(fuentes):
+    h = hashlib.sha256()
+    for ruta, _, css in fuentes:
+        h.update(ruta.encode() + b'\0' + css.encode() + b'\0')
+    return h.hexdigest()[:16]
+
+
+def _plantillas(nombre):
+    """La plantilla y las que usa con {% extends %} o {% include %} de nombre constante."""
+    vistas, pendientes = [], [nombre]
+    while pendientes:
+        actual = pendientes.pop()
+        if actual in vistas:
+            continue
+        vistas.append(actual)
+        nodelist = get_template(actual).template.nodelist
+        for nodo in nodelist.get_nodes_by_type(ExtendsNode):
+            pendientes.append(nodo.parent_name.resolve(Context()))
+        for nodo in nodelist.get_nodes_by_type(IncludeNode):
+            incluida = nodo.template.resolve(Context())
+            if isinstance(incluida, str):
+                pendientes.append(incluida)
+    return vistas
+
+
+def _firma_pagina(firma_css, plantilla):
+    # editar la plantilla (o base.html, o un include) cambia lo que queda sobre el pliegue
+    h = hashlib.sha256(firma_css.encode())
+    for nombre in _plantillas(plantilla):
+        h.update(b'\0' + nombre.encode() + b'\0' + get_template(nombre).template.source.encode())
+    return h.hexdigest()[:16]
+
+
+def _mtimes():
+    archivos = [finders.find(r) for r in settings.LANDING_CRITICAL_CSS]
+    archivos += [get_template(n).origin.name for p in PAGINAS for n in _plantillas(p)]
+    return tuple(os.path.getmtime(a) for a in archivos if a)
+
+
+def firma_actual(plantilla):
+    """
+    Hash de las hojas de estilo y de las plantillas de la página; en DEBUG se
+    recalcula si cambian los archivos.
+    """
+    mtimes = _mtimes() if settings.DEBUG else None
+    if 'firma' not in _cache or _cache.get('mtimes') != mtimes:
+        _cache.clear()
+        _cache['firma'] = _firma(_leer_fuentes())
+        _cache['mtimes'] = mtimes
+    clave = ('firma', plantilla)
+    if clave not in _cache:
+        _cache[clave] = _firma_pagina(_cache['firma'], plantilla)
+    return _cache[clave]
+
+
+def _ruta_salida(plantilla, firma):
+    nombre = plantilla.replace('/', '__').rsplit('.', 1)[0]
+    return os.path.join(str(settings.LANDING_CRITICAL_CSS_DIR), f'{nombre}-{firma}.css')
+
+
+def pliegue(html):
+    resultado = _Pliegue(ELEMENTOS_PLIEGUE)
+    resultado.feed(html)
+    return resultado
+
+
+def extraer(pliegue, css, ruta_estatica):
+    """Reglas de `css` (la hoja `ruta_estatica`) que aplican sobre el pliegue."""
+    css = _COMENTARIO.sub('', css)
+    critico = _filtrar(css, pliegue)
+    critico += _keyframes(css, critico)
+    return re.sub(r'\s+', ' ', _absolutizar(critico, ruta_estatica))
+
+
+class _Todas:
+    def __contains__(self, elemento):
+        return True
+
+    def __ge__(self, otro):
+        return True
+
+
+def reglas_usadas(css, clases, ids):
+    """
+    Reglas de `css` que pueden aplicar a un documento con esas clases e ids
+    (las etiquetas y atributos no se filtran: los widgets de Django generan
+    los suyos).
+    A diferencia de `extraer`, conserva @media print y los estados de interacción.
+    """
+    usados = types.SimpleNamespace(clases=set(clases), ids=set(ids), etiquetas=_Todas(), atributos=_Todas())
+    css = _COMENTARIO.sub('', css)
+    filtrado = _filtrar(css, usados, primer_render=False)
+    return filtrado + _keyframes(css, filtrado)
+
+
+def _renderizar(nombre_vista):
+    from django.test import RequestFactory
+
+    from . import views
+
+    request = RequestFactory().get('/')
+    response = getattr(views, nombre_vista)(request)
+    return response.render().content.decode()
+
+
+def generar(forzar=False):
+    """
+    Escribe el CSS crítico de cada página que no lo tenga para el hash
+    actual. Devuelve {plantilla: (bytes, regenerado)}.
+    """
+    fuentes = _leer_fuentes()
+    if not fuentes:
+        return {}
+    firma = _firma(fuentes)
+    os.makedirs(str(settings.LANDING_CRITICAL_CSS_DIR), exist_ok=True)
+    resultado = {}
+    for plantilla, vista in PAGINAS.items():
+        destino = _ruta_salida(plantilla, _firma_pagina(firma, plantilla))
+        if os.path.exists(destino) and not forzar:
+            resultado[plantilla] = (os.path.getsize(destino), False)
+            continue
+        sobre_pliegue = pliegue(_renderizar(vista))
+        critico = ''.join(extraer(sobre_pliegue, css, ruta) for ruta, _, css in fuentes)
+        with open(destino + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(critico)
+        os.replace(destino + '.tmp', destino)
+        resultado[plantilla] = (len(critico.encode()), True)
+    _cache.clear()
+    return resultado
+
+
+def obtener(plantilla):
+    """CSS crítico de la plantilla para el CSS y las plantillas actuales, o None."""
+    firma = firma_actual(plantilla)
+    clave = ('css', plantilla)
+    if clave not in _cache:
+        try:
+            with open(_ruta_salida(plantilla, firma), encoding='utf-8') as f:
+                _cache[clave] = f.read()
+        except OSError:
+            _cache[clave] = None
+    return _cache[clave]
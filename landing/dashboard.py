@@ -0,0 +1,145 @@
+"""
+Dashboard de la landing en el admin (`/admin/landing/dashboard/`).
+
+Nada sale de las tablas de Reserva o Feedback:
+- el embudo (home → formulario → reservas enviadas → gracias) son los
+  contadores de peticiones de /metrics (`landing.prometheus`), sin consultas,
+  acumulados desde el último arranque de gunicorn;
+- totales por tipo, depósitos comprometidos, distribución de ratings y
+  tendencias se leen de los rollups (`landing.resumenes`): cuatro consultas
+  que recorren buckets, no eventos.
+
+El resultado se guarda LANDING_DASHBOARD_CACHE_SECONDS en el cache
+compartido, así que abrir el dashboard seguido solo cuesta la sesión y el
+usuario del admin.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.utils import timezone
+
+from . import catalogo, prometheus, resumenes
+from .models import Reserva, Resumen
+
+CACHE_KEY = 'landing:dashboard:v1'
+# quien puede ver las reservas en el admin puede ver sus agregados
+PERMISO = 'landing.view_reserva'
+DIAS_TENDENCIA = 30
+SEMANAS_RATING = 12
+
+# (etiqueta, ruta, estados que cuentan)
+EMBUDO = (
+    ('Visitas a la home', 'landing:home', ('200', '304')),
+    ('Formulario de reserva mostrado', 'landing:reservar', ('200', '304')),
+    ('Reservas enviadas', 'landing:reservar', ('302',)),
+    ('Página de gracias', 'landing:gracias', ('200', '304')),
+)
+
+
+def _porcentaje(parte, total):
+    return round(100 * parte / total, 1) if total else 0
+
+
+def _embudo():
+    conteos = prometheus.peticiones({ruta for _, ruta, _ in EMBUDO})
+    pasos = []
+    for etiqueta, ruta, estados in EMBUDO:
+        total = int(sum(conteos[ruta][e] for e in estados))
+        previo = pasos[-1]['total'] if pasos else None
+        pasos.append({
+            'etiqueta': etiqueta,
+            'total': total,
+            'conversion': _porcentaje(total, previo) if previo is not None else None,
+        })
+    maximo = max((p['total'] for p in pasos), default=0)
+    for paso in pasos:
+        paso['ancho'] = _porcentaje(paso['total'], maximo)
+    return pasos
+
+
+def _por_tipo():
+    totales = resumenes.totales(Resumen.RESERVAS)
+    filas = []
+    for tipo, nombre in Reserva.TIPOS:
+        valor = totales.get(tipo, resumenes.Valor(0, 0))
+        filas.append({'tipo': nombre, 'cantidad': valor.cantidad, 'deposito': catalogo.formatear_clp(valor.monto)})
+    cantidad = sum(v.cantidad for v in totales.values())
+    deposito = sum(v.monto for v in totales.values())
+    return filas, cantidad, catalogo.formatear_clp(deposito)
+
+
+def _ratings():
+    histograma = resumenes.histograma_ratings()
+    total = sum(histograma.values())
+    maximo = max(histograma.values(), default=0)
+    filas = [
+        {'rating': r, 'cantidad': n, 'porcentaje': _porcentaje(n, total), 'ancho': _porcentaje(n, maximo)}
+        for r, n in sorted(histograma.items(), reverse=True)
+    ]
+    return filas, total, resumenes.rating_promedio(histograma)
+
+
+def _tendencia_reservas(ahora):
+    """Reservas por día de los últimos DIAS_TENDENCIA días (con ceros)."""
+    hoy = Resumen.inicio_de(ahora, Resumen.DIA)
+    desde = hoy - timedelta(days=DIAS_TENDENCIA - 1)
+    por_dia = {
+        inicio: sum(v.cantidad for v in valores.values())
+        for inicio, valores in resumenes.serie(Resumen.RESERVAS, Resumen.DIA, desde=desde)
+    }
+    dias = [desde + timedelta(days=i) for i in range(DIAS_TENDENCIA)]
+    maximo = max(por_dia.values(), default=0)
+    return [{'dia': d, 'cantidad': por_dia.get(d, 0), 'ancho': _porcentaje(por_dia.get(d, 0), maximo)} for d in dias]
+
+
+def _tendencia_ratings(ahora):
+    """Cantidad y promedio de feedback por semana de las últimas SEMANAS_RATING semanas."""
+    desde = ahora - timedelta(weeks=SEMANAS_RATING - 1)
+    filas = []
+    for inicio, valores in resumenes.serie(Resumen.FEEDBACK, resumenes.SEMANA, desde=desde):
+        histograma = {clave: v.cantidad for clave, v in valores.items()}
+        filas.append({
+            'semana': inicio,
+            'cantidad': sum(histograma.values()),
+            'promedio': resumenes.rating_promedio(histograma),
+        })
+    return filas
+
+
+def datos():
+    """Contexto del dashboard (cacheado LANDING_DASHBOARD_CACHE_SECONDS)."""
+    contexto = cache.get(CACHE_KEY)
+    if contexto is not None:
+        return contexto
+    ahora = timezone.now()
+    tipos, reservas, depositos = _por_tipo()
+    ratings, total_feedback, promedio = _ratings()
+    contexto = {
+        'embudo': _embudo(),
+        'tipos': tipos,
+        'reservas': reservas,
+        'depositos': depositos,
+        'ratings': ratings,
+        'total_feedback': total_feedback,
+        'rating_promedio': promedio,
+        'tendencia_reservas': _tendencia_reservas(ahora),
+        'tendencia_ratings': _tendencia_ratings(ahora),
+        'generado': ahora,
+    }
+    cache.set(CACHE_KEY, contexto, settings.LANDING_DASHBOARD_CACHE_SECONDS)
+    return contexto
+
+
+def vista(request, site):
+    if not request.user.has_perm(PERMISO):
+        raise PermissionDenied
+    contexto = {
+        **site.each_context(request),
+        **datos(),
+        'title': 'Dashboard',
+        'cache_segundos': settings.LANDING_DASHBOARD_CACHE_SECONDS,
+    }
+    return TemplateResponse(request, 'admin/landing/dashboard.html', contexto)
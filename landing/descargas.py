@@ -0,0 +1,238 @@
+"""
+Descargas de archivos grandes (LANDING_DESCARGAS), p. ej. el brochure PDF.
+
+`/descargas/<nombre>` responde con ETag fuerte (sha256 del contenido,
+recalculado solo si cambian tamaño o mtime), Last-Modified, Cache-Control
+de larga duración y soporte de `Range`/`If-Range` para un único rango
+(varios rangos se ignoran y se entrega el archivo completo, como permite la
+RFC 9110). El cuerpo es un FileResponse sobre un `_Tramo` del archivo, así
+que bajo gunicorn sale por `wsgi.file_wrapper` + sendfile sin pasar los
+bytes por Python.
+
+Las descargas que empiezan en el byte 0 se cuentan en `/metrics` y en
+Metrica (`descargas_<nombre>`); la escritura a la base la hace un hilo por
+worker cada LANDING_DESCARGAS_FLUSH_SECONDS, nunca la petición. Lo que quede
+pendiente al terminar el proceso se vuelca en el hook `worker_exit` de
+gunicorn y, fuera de gunicorn (runserver, uvicorn, comandos), con atexit.
+"""
+import atexit
+import collections
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.db import close_old_connections
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from . import prometheus
+from .models import Metrica
+
+logger = logging.getLogger(__name__)
+
+_RANGO = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+_archivos = {}
+_pendientes = collections.Counter()
+_pendientes_lock = threading.Lock()
+_flusher_pid = None
+
+
+class _Tramo:
+    """Vista de solo lectura de [inicio, inicio + largo) de un archivo abierto."""
+
+    def __init__(self, archivo, inicio, largo, nombre):
+        self.archivo = archivo
+        self.inicio = inicio
+        self.largo = largo
+        self.name = nombre
+        self._posicion = 0
+        archivo.seek(inicio)
+
+    def fileno(self):
+        # gunicorn 20.1 llama a socket.sendfile sin offset (siempre desde el
+        # byte 0): los rangos que empiezan más adelante van por read()
+        if self.inicio:
+            raise OSError('sendfile no respeta la posición del archivo')
+        return self.archivo.fileno()
+
+    def read(self, n=-1):
+        restante = self.largo - self._posicion
+        if n is None or n < 0 or n > restante:
+            n = restante
+        datos = self.archivo.read(n)
+        self._posicion += len(datos)
+        return datos
+
+    def seek(self, posicion, desde=os.SEEK_SET):
+        if desde == os.SEEK_CUR:
+            posicion += self._posicion
+        elif desde == os.SEEK_END:
+            posicion += self.largo
+        self._posicion = max(0, min(posicion, self.largo))
+        self.archivo.seek(self.inicio + self._posicion)
+        return self._posicion
+
+    def tell(self):
+        return self._posicion
+
+    def close(self):
+        self.archivo.close()
+
+
+def _datos(nombre):
+    """(ruta, tamaño, mtime, etag) del archivo publicado como `nombre`."""
+    ruta_estatica = settings.LANDING_DESCARGAS.get(nombre)
+    ruta = ruta_estatica and finders.find(ruta_estatica)
+    if not ruta:
+        raise Http404('Descarga desconocida')
+    estado = os.stat(ruta)
+    previo = _archivos.get(nombre)
+    if previo and previo[:3] == (ruta, estado.st_size, estado.st_mtime_ns):
+        return previo[0], previo[1], estado.st_mtime, previo[3]
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            h.update(bloque)
+    etag = quote_etag(h.hexdigest()[:32])
+    _archivos[nombre] = (ruta, estado.st_size, estado.st_mtime_ns, etag)
+    return ruta, estado.st_size, estado.st_mtime, etag
+
+
+def _rango(request, tamano, etag, mtime):
+    """
+    (inicio, fin) inclusivo del rango pedido, None para el archivo completo,
+    o False si el rango no se puede satisfacer (416).
+    """
+    cabecera = request.headers.get('Range')
+    if not cabecera or request.method not in ('GET', 'HEAD'):
+        return None
+    if_range = request.headers.get('If-Range')
+    if if_range:
+        if if_range.startswith(('"', 'W/')):
+            # If-Range exige comparación fuerte
+            if if_range != etag:
+                return None
+        elif parse_http_date_safe(if_range) != int(mtime):
+            return None
+    m = _RANGO.match(cabecera.strip())
+    if not m or m.groups() == ('', ''):
+        # sintaxis inválida o varios rangos: se ignora la cabecera
+        return None
+    desde, hasta = m.groups()
+    if not desde:
+        # sufijo: los últimos N bytes
+        largo = int(hasta)
+        if not largo:
+            return False
+        return max(0, tamano - largo), tamano - 1
+    inicio = int(desde)
+    if hasta and int(hasta) < inicio:
+        return None
+    if inicio >= tamano:
+        return False
+    return inicio, min(int(hasta), tamano - 1) if hasta else tamano - 1
+
+
+def servir(request, nombre):
+    ruta, tamano, mtime, etag = _datos(nombre)
+    ultima = int(mtime)
+
+    def cabeceras(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(ultima)
+        response['Accept-Ranges'] = 'bytes'
+        patch_cache_control(response, public=True, max_age=settings.LANDING_DESCARGAS_MAX_AGE)
+        return response
+
+    # If-None-Match / If-Modified-Since -> 304, If-Match / If-Unmodified-Since -> 412
+    condicional = get_conditional_response(request, etag=etag, last_modified=ultima)
+    if condicional is not None:
+        return cabeceras(condicional)
+
+    rango = _rango(request, tamano, etag, mtime)
+    if rango is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{tamano}'
+        return cabeceras(response)
+    inicio, fin = rango or (0, tamano - 1)
+    largo = max(0, fin - inicio + 1)
+
+    tipo = mimetypes.guess_type(nombre)[0] or 'application/octet-stream'
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=tipo)
+        response['Content-Length'] = largo
+    else:
+        tramo = _Tramo(open(ruta, 'rb'), inicio, largo, ruta)
+        response = FileResponse(tramo, content_type=tipo, filename=nombre)
+        if inicio == 0:
+            contar(nombre)
+    if rango:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {inicio}-{fin}/{tamano}'
+    return cabeceras(response)
+
+
+def contar(nombre):
+    """Cuenta una descarga; Metrica se actualiza en segundo plano."""
+    prometheus.registrar_descarga(nombre)
+    with _pendientes_lock:
+        _pendientes[nombre] += 1
+    iniciar_flusher()
+
+
+def volcar():
+    """Escribe en Metrica las descargas acumuladas en este proceso."""
+    with _pendientes_lock:
+        pendientes = dict(_pendientes)
+        _pendientes.clear()
+    if not pendientes:
+        return 0
+    try:
+        Metrica.objects.incrementar({Metrica.clave_descarga(n): total for n, total in pendientes.items()})
+    except Exception:
+        # se devuelven a la cola para el próximo intento
+        with _pendientes_lock:
+            _pendientes.update(pendientes)
+        raise
+    return sum(pendientes.values())
+
+
+def _volcar_al_salir():
+    # el hilo es daemon: sin esto se pierde lo contado desde su última pasada
+    try:
+        volcar()
+    except Exception:
+        logger.exception('descargas: no se pudieron volcar los contadores al salir')
+
+
+def _bucle():
+    intervalo = settings.LANDING_DESCARGAS_FLUSH_SECONDS
+    while True:
+        time.sleep(intervalo)
+        try:
+            volcar()
+        except Exception:
+            logger.exception('descargas: error al volcar contadores, se reintenta en %ss', intervalo)
+        finally:
+            close_old_connections()
+
+
+def iniciar_flusher():
+    """Arranca (una vez por proceso) el hilo que vuelca los contadores."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _pendientes_lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(target=_bucle, name='descargas-flusher', daemon=True).start()
+        atexit.register(_volcar_al_salir)
+        _flusher_pid = os.getpid()
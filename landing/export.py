@@ -0,0 +1,98 @@
+"""
+Exportación en streaming de Reserva y Feedback (CSV / NDJSON).
+
+Se recorre `values_list(...).iterator(chunk_size=...)` y se emite un bloque
+de texto por cada lote de filas, así la memoria queda constante sin
+importar el tamaño de la tabla.
+
+En CSV los textos que una planilla interpretaría como fórmula (empiezan con
+=, +, -, @, tabulador o retorno de carro) se prefijan con una comilla
+simple: nombre, email y comentarios los escribe cualquiera en la landing.
+"""
+import csv
+import io
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Feedback, Reserva
+
+CAMPOS = {
+    Reserva: ('id', 'nombre', 'email', 'telefono', 'tipo', 'deposito', 'creado'),
+    Feedback: ('id', 'nombre', 'email', 'rating', 'comentario', 'creado'),
+}
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+CHUNK_SIZE = 2000
+INICIOS_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _inicio_dia(fecha):
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def filtrar(queryset, tipo=None, desde=None, hasta=None):
+    """Filtra por tipo y rango de fechas (inclusive) sin funciones sobre `creado`."""
+    if tipo:
+        queryset = queryset.filter(tipo=tipo)
+    if desde:
+        queryset = queryset.filter(creado__gte=_inicio_dia(desde))
+    if hasta:
+        queryset = queryset.filter(creado__lt=_inicio_dia(hasta + timedelta(days=1)))
+    return queryset
+
+
+def _lotes(queryset, campos, chunk_size):
+    lote = []
+    for fila in queryset.values_list(*campos).iterator(chunk_size=chunk_size):
+        lote.append(fila)
+        if len(lote) >= chunk_size:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _celda(valor):
+    if isinstance(valor, str) and valor.startswith(INICIOS_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def lineas_csv(queryset, campos, chunk_size=CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(campos)
+    for lote in _lotes(queryset, campos, chunk_size):
+        writer.writerows([_celda(valor) for valor in fila] for fila in lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def lineas_ndjson(queryset, campos, chunk_size=CHUNK_SIZE):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for lote in _lotes(queryset, campos, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(campos, fila))) + '\n' for fila in lote)
+
+
+def lineas(queryset, formato, chunk_size=CHUNK_SIZE):
+    campos = CAMPOS[queryset.model]
+    # sin orden explícito el iterador sigue la clave primaria
+    queryset = queryset.order_by('pk')
+    if formato == 'csv':
+        return lineas_csv(queryset, campos, chunk_size)
+    return lineas_ndjson(queryset, campos, chunk_size)
+
+
+def respuesta(queryset, formato):
+    nombre = f'{queryset.model._meta.model_name}-{timezone.now():%Y%m%d-%H%M}.{formato}'
+    response = StreamingHttpResponse(lineas(queryset, formato), content_type=FORMATOS[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+    return response
@@ -0,0 +1,68 @@
+"""
+Versionado de fragmentos de plantilla cacheados.
+
+Cada modelo del que depende un fragmento tiene una clave de versión en el
+cache compartido. Las señales de guardado/borrado la cambian y así todos los
+fragmentos que dependen del modelo quedan invalidados en todos los workers.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+FRAGMENT_PREFIX = 'landing:fragment'
+VERSION_PREFIX = 'landing:version'
+
+
+def version_key(label):
+    return f'{VERSION_PREFIX}:{label.lower()}'
+
+
+def fragment_key(nombre):
+    return f'{FRAGMENT_PREFIX}:{nombre}'
+
+
+def _nueva_version():
+    # un sello único evita incrementos perdidos entre workers
+    return time.time_ns()
+
+
+def bump(label):
+    """Invalida los fragmentos que dependen de `label` al confirmar la transacción."""
+    transaction.on_commit(lambda: cache.set(version_key(label), _nueva_version(), None))
+
+
+def _completar(claves_version, encontrados):
+    versiones = tuple(encontrados.get(k) for k in claves_version)
+    if None not in versiones:
+        return versiones
+    # versión desconocida (cache vacío o expulsada): fijar una nueva
+    for clave, valor in zip(claves_version, versiones):
+        if valor is None:
+            cache.add(clave, _nueva_version(), None)
+    encontrados = cache.get_many(claves_version)
+    return tuple(encontrados.get(k) for k in claves_version)
+
+
+def versiones(labels):
+    """Versiones actuales de los modelos indicados (una ida al cache)."""
+    claves_version = [version_key(label) for label in labels]
+    return _completar(claves_version, cache.get_many(claves_version))
+
+
+def obtener(nombre, labels):
+    """
+    Lee el fragmento y las versiones de sus dependencias en una sola ida al
+    cache. Devuelve (html o None, versiones actuales).
+    """
+    claves_version = [version_key(label) for label in labels]
+    encontrados = cache.get_many([fragment_key(nombre)] + claves_version)
+    versiones = _completar(claves_version, encontrados)
+    entrada = encontrados.get(fragment_key(nombre))
+    if entrada and entrada[0] == versiones:
+        return entrada[1], versiones
+    return None, versiones
+
+
+def guardar(nombre, versiones, html, timeout):
+    cache.set(fragment_key(nombre), (versiones, html), timeout)
@@ -0,0 +1,197 @@
+"""
+Variantes responsivas de las imágenes de la landing.
+
+Por cada imagen de LANDING_IMAGENES se generan versiones AVIF y WebP en
+varios anchos (nunca más anchas que el original) y un placeholder LQIP
+diminuto y borroso embebido como data URI. La generación es incremental:
+`manifest.json` guarda una firma del archivo fuente y de los parámetros, y
+solo se reprocesa lo que cambió.
+
+`VariantesFinder` engancha todo esto a collectstatic (y al servidor de
+desarrollo): al listar archivos genera lo pendiente, y las variantes pasan
+por CompressedManifestStaticFilesStorage como cualquier estático, así que
+quedan con hash de contenido en el nombre. `{% responsive_image %}` arma el
+<picture> a partir del manifest.
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles import finders, utils
+from django.core.files.storage import FileSystemStorage
+
+# (formato, extensión, tipo MIME, opciones de Pillow) en orden de preferencia
+FORMATOS = [
+    ('AVIF', 'avif', 'image/avif', {'quality': 50, 'speed': 6}),
+    ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+]
+ANCHO_LQIP = 16
+VERSION = 1  # subirla fuerza a regenerar todo
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _directorio():
+    return str(settings.LANDING_IMAGENES_DIR)
+
+
+def _raiz_estaticos():
+    return os.path.join(_directorio(), 'static')
+
+
+def _ruta_manifest():
+    return os.path.join(_directorio(), 'manifest.json')
+
+
+def _firma(ruta_fuente, anchos):
+    h = hashlib.sha256(repr((VERSION, anchos, FORMATOS, ANCHO_LQIP)).encode())
+    with open(ruta_fuente, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 16), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _nombre_variante(ruta, ancho, extension):
+    # landing/img.png -> landing/variantes/img-480.webp
+    carpeta, archivo = os.path.split(ruta)
+    base = os.path.splitext(archivo)[0]
+    return f'{carpeta}/variantes/{base}-{ancho}.{extension}'
+
+
+def _lqip(imagen):
+    from PIL import ImageFilter
+
+    alto = max(1, round(imagen.height * ANCHO_LQIP / imagen.width))
+    chica = imagen.resize((ANCHO_LQIP, alto)).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    chica.save(buffer, 'WEBP', quality=30)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def _procesar(ruta, ruta_fuente, anchos, firma):
+    from PIL import Image
+
+    raiz = _raiz_estaticos()
+    with Image.open(ruta_fuente) as original:
+        original.load()
+        imagen = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+    elegidos = sorted({a for a in anchos if a < imagen.width} | {min(max(anchos), imagen.width)})
+    entrada = {
+        'firma': firma,
+        'ancho': imagen.width,
+        'alto': imagen.height,
+        'lqip': _lqip(imagen),
+        'variantes': {},
+    }
+    for formato, extension, tipo, opciones in FORMATOS:
+        lista = []
+        for ancho in elegidos:
+            alto = round(imagen.height * ancho / imagen.width)
+            nombre = _nombre_variante(ruta, ancho, extension)
+            destino = os.path.join(raiz, nombre)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            escalada = imagen if ancho == imagen.width else imagen.resize((ancho, alto), Image.LANCZOS)
+            escalada.save(destino + '.tmp', formato, **opciones)
+            os.replace(destino + '.tmp', destino)
+            lista.append([nombre, ancho])
+        entrada['variantes'][tipo] = lista
+    return entrada
+
+
+def _archivos(entrada):
+    return {nombre for lista in entrada.get('variantes', {}).values() for nombre, _ in lista}
+
+
+def leer_manifest():
+    try:
+        with open(_ruta_manifest(), encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def generar(forzar=False):
+    """
+    Genera las variantes que falten o estén desactualizadas. Devuelve la
+    lista de imágenes reprocesadas.
+    """
+    with _lock:
+        manifest = leer_manifest()
+        nuevo = {}
+        procesadas = []
+        raiz = _raiz_estaticos()
+        for ruta, anchos in settings.LANDING_IMAGENES.items():
+            ruta_fuente = finders.find(ruta)
+            if not ruta_fuente:
+                continue
+            anchos = tuple(anchos)
+            firma = _firma(ruta_fuente, anchos)
+            previa = manifest.get(ruta, {})
+            completa = all(os.path.exists(os.path.join(raiz, n)) for n in _archivos(previa))
+            if not forzar and previa.get('firma') == firma and completa:
+                nuevo[ruta] = previa
+                continue
+            nuevo[ruta] = _procesar(ruta, ruta_fuente, anchos, firma)
+            procesadas.append(ruta)
+        # variantes que ya no corresponden a ninguna imagen/ancho configurado
+        sobrantes = set().union(*(_archivos(e) for e in manifest.values())) - set().union(
+            *(_archivos(e) for e in nuevo.values())
+        )
+        for nombre in sobrantes:
+            try:
+                os.remove(os.path.join(raiz, nombre))
+            except FileNotFoundError:
+                pass
+        if procesadas or sobrantes or nuevo.keys() != manifest.keys():
+            os.makedirs(_directorio(), exist_ok=True)
+            with open(_ruta_manifest() + '.tmp', 'w', encoding='utf-8') as archivo:
+                json.dump(nuevo, archivo, indent=1)
+            os.replace(_ruta_manifest() + '.tmp', _ruta_manifest())
+        _cache.pop('manifest', None)
+        return procesadas
+
+
+def _mtimes_fuentes():
+    rutas = {ruta: finders.find(ruta) for ruta in settings.LANDING_IMAGENES}
+    return {ruta: os.path.getmtime(fuente) for ruta, fuente in rutas.items() if fuente}
+
+
+def datos(ruta):
+    """Entrada del manifest para `ruta` (None si no se generó)."""
+    if settings.DEBUG:
+        # en desarrollo no hay collectstatic: se regenera si cambió alguna fuente
+        mtimes = _mtimes_fuentes()
+        if _cache.get('mtimes') != mtimes:
+            generar()
+            _cache['mtimes'] = mtimes
+    if 'manifest' not in _cache:
+        _cache['manifest'] = leer_manifest()
+    return _cache['manifest'].get(ruta)
+
+
+class VariantesFinder(finders.BaseFinder):
+    """Expone las variantes generadas a collectstatic y a runserver."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=_raiz_estaticos())
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, all=False):
+        ruta = os.path.join(_raiz_estaticos(), path)
+        if '/variantes/' in path and os.path.exists(ruta):
+            return [ruta] if all else ruta
+        return []
+
+    def list(self, ignore_patterns):
+        generar()
+        if os.path.isdir(_raiz_estaticos()):
+            for path in utils.get_files(self.storage, ignore_patterns):
+                yield path, self.storage
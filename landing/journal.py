@@ -0,0 +1,219 @@
+"""
+Journal write-behind para reservas y feedback (LANDING_WRITE_BEHIND).
+
+Los POST validados se anotan como una línea JSON en `actual.ndjson` (con
+fsync) y la vista responde sin tocar la base de datos. Un hilo por worker
+vuelca el journal periódicamente: rota el archivo a un segmento, lo inserta
+con bulk_create en una transacción y registra el segmento en SegmentoJournal
+antes de borrarlo, así un segmento se vuelca exactamente una vez aunque el
+worker muera a mitad de camino. `manage.py flush_journal` (start.sh) vuelca
+lo que haya quedado pendiente al arrancar.
+
+Cada línea lleva la hora del POST, que se asigna a `creado` después del
+bulk_create (auto_now_add pone la del volcado). Un segmento que no se puede
+volcar por sus datos se renombra a `cuarentena-*` y se sigue con los demás;
+los errores de conexión o bloqueo de la base cortan el volcado y se
+reintenta en la próxima pasada.
+"""
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import fragments, prometheus
+from .models import Feedback, Metrica, Reserva, Resumen, SegmentoJournal
+
+logger = logging.getLogger(__name__)
+
+ACTUAL = 'actual.ndjson'
+SEGMENTO_PREFIX = 'segmento-'
+CUARENTENA_PREFIX = 'cuarentena-'
+MODELOS = {'reserva': Reserva, 'feedback': Feedback}
+
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def _directorio():
+    directorio = str(settings.LANDING_JOURNAL_DIR)
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def _fsync_directorio(directorio):
+    fd = os.open(directorio, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def _candado(nombre, bloqueante=True):
+    fd = os.open(os.path.join(_directorio(), nombre), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if bloqueante else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+    finally:
+        os.close(fd)
+
+
+def anotar(modelo, datos):
+    """Agrega un registro validado al journal de forma durable."""
+    if modelo not in MODELOS:
+        raise ValueError(f'Modelo de journal desconocido: {modelo}')
+    registro = {'m': modelo, 't': timezone.now().isoformat(), 'd': datos}
+    linea = json.dumps(registro, ensure_ascii=False, default=str) + '\n'
+    # el candado evita escribir en un archivo que el flusher acaba de rotar
+    with _candado('journal.lock'):
+        fd = os.open(os.path.join(_directorio(), ACTUAL), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, linea.encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    iniciar_flusher()
+
+
+def _rotar(directorio):
+    with _candado('journal.lock'):
+        actual = os.path.join(directorio, ACTUAL)
+        if os.path.exists(actual) and os.path.getsize(actual):
+            os.rename(actual, os.path.join(directorio, f'{SEGMENTO_PREFIX}{time.time_ns()}.ndjson'))
+            _fsync_directorio(directorio)
+
+
+def _leer(ruta):
+    """{modelo: [(datos, hora del POST o None), ...]}"""
+    registros = {modelo: [] for modelo in MODELOS}
+    with open(ruta, encoding='utf-8') as archivo:
+        for numero, linea in enumerate(archivo, 1):
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                # línea truncada por una caída a mitad de escritura
+                logger.warning('journal: línea %s inválida en %s, se descarta', numero, ruta)
+                continue
+            # las líneas anteriores a la hora en el journal no traen 't'
+            creado = parse_datetime(registro['t']) if 't' in registro else None
+            registros[registro['m']].append((registro['d'], creado))
+    return registros
+
+
+def _fechar(manager, objetos, registros, lote):
+    """Pone en `creado` la hora del POST en lugar de la del volcado."""
+    fechados = []
+    for objeto, (_, creado) in zip(objetos, registros):
+        if creado is not None:
+            objeto.creado = creado
+            fechados.append(objeto)
+    if fechados:
+        manager.bulk_update(fechados, ['creado'], batch_size=lote)
+
+
+def _deltas_resumen(feedbacks):
+    """Deltas de Resumen del lote de feedback (con `creado` ya fechado)."""
+    return Resumen.sumar_deltas(*(Resumen.deltas(Resumen.FEEDBACK, f.rating, f.creado, 1) for f in feedbacks))
+
+
+def _volcar_segmento(ruta, nombre):
+    registros = _leer(ruta)
+    # el depósito lo asigna Reserva.objects.bulk_create según el catálogo
+    reservas = [Reserva(**d) for d, _ in registros['reserva']]
+    feedbacks = [Feedback(**d) for d, _ in registros['feedback']]
+
+    # bulk_create de Feedback no dispara señales: métricas, rollups y fragmentos
+    # se actualizan aquí (los de Reserva los mantiene Reserva.objects.bulk_create)
+    deltas = {}
+    if feedbacks:
+        deltas[Metrica.RATING_TOTAL] = len(feedbacks)
+        deltas[Metrica.RATING_SUMA] = sum(f.rating for f in feedbacks)
+
+    lote = settings.LANDING_JOURNAL_BATCH
+    with transaction.atomic():
+        if SegmentoJournal.objects.filter(pk=nombre).exists():
+            # ya volcado antes de una caída; solo falta borrarlo
+            return 0
+        Reserva.objects.bulk_create(reservas, batch_size=lote)
+        Feedback.objects.bulk_create(feedbacks, batch_size=lote)
+        # bulk_update de `creado` en Reserva también mueve sus rollups a la hora del POST
+        _fechar(Reserva.objects, reservas, registros['reserva'], lote)
+        _fechar(Feedback.objects, feedbacks, registros['feedback'], lote)
+        Metrica.objects.incrementar(deltas)
+        Resumen.objects.incrementar(_deltas_resumen(feedbacks))
+        SegmentoJournal.objects.create(nombre=nombre)
+        if feedbacks:
+            fragments.bump(Feedback._meta.label)
+    for r in reservas:
+        prometheus.registrar_reservas(r.tipo)
+    for f in feedbacks:
+        prometheus.registrar_feedback(f.rating)
+    return len(reservas) + len(feedbacks)
+
+
+def drenar():
+    """
+    Vuelca todo lo pendiente (incluidos segmentos de una caída anterior).
+    Devuelve la cantidad de registros insertados, o None si otro proceso ya
+    está volcando.
+    """
+    directorio = _directorio()
+    with _candado('flush.lock', bloqueante=False) as obtenido:
+        if not obtenido:
+            return None
+        _rotar(directorio)
+        total = 0
+        for nombre in sorted(os.listdir(directorio)):
+            if not nombre.startswith(SEGMENTO_PREFIX):
+                continue
+            ruta = os.path.join(directorio, nombre)
+            try:
+                total += _volcar_segmento(ruta, nombre)
+            except (OperationalError, InterfaceError):
+                # base caída o bloqueada: el segmento queda para la próxima pasada
+                raise
+            except Exception:
+                # un segmento con datos que no entran no puede frenar a los siguientes
+                logger.exception('journal: no se pudo volcar %s, queda en cuarentena', nombre)
+                os.rename(ruta, os.path.join(directorio, CUARENTENA_PREFIX + nombre))
+                _fsync_directorio(directorio)
+                continue
+            os.remove(ruta)
+            SegmentoJournal.objects.filter(pk=nombre).delete()
+        return total
+
+
+def _bucle():
+    intervalo = settings.LANDING_JOURNAL_FLUSH_SECONDS
+    while True:
+        time.sleep(intervalo)
+        try:
+            drenar()
+        except Exception:
+            logger.exception('journal: error al volcar, se reintenta en %ss', intervalo)
+        finally:
+            close_old_connections()
+
+
+def iniciar_flusher():
+    """Arranca (una vez por proceso) el hilo que vuelca el journal."""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(target=_bucle, name='journal-flusher', daemon=True).start()
+        _flusher_pid = os.getpid()
@@ -0,0 +1,183 @@
+"""
+Rate limiting con token buckets compartidos entre workers.
+
+Para cada vista de LANDING_RATELIMIT hay un bucket global y buckets por IP.
+El estado vive en un único archivo mmap (`buckets-<firma>.db` en
+LANDING_RATELIMIT_DIR) que todos los procesos mapean: cada bucket es un par
+float64 (tokens, último rellenado) en un offset fijo. Los buckets por IP se
+eligen con crc32(vista, ip) módulo SLOTS_IP, así que el archivo no crece con
+la cantidad de IPs; dos IPs que caen en el mismo slot comparten límite, lo
+que solo puede hacerlo más estricto.
+
+Cada chequeo es O(1): un hash, un flock del archivo (más un lock de hilos
+del proceso) y dos lecturas/escrituras en el mmap. Se consume un token del
+bucket de la IP y del global solo si ambos tienen; si no, se devuelve cuánto
+falta para el próximo token (Retry-After).
+"""
+import fcntl
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+from . import prometheus
+
+SLOTS_IP = 1 << 16
+
+_BUCKET = struct.Struct('dd')
+
+Resultado = namedtuple('Resultado', 'permitido ambito espera')
+PERMITIDO = Resultado(True, None, 0.0)
+
+
+def _firma(vistas):
+    return format(zlib.crc32(repr((SLOTS_IP, vistas)).encode()), '08x')
+
+
+class _Archivo:
+    """
+    mmap compartido por todos los procesos; se reabre tras un fork o si
+    cambian el directorio o las vistas configuradas (override_settings).
+    """
+
+    def __init__(self):
+        self.clave = None
+        self.mm = None
+        self.fd = None
+        self.vistas = ()
+        self.lock = threading.Lock()
+
+    def obtener(self):
+        directorio = str(settings.LANDING_RATELIMIT_DIR)
+        vistas = tuple(sorted(settings.LANDING_RATELIMIT))
+        clave = (os.getpid(), directorio, vistas)
+        if self.clave != clave:
+            os.makedirs(directorio, exist_ok=True)
+            tamano = (len(vistas) * (SLOTS_IP + 1)) * _BUCKET.size
+            # el descriptor queda abierto: el flock se toma sobre él
+            fd = os.open(os.path.join(directorio, f'buckets-{_firma(vistas)}.db'), os.O_RDWR | os.O_CREAT, 0o644)
+            if os.fstat(fd).st_size < tamano:
+                os.ftruncate(fd, tamano)
+            mm = mmap.mmap(fd, tamano)
+            if self.clave is not None and self.clave[0] == clave[0]:
+                # mismo proceso con otra configuración: el mapeo anterior ya no sirve
+                self.mm.close()
+                os.close(self.fd)
+            self.mm, self.fd, self.vistas, self.clave = mm, fd, vistas, clave
+        return self.mm
+
+
+_archivo = _Archivo()
+
+
+def _offsets(vista, ip):
+    """(offset del bucket de la IP, offset del bucket global) de `vista`."""
+    base = _archivo.vistas.index(vista) * (SLOTS_IP + 1) * _BUCKET.size
+    slot = zlib.crc32(f'{vista}|{ip}'.encode()) % SLOTS_IP
+    return base + (slot + 1) * _BUCKET.size, base
+
+
+def _rellenar(mm, offset, capacidad, por_segundo, ahora):
+    tokens, ultimo = _BUCKET.unpack_from(mm, offset)
+    if not ultimo:
+        # bucket nunca usado: lleno
+        return float(capacidad)
+    return min(float(capacidad), tokens + max(0.0, ahora - ultimo) * por_segundo)
+
+
+def consumir(vista, ip, ahora=None):
+    """Toma un token de los buckets de `vista` para `ip`. Devuelve un Resultado."""
+    limites = settings.LANDING_RATELIMIT[vista]
+    capacidad_ip, tasa_ip = limites['ip']
+    capacidad_global, tasa_global = limites['global']
+    with _archivo.lock:
+        mm = _archivo.obtener()
+        offset_ip, offset_global = _offsets(vista, ip)
+        fcntl.flock(_archivo.fd, fcntl.LOCK_EX)
+        try:
+            ahora = time.time() if ahora is None else ahora
+            tokens_ip = _rellenar(mm, offset_ip, capacidad_ip, tasa_ip, ahora)
+            tokens_global = _rellenar(mm, offset_global, capacidad_global, tasa_global, ahora)
+            if tokens_ip >= 1 and tokens_global >= 1:
+                tokens_ip -= 1
+                tokens_global -= 1
+                resultado = PERMITIDO
+            elif tokens_ip < 1:
+                resultado = Resultado(False, 'ip', (1 - tokens_ip) / tasa_ip)
+            else:
+                resultado = Resultado(False, 'global', (1 - tokens_global) / tasa_global)
+            _BUCKET.pack_into(mm, offset_ip, tokens_ip, ahora)
+            _BUCKET.pack_into(mm, offset_global, tokens_global, ahora)
+        finally:
+            fcntl.flock(_archivo.fd, fcntl.LOCK_UN)
+    return resultado
+
+
+def ip_cliente(request):
+    """
+    IP del cliente. Detrás de LANDING_RATELIMIT_PROXIES proxies confiables
+    (Render: 1) se toma la entrada de X-Forwarded-For que agregó el más
+    externo; las anteriores las puede inventar el cliente.
+    """
+    proxies = settings.LANDING_RATELIMIT_PROXIES
+    if proxies:
+        reenviado = [p.strip() for p in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if p.strip()]
+        if len(reenviado) >= proxies:
+            return reenviado[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def respuesta_429(resultado):
+    response = HttpResponse(
+        'Demasiadas solicitudes, intenta de nuevo en unos segundos.\n',
+        status=429, content_type='text/plain; charset=utf-8',
+    )
+    response['Retry-After'] = str(max(1, math.ceil(resultado.espera)))
+    return response
+
+
+class RateLimitMiddleware:
+    """
+    Aplica LANDING_RATELIMIT a los POST de las vistas configuradas. Usa
+    process_view y va antes de CsrfViewMiddleware: lo rechazado no llega a
+    validar formularios ni a tocar la base de datos.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # el chequeo es O(1) y no bloquea más que el flock: se hace en el
+            # event loop en vez de pagar un salto de hilo por petición
+            self.process_view = self._aprocess_view
+        self.vistas = frozenset(settings.LANDING_RATELIMIT)
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST':
+            return None
+        vista = request.resolver_match.view_name
+        if vista not in self.vistas:
+            return None
+        resultado = consumir(vista, ip_cliente(request))
+        if resultado.permitido:
+            return None
+        prometheus.registrar_rechazo(vista, resultado.ambito)
+        return respuesta_429(resultado)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return RateLimitMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
@@ -0,0 +1,325 @@
+import json
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from http.cookies import SimpleCookie
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+from landing.models import Feedback, Metrica, Reserva, Resumen
+
+# (nombre, método, ruta, datos POST, estado esperado)
+ESCENARIOS = [
+    ('GET /', 'GET', '/', None, 200),
+    ('GET /reservar/?tipo=kit', 'GET', '/reservar/?tipo=kit', None, 200),
+    ('POST /reservar/', 'POST', '/reservar/',
+     {'nombre': 'Bench', 'email': 'bench@example.com', 'tipo': 'kit'}, 302),
+    ('POST /feedback/', 'POST', '/feedback/',
+     {'nombre': 'Bench', 'email': 'bench@example.com', 'rating': '5', 'comentario': 'ok'}, 302),
+    ('GET /empresas/', 'GET', '/empresas/', None, 200),
+    ('GET /gracias/', 'GET', '/gracias/', None, 200),
+]
+# métricas comparadas contra el baseline: (clave, mayor es peor). Las consultas de
+# GET / varían con la invalidación de fragmentos por los POST, así que también
+# usan la tolerancia.
+COMPARADAS = [('rps', False), ('p95_ms', True), ('p99_ms', True), ('consultas_por_peticion', True)]
+
+
+def _percentil(ordenadas, p):
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))] * 1000
+
+
+class _Cliente:
+    """Un navegador mínimo: guarda cookies y manda el token CSRF en los POST."""
+
+    def __init__(self, application):
+        self.application = application
+        self.cookies = SimpleCookie()
+
+    def _environ(self, metodo, ruta, datos):
+        partes = urlsplit(ruta)
+        cuerpo = urlencode(datos or {}).encode()
+        environ = {
+            'REQUEST_METHOD': metodo,
+            'PATH_INFO': partes.path,
+            'QUERY_STRING': partes.query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_HOST': 'localhost',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(cuerpo),
+            'wsgi.errors': BytesIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if self.cookies:
+            environ['HTTP_COOKIE'] = '; '.join(f'{k}={m.value}' for k, m in self.cookies.items())
+        if metodo == 'POST':
+            environ['CONTENT_TYPE'] = 'application/x-www-form-urlencoded'
+            environ['CONTENT_LENGTH'] = str(len(cuerpo))
+            if 'csrftoken' in self.cookies:
+                environ['HTTP_X_CSRFTOKEN'] = self.cookies['csrftoken'].value
+        return environ
+
+    def pedir(self, metodo, ruta, datos=None):
+        estado = []
+
+        def start_response(status, headers, exc_info=None):
+            estado.append(int(status.split(' ', 1)[0]))
+            for nombre, valor in headers:
+                if nombre.lower() == 'set-cookie':
+                    self.cookies.load(valor)
+
+        respuesta = self.application(self._environ(metodo, ruta, datos), start_response)
+        try:
+            for _ in respuesta:
+                pass
+        finally:
+            if hasattr(respuesta, 'close'):
+                respuesta.close()
+        return estado[0]
+
+
+class Command(BaseCommand):
+    help = (
+        'Carga concurrente en proceso contra la app WSGI (config/wsgi.py) sobre una base de datos '
+        'sembrada y desechable. Reporta req/s, p50/p95/p99 y consultas por petición en JSON, y '
+        'falla si empeora respecto de un baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8, help='clientes simultáneos')
+        parser.add_argument('--requests', type=int, default=200, help='peticiones por escenario')
+        parser.add_argument('--warmup', type=int, default=5, help='peticiones previas por escenario, sin medir')
+        parser.add_argument('--reservas', type=int, default=10000, help='reservas sembradas')
+        parser.add_argument('--feedback', type=int, default=2000, help='feedback sembrado')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('-o', '--output', help='escribir el JSON en este archivo')
+        parser.add_argument('--baseline', help='JSON de una corrida anterior para comparar')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='empeoramiento relativo admitido (0.2 = 20%%)',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as archivo:
+                baseline = json.load(archivo)
+
+        temporal = tempfile.mkdtemp(prefix='landing-bench-')
+        original = connection.settings_dict['NAME']
+        try:
+            # base de datos, cache, journal y métricas propias: no se toca nada del entorno
+            if connection.vendor == 'sqlite':
+                # en disco (no en memoria) para que los hilos compartan la base
+                connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(temporal, 'bench.sqlite3')
+            with override_settings(
+                CACHES={'default': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': os.path.join(temporal, 'cache'),
+                }},
+                LANDING_JOURNAL_DIR=os.path.join(temporal, 'journal'),
+                LANDING_METRICS_DIR=os.path.join(temporal, 'metricas'),
+                # el rate limiting se sigue chequeando (entra en la medición) pero
+                # con buckets que los POST del benchmark no alcanzan a vaciar
+                LANDING_RATELIMIT={v: {'ip': (10 ** 9, 10 ** 6), 'global': (10 ** 9, 10 ** 6)}
+                                   for v in settings.LANDING_RATELIMIT},
+                LANDING_RATELIMIT_DIR=os.path.join(temporal, 'ratelimit'),
+                # sin descartes por sobrecarga: el benchmark mide la latencia real
+                LANDING_ADMISION={**settings.LANDING_ADMISION, 'max_en_curso': 0, 'max_latencia': 0, 'max_espera': 0},
+            ):
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                try:
+                    self._sembrar(options)
+                    resultados = self._correr(options)
+                finally:
+                    connection.creation.destroy_test_db(original, verbosity=0)
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        salida = json.dumps(resultados, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as archivo:
+                archivo.write(salida + '\n')
+        self.stdout.write(salida)
+
+        if baseline is not None:
+            regresiones = self._comparar(resultados, baseline, options['tolerance'])
+            if regresiones:
+                for linea in regresiones:
+                    self.stderr.write(linea)
+                raise CommandError(f'{len(regresiones)} regresiones respecto de {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS('Sin regresiones respecto del baseline.'))
+
+    def _sembrar(self, options):
+        rng = random.Random(options['seed'])
+        tipos = [tipo for tipo, _ in Reserva.TIPOS]
+        ahora = timezone.now()
+        reservas = []
+        for i in range(options['reservas']):
+            reservas.append(Reserva(nombre=f'Cliente {i}', email=f'cliente{i}@example.com', tipo=rng.choice(tipos)))
+        Reserva.objects.bulk_create(reservas, batch_size=2000)
+        Feedback.objects.bulk_create(
+            [
+                Feedback(nombre=f'Cliente {i}', rating=rng.randint(1, 5), comentario='Teclado cómodo ' * 4)
+                for i in range(options['feedback'])
+            ],
+            batch_size=2000,
+        )
+        # `creado` es auto_now_add: se reparte en el último año después de insertar
+        for modelo in (Reserva, Feedback):
+            filas = [
+                modelo(pk=pk, creado=ahora - timedelta(minutes=rng.randint(0, 525600)))
+                for pk in modelo.objects.values_list('pk', flat=True)
+            ]
+            modelo.objects.bulk_update(filas, ['creado'], batch_size=500)
+        Metrica.objects.reconstruir()
+        Resumen.objects.reconstruir()
+
+    def _correr(self, options):
+        from config.wsgi import application
+
+        trabajos = queue.Queue()
+        for _ in range(options['requests']):
+            for escenario in ESCENARIOS:
+                trabajos.put(escenario)
+        medidas = {nombre: {'latencias': [], 'consultas': 0, 'errores': 0} for nombre, *_ in ESCENARIOS}
+        lock = threading.Lock()
+        listos = threading.Barrier(options['clients'] + 1)
+
+        def cliente():
+            navegador = _Cliente(application)
+            propias = {nombre: ([], [0], [0]) for nombre in medidas}
+            contador = [0]
+
+            def contar(execute, sql, params, many, context):
+                contador[0] += 1
+                return execute(sql, params, many, context)
+
+            try:
+                try:
+                    # primera visita: cookie CSRF
+                    navegador.pedir('GET', '/')
+                except Exception:
+                    listos.abort()
+                    raise
+                listos.wait()
+                with connection.execute_wrapper(contar):
+                    while True:
+                        try:
+                            nombre, metodo, ruta, datos, esperado = trabajos.get_nowait()
+                        except queue.Empty:
+                            break
+                        latencias, consultas, errores = propias[nombre]
+                        contador[0] = 0
+                        inicio = time.perf_counter()
+                        try:
+                            estado = navegador.pedir(metodo, ruta, datos)
+                        except Exception:
+                            estado = None
+                        duracion = time.perf_counter() - inicio
+                        if estado != esperado:
+                            errores[0] += 1
+                            continue
+                        latencias.append(duracion)
+                        consultas[0] += contador[0]
+            finally:
+                connection.close()
+                with lock:
+                    for nombre, (latencias, consultas, errores) in propias.items():
+                        medidas[nombre]['latencias'].extend(latencias)
+                        medidas[nombre]['consultas'] += consultas[0]
+                        medidas[nombre]['errores'] += errores[0]
+
+        # plantillas, caches y conexiones calientes antes de medir
+        navegador = _Cliente(application)
+        for _ in range(options['warmup']):
+            for _, metodo, ruta, datos, _ in ESCENARIOS:
+                navegador.pedir(metodo, ruta, datos)
+
+        hilos = [threading.Thread(target=cliente) for _ in range(options['clients'])]
+        for h in hilos:
+            h.start()
+        try:
+            listos.wait()
+        except threading.BrokenBarrierError:
+            for h in hilos:
+                h.join()
+            raise CommandError('Un cliente falló antes de empezar la medición.')
+        inicio = time.perf_counter()
+        for h in hilos:
+            h.join()
+        transcurrido = time.perf_counter() - inicio
+
+        escenarios = {}
+        todas = []
+        consultas_total = 0
+        errores_total = 0
+        for nombre, m in medidas.items():
+            latencias = sorted(m['latencias'])
+            todas.extend(latencias)
+            consultas_total += m['consultas']
+            errores_total += m['errores']
+            escenarios[nombre] = self._resumen(latencias, m['consultas'], m['errores'])
+        todas.sort()
+        total = self._resumen(todas, consultas_total, errores_total)
+        total['rps'] = round(len(todas) / transcurrido, 1)
+        return {
+            'config': {
+                'clients': options['clients'], 'requests': options['requests'],
+                'reservas': options['reservas'], 'feedback': options['feedback'],
+                'database': connection.vendor,
+            },
+            'segundos': round(transcurrido, 3),
+            'total': total,
+            'escenarios': escenarios,
+        }
+
+    def _resumen(self, latencias, consultas, errores):
+        n = len(latencias)
+        return {
+            'peticiones': n,
+            'errores': errores,
+            'p50_ms': round(_percentil(latencias, 0.50), 2),
+            'p95_ms': round(_percentil(latencias, 0.95), 2),
+            'p99_ms': round(_percentil(latencias, 0.99), 2),
+            'consultas_por_peticion': round(consultas / n, 2) if n else 0.0,
+        }
+
+    def _comparar(self, actual, baseline, tolerancia):
+        regresiones = []
+        pares = [('total', actual['total'], baseline.get('total', {}))] + [
+            (nombre, datos, baseline.get('escenarios', {}).get(nombre, {}))
+            for nombre, datos in actual['escenarios'].items()
+        ]
+        for nombre, datos, base in pares:
+            if datos['errores'] > base.get('errores', 0):
+                regresiones.append(f'{nombre}: {datos["errores"]} errores (baseline {base.get("errores", 0)})')
+            for clave, mayor_es_peor in COMPARADAS:
+                if clave not in datos or clave not in base:
+                    continue
+                if mayor_es_peor:
+                    peor = datos[clave] > base[clave] * (1 + tolerancia)
+                else:
+                    peor = datos[clave] < base[clave] * (1 - tolerancia)
+                if peor:
+                    regresiones.append(f'{nombre}: {clave} {datos[clave]} (baseline {base[clave]})')
+        return regresiones
@@ -0,0 +1,100 @@
+import json
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from landing import limites
+
+VISTA = 'landing:reservar'
+# buckets que no se vacían: se mide solo el camino de una petición permitida
+SIN_LIMITE = {VISTA: {'ip': (10 ** 9, 10 ** 6), 'global': (10 ** 9, 10 ** 6)}}
+
+
+def _golpear(vista, segundos, cola):
+    """Proceso hijo: consume de la misma IP hasta que pasa `segundos`; informa cuántos pasaron."""
+    permitidos = 0
+    fin = time.time() + segundos
+    while time.time() < fin:
+        permitidos += limites.consumir(vista, '203.0.113.7').permitido
+    cola.put(permitidos)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el costo del rate limiting por petición permitida (consumir y el middleware) y '
+        'comprueba con varios procesos que los buckets compartidos no dejan pasar de más.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20000)
+        parser.add_argument('--procesos', type=int, default=4, help='procesos para la prueba de corrección (0: omitir)')
+        parser.add_argument('--segundos', type=float, default=2.0)
+
+    def handle(self, *args, **options):
+        temporal = tempfile.mkdtemp(prefix='landing-ratelimit-')
+        try:
+            resultados = self._overhead(options['repeat'], temporal)
+            if options['procesos']:
+                resultados['multiproceso'] = self._multiproceso(options['procesos'], options['segundos'], temporal)
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+        self.stdout.write(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+    def _overhead(self, repeat, temporal):
+        with override_settings(LANDING_RATELIMIT=SIN_LIMITE, LANDING_RATELIMIT_DIR=os.path.join(temporal, 'overhead')):
+            ips = [f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}' for i in range(repeat)]
+            limites.consumir(VISTA, ips[0])  # abre el mmap fuera de la medición
+
+            def medir(funcion):
+                tiempos = []
+                for bloque in range(0, repeat, 100):
+                    inicio = time.perf_counter()
+                    for ip in ips[bloque:bloque + 100]:
+                        funcion(ip)
+                    tiempos.append((time.perf_counter() - inicio) * 1e6 / len(ips[bloque:bloque + 100]))
+                tiempos.sort()
+                return {'p50_us': round(statistics.median(tiempos), 2), 'p99_us': round(tiempos[len(tiempos) * 99 // 100], 2)}
+
+            request = RequestFactory().post(reverse(VISTA))
+            request.resolver_match = resolve(request.path_info)
+            middleware = limites.RateLimitMiddleware(lambda r: None)
+
+            def por_middleware(ip):
+                request.META['REMOTE_ADDR'] = ip
+                assert middleware.process_view(request, None, (), {}) is None
+
+            return {
+                'consumir': medir(lambda ip: limites.consumir(VISTA, ip)),
+                'middleware': medir(por_middleware),
+            }
+
+    def _multiproceso(self, procesos, segundos, temporal):
+        capacidad, por_segundo = 50, 100.0
+        config = {VISTA: {'ip': (capacidad, por_segundo), 'global': (10 ** 9, 10 ** 6)}}
+        with override_settings(LANDING_RATELIMIT=config, LANDING_RATELIMIT_DIR=os.path.join(temporal, 'multi')):
+            contexto = multiprocessing.get_context('fork')
+            cola = contexto.Queue()
+            hijos = [contexto.Process(target=_golpear, args=(VISTA, segundos, cola)) for _ in range(procesos)]
+            inicio = time.time()
+            for hijo in hijos:
+                hijo.start()
+            permitidos = sum(cola.get() for _ in hijos)
+            for hijo in hijos:
+                hijo.join()
+            transcurrido = time.time() - inicio
+        # cota superior: el bucket lleno más lo rellenado durante toda la prueba
+        maximo = capacidad + por_segundo * transcurrido
+        return {
+            'procesos': procesos,
+            'segundos': round(transcurrido, 2),
+            'permitidos': permitidos,
+            'maximo_teorico': round(maximo),
+            'ok': permitidos <= maximo,
+        }
@@ -0,0 +1,46 @@
+import json
+import statistics
+import time
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from landing.models import Feedback, Reserva
+
+TERMINOS = {
+    Reserva: ['perez', 'gmail.com', 'juan perez', 'n123456', 'u99@'],
+    Feedback: ['excelente', 'teclado', 'dolor de muñeca', 'ana'],
+}
+PAGINA = 100
+
+
+class Command(BaseCommand):
+    help = 'Mide la búsqueda del changelist del admin (conteo + primera página) para Reserva y Feedback.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--term', action='append', dest='terminos', help='término extra a medir')
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/admin/')
+        resultados = {}
+        for modelo, terminos in TERMINOS.items():
+            modeladmin = admin.site._registry[modelo]
+            base = modelo.objects.order_by('-pk')
+            for termino in terminos + (options['terminos'] or []):
+                tiempos = []
+                for _ in range(options['repeat']):
+                    inicio = time.perf_counter()
+                    queryset, _ = modeladmin.get_search_results(request, base, termino)
+                    total = queryset.count()
+                    list(queryset[:PAGINA])
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                tiempos.sort()
+                resultados[f'{modelo._meta.model_name}:{termino}'] = {
+                    'filas': total,
+                    'p50_ms': round(statistics.median(tiempos), 2),
+                    'max_ms': round(tiempos[-1], 2),
+                }
+        resultados['_tamano'] = {m._meta.model_name: m.objects.count() for m in TERMINOS}
+        self.stdout.write(json.dumps(resultados, indent=2, ensure_ascii=False))
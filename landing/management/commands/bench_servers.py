@@ -0,0 +1,137 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.client import HTTPConnection
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+MODOS = {
+    'wsgi': ['config.wsgi'],
+    'asgi': ['config.asgi', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+RUTAS = ['/', '/empresas/', '/reservar/?tipo=kit']
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _get(puerto, ruta, timeout=10):
+    conn = HTTPConnection('127.0.0.1', puerto, timeout=timeout)
+    try:
+        conn.request('GET', ruta)
+        respuesta = conn.getresponse()
+        respuesta.read()
+        return respuesta.status
+    finally:
+        conn.close()
+
+
+class Command(BaseCommand):
+    help = 'Compara peticiones/seg de gunicorn sync (WSGI) vs uvicorn (ASGI, vistas async) con los mismos workers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=3)
+        parser.add_argument('--concurrency', type=int, default=16, help='clientes simultáneos')
+        parser.add_argument('--duration', type=float, default=10.0, help='segundos por modo')
+        parser.add_argument('--modes', default='wsgi,asgi')
+        parser.add_argument('--json', action='store_true', help='salida en JSON')
+
+    def handle(self, *args, **options):
+        resultados = {}
+        for modo in options['modes'].split(','):
+            if modo not in MODOS:
+                raise CommandError(f'Modo desconocido: {modo}')
+            resultados[modo] = self._medir(modo, options)
+            if not options['json']:
+                r = resultados[modo]
+                self.stdout.write(
+                    f"{modo}: {r['rps']:.1f} req/s  p50 {r['p50_ms']:.1f} ms  "
+                    f"p95 {r['p95_ms']:.1f} ms  errores {r['errores']}"
+                )
+        if options['json']:
+            self.stdout.write(json.dumps(resultados, indent=2))
+
+    def _arrancar(self, modo, puerto, workers):
+        env = dict(os.environ, DJANGO_ASYNC_VIEWS='1' if modo == 'asgi' else '0')
+        cmd = [
+            sys.executable, '-m', 'gunicorn', *MODOS[modo],
+            '-c', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+            '--bind', f'127.0.0.1:{puerto}', '--workers', str(workers),
+            '--log-level', 'warning',
+        ]
+        proceso = subprocess.Popen(cmd, cwd=settings.BASE_DIR, env=env)
+        limite = time.monotonic() + 30
+        while time.monotonic() < limite:
+            try:
+                if _get(puerto, '/ready/', timeout=1) == 200:
+                    return proceso
+            except OSError:
+                pass
+            time.sleep(0.2)
+        proceso.terminate()
+        raise CommandError(f'gunicorn ({modo}) no quedó listo en 30 s')
+
+    def _medir(self, modo, options):
+        puerto = _puerto_libre()
+        proceso = self._arrancar(modo, puerto, options['workers'])
+        latencias = []
+        errores = [0]
+        lock = threading.Lock()
+        fin = time.monotonic() + options['duration']
+
+        def cliente(indice):
+            propias = []
+            fallos = 0
+            i = indice
+            while time.monotonic() < fin:
+                ruta = RUTAS[i % len(RUTAS)]
+                i += 1
+                inicio = time.perf_counter()
+                try:
+                    if _get(puerto, ruta) != 200:
+                        fallos += 1
+                        continue
+                except OSError:
+                    fallos += 1
+                    continue
+                propias.append(time.perf_counter() - inicio)
+            with lock:
+                latencias.extend(propias)
+                errores[0] += fallos
+
+        try:
+            hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(options['concurrency'])]
+            inicio = time.monotonic()
+            for h in hilos:
+                h.start()
+            for h in hilos:
+                h.join()
+            transcurrido = time.monotonic() - inicio
+        finally:
+            proceso.terminate()
+            proceso.wait()
+
+        latencias.sort()
+
+        def percentil(p):
+            if not latencias:
+                return 0.0
+            return latencias[min(len(latencias) - 1, int(len(latencias) * p))] * 1000
+
+        return {
+            'workers': options['workers'],
+            'concurrency': options['concurrency'],
+            'requests': len(latencias),
+            'errores': errores[0],
+            'rps': len(latencias) / transcurrido,
+            'p50_ms': percentil(0.50),
+            'p95_ms': percentil(0.95),
+        }
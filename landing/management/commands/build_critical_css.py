@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from landing import bundles, critico
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera el CSS crítico (sobre el pliegue) de cada página de la landing para insertarlo en base.html. '
+        'Falla si alguna supera LANDING_CRITICAL_CSS_MAX_BYTES.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='regenerar aunque ya exista para el CSS actual')
+
+    def handle(self, *args, **options):
+        # el CSS crítico sale de los bundles: sin collectstatic previo, se generan aquí
+        bundles.generar()
+        resultado = critico.generar(forzar=options['force'])
+        maximo = settings.LANDING_CRITICAL_CSS_MAX_BYTES
+        excedidas = []
+        for plantilla, (tamano, regenerado) in resultado.items():
+            estado = 'generado' if regenerado else 'sin cambios'
+            self.stdout.write(f'{plantilla}: {tamano} bytes ({estado})')
+            if maximo and tamano > maximo:
+                excedidas.append(plantilla)
+        if excedidas:
+            raise CommandError(
+                f"CSS crítico de {', '.join(excedidas)} supera {maximo} bytes: "
+                'revisa ELEMENTOS_PLIEGUE en landing/critico.py o las reglas que aplican sobre el pliegue.'
+            )
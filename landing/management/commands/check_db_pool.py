@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from landing.prometheus import ENGINE_POOL
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejercita el pool de conexiones de Postgres (DATABASE_URL con ?pool=true) desde varios hilos '
+        'y verifica que el servidor nunca vea más conexiones que pool_max_size.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=20)
+        parser.add_argument('--checkouts', type=int, default=50, help='checkouts por hilo')
+        parser.add_argument('--hold', type=float, default=0.005, help='segundos con la conexión tomada')
+
+    def handle(self, *args, **options):
+        if settings.DATABASES['default']['ENGINE'] != ENGINE_POOL:
+            raise CommandError(f'DATABASE_URL debe usar ?pool=true (ENGINE {ENGINE_POOL}).')
+        pool = connection.pool
+        errores = []
+        # máximo de conexiones en uso en el pool y vistas por el servidor en esta base
+        maximo = {'en_uso': 0, 'servidor': 0}
+        lock = threading.Lock()
+
+        def trabajar():
+            for _ in range(options['checkouts']):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            'SELECT pg_sleep(%s), (SELECT count(*) FROM pg_stat_activity '
+                            'WHERE datname = current_database() AND pid <> pg_backend_pid())',
+                            [options['hold']],
+                        )
+                        servidor = cursor.fetchone()[1] + 1
+                    with lock:
+                        maximo['en_uso'] = max(maximo['en_uso'], pool.estadisticas()['en_uso'])
+                        maximo['servidor'] = max(maximo['servidor'], servidor)
+                except Exception as e:
+                    errores.append(repr(e))
+                finally:
+                    # fin de "petición": la conexión vuelve al pool
+                    connection.close()
+
+        inicio = time.perf_counter()
+        hilos = [threading.Thread(target=trabajar) for _ in range(options['threads'])]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        segundos = time.perf_counter() - inicio
+
+        estadisticas = pool.estadisticas()
+        total = options['threads'] * options['checkouts']
+        self.stdout.write(json.dumps({
+            'checkouts': total,
+            'segundos': round(segundos, 3),
+            'checkouts_por_segundo': round(total / segundos, 1),
+            'max_en_uso': maximo['en_uso'],
+            'max_conexiones_servidor': maximo['servidor'],
+            'errores': len(errores),
+            'pool': estadisticas,
+        }, indent=2))
+        if errores:
+            self.stderr.write('\n'.join(errores[:5]))
+            raise CommandError(f'{len(errores)} checkouts fallaron.')
+        # el servidor puede ver otros procesos (p. ej. gunicorn): se controla el pool propio
+        if maximo['en_uso'] > estadisticas['max_size'] or (
+            estadisticas['creadas'] - estadisticas['cerradas'] > estadisticas['max_size']
+        ):
+            raise CommandError('El pool abrió más conexiones que pool_max_size.')
+        self.stdout.write(self.style.SUCCESS('Pool dentro de su límite.'))
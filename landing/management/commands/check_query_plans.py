@@ -0,0 +1,134 @@
+import re
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from landing.models import Feedback, Reserva
+
+# (nombre, método, url, datos POST)
+ESCENARIOS = [
+    ('landing:home', 'get', lambda: reverse('landing:home'), None),
+    ('landing:reservar GET', 'get', lambda: reverse('landing:reservar') + '?tipo=kit', None),
+    ('landing:reservar POST', 'post', lambda: reverse('landing:reservar'),
+     {'nombre': 'Plan', 'email': 'plan@example.com', 'tipo': 'kit'}),
+    ('landing:feedback POST', 'post', lambda: reverse('landing:feedback'),
+     {'nombre': 'Plan', 'rating': '5', 'comentario': 'ok'}),
+    ('landing:empresas', 'get', lambda: reverse('landing:empresas'), None),
+    ('landing:gracias', 'get', lambda: reverse('landing:gracias'), None),
+    ('admin reserva', 'get', lambda: reverse('admin:landing_reserva_changelist'), None),
+    ('admin reserva ?tipo', 'get', lambda: reverse('admin:landing_reserva_changelist') + '?tipo__exact=kit', None),
+    ('admin reserva ?creado', 'get', lambda: reverse('admin:landing_reserva_changelist')
+     + '?creado__gte=2025-01-01+00:00:00%2B00:00&creado__lt=2025-02-01+00:00:00%2B00:00', None),
+    ('admin reserva ?q', 'get', lambda: reverse('admin:landing_reserva_changelist') + '?q=perez', None),
+    ('admin feedback', 'get', lambda: reverse('admin:landing_feedback_changelist'), None),
+    ('admin feedback ?rating', 'get', lambda: reverse('admin:landing_feedback_changelist') + '?rating__exact=5', None),
+    ('admin feedback ?q', 'get', lambda: reverse('admin:landing_feedback_changelist') + '?q=teclado', None),
+    ('admin dashboard', 'get', lambda: reverse('admin:landing_dashboard'), None),
+]
+TABLAS_CALIENTES = ('landing_reserva', 'landing_feedback', 'landing_metrica', 'landing_resumen')
+# un COUNT(*) sin filtros (changelist sin búsqueda) recorre la tabla por definición
+PERMITIDAS = [re.compile(r'^SELECT COUNT\(\*\) AS "__count" FROM "landing_\w+"$')]
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta las vistas de la landing y los changelists del admin, corre EXPLAIN sobre cada '
+        'consulta y falla si alguna recorre completa una tabla caliente.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='mostrar todos los planes')
+
+    def handle(self, *args, **options):
+        fallas = []
+        # sin cache, write-behind ni rate limiting para que cada vista emita todas
+        # sus consultas; todo corre en una transacción que se revierte al final
+        with override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            LANDING_WRITE_BEHIND=False,
+            LANDING_RATELIMIT={},
+        ), transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    # que el plan refleje los índices disponibles, no el tamaño de la tabla
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            cliente = Client()
+            cliente.force_login(get_user_model().objects.create_superuser('plan-check', 'plan@example.com', None))
+            # con más filas que list_per_page el changelist pagina (LIMIT) como en producción
+            for i in range(2):
+                Reserva.objects.create(nombre=f'Plan {i}', email='plan@example.com')
+                Feedback.objects.create(nombre=f'Plan {i}', rating=5)
+            admins = [admin.site._registry[m] for m in (Reserva, Feedback)]
+            por_pagina = [a.list_per_page for a in admins]
+            for a in admins:
+                a.list_per_page = 1
+            try:
+                self._recorrer(cliente, options, fallas)
+            finally:
+                for a, valor in zip(admins, por_pagina):
+                    a.list_per_page = valor
+            transaction.set_rollback(True)
+
+        if fallas:
+            raise CommandError(f'{len(fallas)} consultas recorren una tabla completa (ver planes arriba).')
+        self.stdout.write(self.style.SUCCESS('Sin escaneos completos en consultas calientes.'))
+
+    def _recorrer(self, cliente, options, fallas):
+        for nombre, metodo, url, datos in ESCENARIOS:
+            consultas = self._capturar(cliente, metodo, url(), datos)
+            for sql, params in consultas:
+                plan = self._explicar(sql, params)
+                if plan is None:
+                    continue
+                escaneos = self._escaneos(sql, plan)
+                if escaneos:
+                    fallas.append((nombre, sql, plan))
+                if options['verbose_plans'] or escaneos:
+                    self.stdout.write(f'[{nombre}] {sql}')
+                    for linea in plan:
+                        self.stdout.write(f'    {linea}')
+            self.stdout.write(f'{nombre}: {len(consultas)} consultas')
+
+    def _capturar(self, cliente, metodo, url, datos):
+        consultas = []
+
+        def registrar(execute, sql, params, many, context):
+            consultas.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(registrar):
+            getattr(cliente, metodo)(url, datos or {})
+        return consultas
+
+    def _explicar(self, sql, params):
+        if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            return None
+        if not any(tabla in sql for tabla in TABLAS_CALIENTES):
+            return None
+        prefijo = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(prefijo + sql, params)
+            filas = cursor.fetchall()
+        return [fila[-1] for fila in filas]
+
+    def _escaneos(self, sql, plan):
+        if any(patron.match(sql) for patron in PERMITIDAS):
+            return []
+        ordena_aparte = any('TEMP B-TREE' in linea or linea.strip().startswith('Sort') for linea in plan)
+        # un recorrido en orden de índice con LIMIT se detiene temprano
+        corta = ' LIMIT ' in sql.upper() and not ordena_aparte
+        escaneos = []
+        for linea in plan:
+            if connection.vendor == 'sqlite':
+                m = re.match(r'SCAN (\w+)', linea.strip())
+                if m and 'VIRTUAL TABLE' not in linea and m.group(1) in TABLAS_CALIENTES and not corta:
+                    escaneos.append(linea)
+            else:
+                m = re.search(r'Seq Scan on (\w+)', linea)
+                if m and m.group(1) in TABLAS_CALIENTES and not corta:
+                    escaneos.append(linea)
+        return escaneos
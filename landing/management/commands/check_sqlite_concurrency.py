@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+
+from landing.models import Metrica, Reserva
+
+
+def _perfil_estandar():
+    # backend sqlite3 de Django sin pragmas, BEGIN diferido ni reintentos
+    ajustes = connections.settings['default']
+    ajustes.update(ENGINE='django.db.backends.sqlite3', OPTIONS={}, CONN_MAX_AGE=0)
+    del connections['default']
+
+
+def _escritor(args):
+    indice, escrituras, estandar = args
+    if estandar:
+        _perfil_estandar()
+    bloqueos = otros = 0
+    inicio = time.perf_counter()
+    for i in range(escrituras):
+        try:
+            # como un POST de reservar (INSERT + Metrica por señal) intercalado
+            # con lecturas del admin, que en modo rollback bloquean al escritor
+            Reserva.objects.create(nombre=f'Escritor {indice}', email=f'w{indice}-{i}@example.com', tipo='kit')
+            Metrica.objects.leer(Metrica.RESERVAS)
+            list(Reserva.objects.filter(tipo='kit').values_list('email', flat=True))
+        except OperationalError as e:
+            if 'locked' in str(e):
+                bloqueos += 1
+            else:
+                otros += 1
+        finally:
+            connection.close_if_unusable_or_obsolete()
+    connection.close()
+    return bloqueos, otros, time.perf_counter() - inicio
+
+
+class Command(BaseCommand):
+    help = (
+        'Lanza N procesos que escriben en paralelo sobre una copia desechable de la base SQLite '
+        '(como los workers de gunicorn) y falla si alguno recibe "database is locked".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='procesos escritores')
+        parser.add_argument('--writes', type=int, default=200, help='reservas por escritor')
+        parser.add_argument(
+            '--stock', action='store_true',
+            help='usar el backend sqlite3 estándar (sin WAL ni reintentos) para comparar',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Solo aplica a SQLite.')
+        temporal = tempfile.mkdtemp(prefix='landing-sqlite-')
+        original = connection.settings_dict['NAME']
+        try:
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(temporal, 'concurrencia.sqlite3')
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                if options['stock']:
+                    with connection.cursor() as cursor:
+                        cursor.execute('PRAGMA journal_mode = DELETE')
+                resultado = self._correr(options)
+            finally:
+                connection.creation.destroy_test_db(original, verbosity=0)
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        bloqueos, otros, esperadas, insertadas, metrica, segundos = resultado
+        total = options['writers'] * options['writes']
+        self.stdout.write(
+            f"{options['writers']} escritores x {options['writes']}: {insertadas}/{total} reservas en "
+            f"{segundos:.2f}s ({insertadas / segundos:.0f}/s), {bloqueos} 'database is locked', {otros} otros errores"
+        )
+        if metrica != insertadas:
+            raise CommandError(f'Metrica reservas={metrica} no coincide con {insertadas} filas.')
+        if bloqueos or otros or insertadas != esperadas:
+            raise CommandError('Hubo errores de escritura concurrente.')
+        self.stdout.write(self.style.SUCCESS('Sin errores de bloqueo.'))
+
+    def _correr(self, options):
+        # los hijos (fork) abren sus propias conexiones
+        connections.close_all()
+        trabajos = [(i, options['writes'], options['stock']) for i in range(options['writers'])]
+        inicio = time.perf_counter()
+        with multiprocessing.get_context('fork').Pool(options['writers']) as pool:
+            resultados = pool.map(_escritor, trabajos)
+        segundos = time.perf_counter() - inicio
+        bloqueos = sum(r[0] for r in resultados)
+        otros = sum(r[1] for r in resultados)
+        esperadas = options['writers'] * options['writes'] - bloqueos - otros
+        return (
+            bloqueos, otros, esperadas, Reserva.objects.count(),
+            Metrica.objects.leer(Metrica.RESERVAS)[Metrica.RESERVAS], segundos,
+        )
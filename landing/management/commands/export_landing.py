@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from landing.export import CHUNK_SIZE, FORMATOS, filtrar, lineas
+from landing.models import Feedback, Reserva
+
+MODELOS = {'reserva': Reserva, 'feedback': Feedback}
+
+
+def _fecha(valor):
+    fecha = parse_date(valor)
+    if fecha is None:
+        raise CommandError(f'Fecha inválida (use AAAA-MM-DD): {valor}')
+    return fecha
+
+
+class Command(BaseCommand):
+    help = 'Exporta reservas o feedback en streaming (CSV o NDJSON) con memoria constante.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('modelo', choices=sorted(MODELOS))
+        parser.add_argument('--format', dest='formato', choices=sorted(FORMATOS), default='csv')
+        parser.add_argument('--tipo', help='solo reservas de este tipo')
+        parser.add_argument('--desde', type=_fecha, help='creado desde (AAAA-MM-DD, inclusive)')
+        parser.add_argument('--hasta', type=_fecha, help='creado hasta (AAAA-MM-DD, inclusive)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--output', '-o', help='archivo de salida (por defecto stdout)')
+
+    def handle(self, *args, **options):
+        modelo = MODELOS[options['modelo']]
+        if options['tipo'] and modelo is not Reserva:
+            raise CommandError('--tipo solo aplica a reservas.')
+        queryset = filtrar(modelo.objects.all(), options['tipo'], options['desde'], options['hasta'])
+        salida = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            for bloque in lineas(queryset, options['formato'], options['chunk_size']):
+                salida.write(bloque)
+        finally:
+            if salida is not sys.stdout:
+                salida.close()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from landing import journal
+
+
+class Command(BaseCommand):
+    help = 'Vuelca a la base de datos el journal write-behind pendiente (replay tras una caída).'
+
+    def handle(self, *args, **options):
+        total = journal.drenar()
+        if total is None:
+            raise CommandError('Otro proceso está volcando el journal en este momento.')
+        self.stdout.write(self.style.SUCCESS(f'Journal volcado: {total} registros.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from landing.models import Metrica
+
+
+class Command(BaseCommand):
+    help = 'Recalcula las métricas desnormalizadas de la landing desde Reserva y Feedback.'
+
+    def handle(self, *args, **options):
+        antes = dict(Metrica.objects.values_list('clave', 'valor'))
+        valores = Metrica.objects.reconstruir()
+        for clave, valor in sorted(valores.items()):
+            previo = antes.get(clave, 0)
+            marca = '' if previo == valor else f'  (antes {previo})'
+            self.stdout.write(f'{clave}: {valor}{marca}')
+        self.stdout.write(self.style.SUCCESS('Métricas reconstruidas.'))
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from landing.models import Resumen
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula los rollups por hora y por día (Resumen) desde Reserva y Feedback. '
+        'Con --desde solo reemplaza los buckets a partir de ese día.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help='fecha YYYY-MM-DD (zona horaria del proyecto)')
+        parser.add_argument('--si-vacio', action='store_true', help='no hacer nada si ya hay rollups (start.sh)')
+
+    def handle(self, *args, **options):
+        if options['si_vacio'] and Resumen.objects.exists():
+            self.stdout.write('Rollups ya presentes, nada que hacer.')
+            return
+        desde = None
+        if options['desde']:
+            try:
+                desde = timezone.make_aware(datetime.strptime(options['desde'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('--desde debe tener el formato YYYY-MM-DD')
+        total = Resumen.objects.reconstruir(desde)
+        self.stdout.write(self.style.SUCCESS(f'{total} buckets reconstruidos.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from landing import search
+
+
+class Command(BaseCommand):
+    help = 'Recrea y reindexa las tablas/índices de búsqueda del admin (FTS5 en SQLite, trigram en Postgres).'
+
+    def handle(self, *args, **options):
+        if search.instalar(connection):
+            self.stdout.write(self.style.SUCCESS(f'Índices de búsqueda reconstruidos ({connection.vendor}).'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'{connection.vendor} no soporta búsqueda indexada; el admin usa LIKE.'
+            ))
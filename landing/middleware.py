@@ -0,0 +1,259 @@
+import contextvars
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import prometheus
+
+logger = logging.getLogger('landing.sql')
+
+# estado de la petición en curso (None fuera de una petición instrumentada)
+_peticion = contextvars.ContextVar('landing_peticion', default=None)
+
+
+class _Medicion:
+    __slots__ = ('consultas', 'sql_ms', 'plantillas_ms')
+
+    def __init__(self):
+        self.consultas = []
+        self.sql_ms = 0.0
+        self.plantillas_ms = 0.0
+
+
+class _Registro:
+    """Acumulados por nombre de URL en este proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vistas = {}
+
+    def agregar(self, vista, consultas, sql_ms, plantillas_ms, vista_ms):
+        with self._lock:
+            fila = self._vistas.setdefault(vista, [0, 0, 0.0, 0.0, 0.0])
+            fila[0] += 1
+            fila[1] += consultas
+            fila[2] += sql_ms
+            fila[3] += plantillas_ms
+            fila[4] += vista_ms
+
+    def resumen(self):
+        with self._lock:
+            return {
+                vista: {
+                    'peticiones': n,
+                    'consultas_promedio': consultas / n,
+                    'sql_ms_promedio': sql_ms / n,
+                    'plantillas_ms_promedio': plantillas_ms / n,
+                    'vista_ms_promedio': vista_ms / n,
+                }
+                for vista, (n, consultas, sql_ms, plantillas_ms, vista_ms) in self._vistas.items()
+            }
+
+
+registro = _Registro()
+
+
+def _registrar_consulta(execute, sql, params, many, context):
+    medicion = _peticion.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duracion = (time.perf_counter() - inicio) * 1000
+        medicion.sql_ms += duracion
+        medicion.consultas.append((duracion, sql))
+
+
+def _instalar_wrapper(connection, **kwargs):
+    # queda instalado en cada conexión (la de cada hilo, también la del hilo
+    # donde el ORM async ejecuta las consultas) y solo mide dentro de una
+    # petición: la ContextVar llega a los hilos de sync_to_async
+    if _registrar_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_registrar_consulta)
+
+
+class PresupuestoSQLMiddleware:
+    """
+    Mide por petición la cantidad de consultas, el tiempo en SQL, el render
+    de plantillas y el tiempo de la vista, agrupado por nombre de URL. Usa
+    un execute_wrapper en cada conexión, así que funciona con DEBUG=False.
+    El render se mide en las TemplateResponse (process_template_response):
+    las vistas de la landing y el admin las devuelven.
+
+    Si una vista supera su presupuesto (LANDING_SQL_BUDGETS) se registra un
+    warning con las consultas. Va al final de MIDDLEWARE para que el tiempo
+    medido sea el de la vista.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # sin salto de hilo: Django adapta estos métodos al modo del handler
+            self.process_template_response = self._aprocess_template_response
+        self.presupuestos = getattr(settings, 'LANDING_SQL_BUDGETS', {})
+        self.server_timing = getattr(settings, 'LANDING_SERVER_TIMING', False)
+        connection_created.connect(_instalar_wrapper, dispatch_uid='landing.middleware.presupuesto_sql')
+        # las conexiones que este hilo ya tenía abiertas
+        for conexion in connections.all(initialized_only=True):
+            _instalar_wrapper(conexion)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        medicion = _Medicion()
+        token = _peticion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _peticion.reset(token)
+        return self._terminar(request, response, medicion, inicio)
+
+    async def __acall__(self, request):
+        medicion = _Medicion()
+        token = _peticion.set(medicion)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _peticion.reset(token)
+        return self._terminar(request, response, medicion, inicio)
+
+    def process_template_response(self, request, response):
+        # Django renderiza la respuesta justo después de los
+        # process_template_response, y este corre primero (va al final de MIDDLEWARE)
+        medicion = _peticion.get()
+        if medicion is not None:
+            inicio = time.perf_counter()
+
+            def medir(response):
+                medicion.plantillas_ms += (time.perf_counter() - inicio) * 1000
+
+            response.add_post_render_callback(medir)
+        return response
+
+    async def _aprocess_template_response(self, request, response):
+        return PresupuestoSQLMiddleware.process_template_response(self, request, response)
+
+    def _terminar(self, request, response, medicion, inicio):
+        vista_ms = (time.perf_counter() - inicio) * 1000
+        match = getattr(request, 'resolver_match', None)
+        vista = match.view_name if match else None
+        if vista:
+            registro.agregar(vista, len(medicion.consultas), medicion.sql_ms, medicion.plantillas_ms, vista_ms)
+            self._revisar_presupuesto(request, vista, medicion)
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'sql;dur={medicion.sql_ms:.1f};desc="{len(medicion.consultas)} consultas", '
+                f'tpl;dur={medicion.plantillas_ms:.1f}, view;dur={vista_ms:.1f}'
+            )
+        return response
+
+    def _revisar_presupuesto(self, request, vista, medicion):
+        presupuesto = (
+            self.presupuestos.get(f'{request.method} {vista}')
+            or self.presupuestos.get(vista)
+            or self.presupuestos.get('*')
+        )
+        if not presupuesto:
+            return
+        excesos = []
+        max_consultas = presupuesto.get('queries')
+        max_sql_ms = presupuesto.get('sql_ms')
+        if max_consultas is not None and len(medicion.consultas) > max_consultas:
+            excesos.append(f'{len(medicion.consultas)} consultas (máx {max_consultas})')
+        if max_sql_ms is not None and medicion.sql_ms > max_sql_ms:
+            excesos.append(f'{medicion.sql_ms:.1f} ms en SQL (máx {max_sql_ms})')
+        if not excesos:
+            return
+        detalle = '\n'.join(
+            f'  {i}. {duracion:.2f} ms  {sql}' for i, (duracion, sql) in enumerate(medicion.consultas, 1)
+        )
+        logger.warning(
+            '%s %s %s excedió su presupuesto SQL: %s\n%s',
+            vista, request.method, request.path, ', '.join(excesos), detalle,
+        )
+
+
+class MetricasPrometheusMiddleware:
+    """
+    Cuenta peticiones, códigos de estado y latencia por nombre de URL en el
+    registro multiproceso de `landing.prometheus`. Va primero en MIDDLEWARE
+    para medir la petición completa.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.pools = [
+            alias for alias, db in settings.DATABASES.items() if db['ENGINE'] == prometheus.ENGINE_POOL
+        ]
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        inicio = time.perf_counter()
+        response = self.get_response(request)
+        self._registrar(request, response, inicio)
+        return response
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        response = await self.get_response(request)
+        self._registrar(request, response, inicio)
+        return response
+
+    def _registrar(self, request, response, inicio):
+        match = getattr(request, 'resolver_match', None)
+        prometheus.registrar_peticion(
+            match.view_name if match else None, response.status_code, time.perf_counter() - inicio,
+        )
+        for alias in self.pools:
+            prometheus.registrar_pool(alias, connections[alias].estadisticas_pool())
+
+
+class EstaticosMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware que además acepta un get_response async. WhiteNoise
+    6.5 es solo sync, y bajo ASGI eso obligaba a correr en un hilo todo el
+    tramo de la cadena por encima de él. Los estáticos se sirven igual que
+    antes (en un hilo: abren el archivo); el resto pasa sin cambiar de hilo.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:11
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def poblar_metricas(apps, schema_editor):
+    # sembrar los contadores con los datos ya existentes
+    Reserva = apps.get_model('landing', 'Reserva')
+    Feedback = apps.get_model('landing', 'Feedback')
+    Metrica = apps.get_model('landing', 'Metrica')
+    valores = {'reservas': 0}
+    for tipo, total in Reserva.objects.values_list('tipo').annotate(total=Count('id')).order_by():
+        valores[f'reservas_{tipo}'] = total
+        valores['reservas'] += total
+    ratings = Feedback.objects.aggregate(suma=Sum('rating'), total=Count('id'))
+    valores['rating_suma'] = ratings['suma'] or 0
+    valores['rating_total'] = ratings['total']
+    Metrica.objects.bulk_create([Metrica(clave=k, valor=v) for k, v in valores.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0002_feedback_alter_reserva_deposito_alter_reserva_tipo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Metrica',
+            fields=[
+                ('clave', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('valor', models.BigIntegerField(default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(poblar_metricas, migrations.RunPython.noop),
+    ]
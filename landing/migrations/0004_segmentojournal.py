@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0003_metrica'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SegmentoJournal',
+            fields=[
+                ('nombre', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('volcado', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
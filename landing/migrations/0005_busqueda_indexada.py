@@ -0,0 +1,89 @@
+import sqlite3
+
+from django.db import migrations
+
+# SQL congelado a la fecha de la migración (no se importa landing.search: si
+# ese módulo cambia, una base nueva debe quedar igual que las ya migradas).
+# Después de cambiar las columnas indexadas, `manage.py rebuild_search_index`.
+SQLITE = [
+    "CREATE VIRTUAL TABLE landing_reserva_fts USING fts5("
+    "nombre, email, content='landing_reserva', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER landing_reserva_fts_ai AFTER INSERT ON landing_reserva BEGIN "
+    "INSERT INTO landing_reserva_fts(rowid, nombre, email) VALUES (new.id, new.nombre, new.email); END",
+    "CREATE TRIGGER landing_reserva_fts_ad AFTER DELETE ON landing_reserva BEGIN "
+    "INSERT INTO landing_reserva_fts(landing_reserva_fts, rowid, nombre, email) "
+    "VALUES ('delete', old.id, old.nombre, old.email); END",
+    "CREATE TRIGGER landing_reserva_fts_au AFTER UPDATE OF nombre, email ON landing_reserva BEGIN "
+    "INSERT INTO landing_reserva_fts(landing_reserva_fts, rowid, nombre, email) "
+    "VALUES ('delete', old.id, old.nombre, old.email); "
+    "INSERT INTO landing_reserva_fts(rowid, nombre, email) VALUES (new.id, new.nombre, new.email); END",
+    "INSERT INTO landing_reserva_fts(landing_reserva_fts) VALUES ('rebuild')",
+    "CREATE VIRTUAL TABLE landing_feedback_fts USING fts5("
+    "nombre, email, comentario, content='landing_feedback', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER landing_feedback_fts_ai AFTER INSERT ON landing_feedback BEGIN "
+    "INSERT INTO landing_feedback_fts(rowid, nombre, email, comentario) "
+    "VALUES (new.id, new.nombre, new.email, new.comentario); END",
+    "CREATE TRIGGER landing_feedback_fts_ad AFTER DELETE ON landing_feedback BEGIN "
+    "INSERT INTO landing_feedback_fts(landing_feedback_fts, rowid, nombre, email, comentario) "
+    "VALUES ('delete', old.id, old.nombre, old.email, old.comentario); END",
+    "CREATE TRIGGER landing_feedback_fts_au AFTER UPDATE OF nombre, email, comentario ON landing_feedback BEGIN "
+    "INSERT INTO landing_feedback_fts(landing_feedback_fts, rowid, nombre, email, comentario) "
+    "VALUES ('delete', old.id, old.nombre, old.email, old.comentario); "
+    "INSERT INTO landing_feedback_fts(rowid, nombre, email, comentario) "
+    "VALUES (new.id, new.nombre, new.email, new.comentario); END",
+    "INSERT INTO landing_feedback_fts(landing_feedback_fts) VALUES ('rebuild')",
+]
+SQLITE_BORRAR = [
+    f'DROP TRIGGER IF EXISTS {fts}_{trigger}'
+    for fts in ('landing_reserva_fts', 'landing_feedback_fts') for trigger in ('ai', 'ad', 'au')
+] + ['DROP TABLE IF EXISTS landing_reserva_fts', 'DROP TABLE IF EXISTS landing_feedback_fts']
+
+# índices GIN trigram sobre la expresión que Django genera para icontains
+POSTGRES = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS landing_reserva_nombre_trgm ON landing_reserva USING gin (UPPER("nombre"::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS landing_reserva_email_trgm ON landing_reserva USING gin (UPPER("email"::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS landing_feedback_nombre_trgm ON landing_feedback USING gin (UPPER("nombre"::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS landing_feedback_email_trgm ON landing_feedback USING gin (UPPER("email"::text) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS landing_feedback_comentario_trgm ON landing_feedback USING gin (UPPER("comentario"::text) gin_trgm_ops)',
+]
+POSTGRES_BORRAR = [
+    'DROP INDEX IF EXISTS landing_reserva_nombre_trgm',
+    'DROP INDEX IF EXISTS landing_reserva_email_trgm',
+    'DROP INDEX IF EXISTS landing_feedback_nombre_trgm',
+    'DROP INDEX IF EXISTS landing_feedback_email_trgm',
+    'DROP INDEX IF EXISTS landing_feedback_comentario_trgm',
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def crear_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    # FTS5 con tokenizer trigram desde SQLite 3.34
+    if vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 34, 0):
+        _ejecutar(schema_editor, SQLITE_BORRAR + SQLITE)
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES)
+
+
+def borrar_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _ejecutar(schema_editor, SQLITE_BORRAR)
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES_BORRAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0004_segmentojournal'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, borrar_indices),
+    ]
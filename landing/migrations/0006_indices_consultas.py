@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0005_busqueda_indexada'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(condition=models.Q(('rating__gte', 4)), fields=['-creado'], name='feedback_publicado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['rating', 'creado'], name='feedback_rating_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['creado'], name='feedback_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['tipo', 'creado'], name='reserva_tipo_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reserva',
+            index=models.Index(fields=['creado'], name='reserva_creado_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:44
+
+from django.db import migrations, models
+
+# los precios que mostraban la vista y reservar.html (el depósito es el 100%
+# del precio, salvo el piloto para empresas)
+PRODUCTOS = [
+    ('teclado', 'TeclaFácil (solo)', 250000, 250000),
+    ('kit', 'Kit Profesional (Teclado + mouse + audífonos)', 350000, 350000),
+    ('pilot', 'Programa Piloto (Empresas) — Incluye soporte y métricas', 200000, 0),
+]
+
+
+def poblar_productos(apps, schema_editor):
+    Producto = apps.get_model('landing', 'Producto')
+    Producto.objects.bulk_create([
+        Producto(tipo=tipo, titulo=titulo, precio=precio, deposito=deposito)
+        for tipo, titulo, precio, deposito in PRODUCTOS
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0006_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Producto',
+            fields=[
+                ('tipo', models.CharField(choices=[('teclado', 'TeclaFácil (solo)'), ('kit', 'TeclaFácil + mouse + audífonos (Kit Profesional)'), ('pilot', 'Programa Piloto (Empresa)')], max_length=50, primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=120)),
+                ('precio', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('deposito', models.DecimalField(decimal_places=2, max_digits=10)),
+            ],
+            options={
+                'ordering': ['precio'],
+            },
+        ),
+        migrations.RunPython(poblar_productos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-17 00:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0007_producto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Resumen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('serie', models.CharField(choices=[('reservas', 'Reservas por tipo'), ('feedback', 'Feedback por rating')], max_length=20)),
+                ('periodo', models.CharField(choices=[('hora', 'Hora'), ('dia', 'Día')], max_length=10)),
+                ('inicio', models.DateTimeField()),
+                ('clave', models.CharField(max_length=50)),
+                ('cantidad', models.BigIntegerField(default=0)),
+                ('monto', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='resumen',
+            constraint=models.UniqueConstraint(fields=('serie', 'periodo', 'inicio', 'clave'), name='resumen_bucket_unico'),
+        ),
+    ]
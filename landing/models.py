@@ -1,4 +1,150 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import TruncDay, TruncHour
+from django.db.models.lookups import Exact
+from django.utils import timezone
+
+
+# pks por consulta al leer los valores previos en bulk_update
+LOTE_PKS = 500
+
+
+def _deposito_segun(tipo):
+    """
+    Expresión SQL del depósito del catálogo para `tipo` (nombre de campo,
+    F() u otra expresión): un CASE con los montos vigentes, así el valor se
+    calcula en la base para todas las filas de un mismo UPDATE.
+    """
+    from . import catalogo
+
+    if isinstance(tipo, str):
+        tipo = F(tipo)
+    campo = Reserva._meta.get_field('deposito')
+    return Case(
+        *[When(Exact(tipo, Value(t)), then=Value(p['deposito'])) for t, p in catalogo.obtener().productos.items()],
+        default=Value(catalogo.deposito(None)),
+        output_field=campo,
+    )
+
+
+class ReservaQuerySet(models.QuerySet):
+    """
+    Mantiene `deposito` = depósito del catálogo para `tipo` también en las
+    operaciones masivas, que no pasan por Reserva.save(): bulk_create y
+    bulk_update lo asignan en memoria (una lectura del catálogo para todo el
+    lote) y update(tipo=...) lo agrega al mismo UPDATE.
+
+    Como tampoco disparan señales, estos métodos actualizan en la misma
+    transacción lo que las señales mantienen para save()/delete(): los
+    contadores de Metrica, los rollups de Resumen y la versión de los
+    fragmentos cacheados.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.deposito = Reserva.deposito_para(obj.tipo)
+        with transaction.atomic():
+            creados = super().bulk_create(objs, *args, **kwargs)
+            # bulk_create ya asignó `creado` (auto_now_add)
+            self._sincronizar([(None, (obj.creado, obj.tipo, obj.deposito), 1) for obj in objs])
+        return creados
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        fields = list(fields)
+        if not {'tipo', 'deposito', 'creado'} & set(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        objs = list(objs)
+        if {'tipo', 'deposito'} & set(fields):
+            for obj in objs:
+                obj.deposito = Reserva.deposito_para(obj.tipo)
+            fields = list(dict.fromkeys(fields + ['tipo', 'deposito']))
+        with transaction.atomic():
+            previos = {}
+            for i in range(0, len(objs), LOTE_PKS):
+                pks = [obj.pk for obj in objs[i:i + LOTE_PKS]]
+                previos.update(
+                    (pk, (creado, tipo, deposito)) for pk, creado, tipo, deposito
+                    in Reserva.objects.filter(pk__in=pks).values_list('pk', 'creado', 'tipo', 'deposito')
+                )
+            # bulk_update de Django termina en self.filter().update(): sobre un
+            # QuerySet simple para no contar dos veces el cambio de tipo
+            filas = models.QuerySet(self.model, using=self.db).bulk_update(objs, fields, *args, **kwargs)
+            self._sincronizar([
+                (previos[obj.pk], (obj.creado, obj.tipo, obj.deposito), 1) for obj in objs if obj.pk in previos
+            ])
+        return filas
+
+    def update(self, **kwargs):
+        if 'tipo' not in kwargs:
+            return super().update(**kwargs)
+        tipo = kwargs['tipo']
+        # el SET se evalúa con los valores previos de la fila: la misma
+        # expresión de `tipo` da el tipo nuevo. F() no hereda de Expression,
+        # así que se reconoce por resolve_expression como hace el ORM
+        es_expresion = hasattr(tipo, 'resolve_expression')
+        kwargs['deposito'] = _deposito_segun(tipo) if es_expresion else Reserva.deposito_para(tipo)
+        nuevo = tipo if es_expresion else Value(tipo, output_field=models.CharField())
+        with transaction.atomic():
+            movimientos = self._movimientos(nuevo)
+            filas = super().update(**kwargs)
+            self._sincronizar(movimientos)
+        return filas
+
+    update.alters_data = True
+
+    def recalcular_depositos(self):
+        """Reescribe el depósito de todas las filas según el catálogo, en un solo UPDATE."""
+        with transaction.atomic():
+            movimientos = self._movimientos(F('tipo'))
+            filas = super().update(deposito=_deposito_segun('tipo'))
+            self._sincronizar(movimientos)
+        return filas
+
+    recalcular_depositos.alters_data = True
+
+    def _movimientos(self, nuevo):
+        """
+        Movimientos para _sincronizar de un UPDATE que deja `tipo` = `nuevo`
+        (y el depósito del catálogo), leídos antes con un GROUP BY por hora y tipo.
+        """
+        filas = (
+            self.order_by().annotate(hora=TruncHour('creado'), tipo_nuevo=nuevo)
+            .values('hora', 'tipo', 'tipo_nuevo').annotate(cantidad=Count('pk'), monto=Sum('deposito'))
+        )
+        return [
+            ((f['hora'], f['tipo'], f['monto']),
+             (f['hora'], f['tipo_nuevo'], f['cantidad'] * Reserva.deposito_para(f['tipo_nuevo'])),
+             f['cantidad'])
+            for f in filas
+        ]
+
+    def _sincronizar(self, movimientos):
+        """
+        Aplica [(previo, nuevo, cantidad)] a Metrica, Resumen y los fragmentos.
+        `previo` y `nuevo` son (creado, tipo, depósito total); previo es None
+        para filas nuevas.
+        """
+        from . import fragments
+
+        deltas = {}
+        resumen = []
+        for previo, nuevo, cantidad in movimientos:
+            if previo == nuevo:
+                continue
+            for estado, signo in ((previo, -1), (nuevo, 1)):
+                if estado is None:
+                    continue
+                creado, tipo, monto = estado
+                resumen.append(Resumen.deltas(Resumen.RESERVAS, tipo, creado, signo * cantidad, signo * monto))
+                if previo is None or previo[1] != nuevo[1]:
+                    # en un cambio de tipo el total de reservas se compensa
+                    for clave in (Metrica.RESERVAS, Metrica.clave_tipo(tipo)):
+                        deltas[clave] = deltas.get(clave, 0) + signo * cantidad
+        Resumen.objects.incrementar(Resumen.sumar_deltas(*resumen))
+        if any(deltas.values()):
+            Metrica.objects.incrementar(deltas)
+            fragments.bump(Reserva._meta.label)
 
 
 class Reserva(models.Model):
@@ -17,23 +163,48 @@ class Reserva(models.Model):
     deposito = models.DecimalField(max_digits=10, decimal_places=2, default=50000.00)
     creado = models.DateTimeField(auto_now_add=True)
 
+    objects = ReservaQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # filtros del admin / exportación por tipo y rango de fechas
+            models.Index(fields=['tipo', 'creado'], name='reserva_tipo_creado_idx'),
+            models.Index(fields=['creado'], name='reserva_creado_idx'),
+        ]
+
     def __str__(self):
         return f"{self.nombre} <{self.email}> - {self.tipo}"
 
+    @staticmethod
+    def deposito_para(tipo):
+        # depósito según el catálogo de precios (Producto), cacheado por proceso
+        from . import catalogo
+
+        return catalogo.deposito(tipo)
+
     def save(self, *args, **kwargs):
         # asegurar depósito consistente según tipo al guardar
-        if self.tipo == 'teclado':
-            self.deposito = 50000.00
-        elif self.tipo == 'kit':
-            self.deposito = 80000.00
-        elif self.tipo == 'pilot':
-            # empresas no pagan depósito
-            self.deposito = 0.00
-        else:
-            self.deposito = 50000.00
+        self.deposito = self.deposito_para(self.tipo)
         super().save(*args, **kwargs)
 
 
+class Producto(models.Model):
+    """
+    Catálogo de precios: única fuente del precio y el depósito de cada tipo
+    de reserva. Se lee a través de `landing.catalogo`.
+    """
+    tipo = models.CharField(max_length=50, choices=Reserva.TIPOS, primary_key=True)
+    titulo = models.CharField(max_length=120)
+    precio = models.DecimalField(max_digits=10, decimal_places=2)
+    deposito = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        ordering = ['precio']
+
+    def __str__(self):
+        return f"{self.titulo} ({self.tipo})"
+
+
 class Feedback(models.Model):
     RATING_CHOICES = [(i, str(i)) for i in range(1, 6)]
     nombre = models.CharField(max_length=120, blank=True)
@@ -42,5 +213,236 @@ class Feedback(models.Model):
     comentario = models.TextField(blank=True)
     creado = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # testimonios publicados de la home: rating >= 4 ordenados por fecha
+            models.Index(fields=['-creado'], condition=models.Q(rating__gte=4), name='feedback_publicado_idx'),
+            models.Index(fields=['rating', 'creado'], name='feedback_rating_creado_idx'),
+            models.Index(fields=['creado'], name='feedback_creado_idx'),
+        ]
+
     def __str__(self):
         return f"Feedback {self.rating} by {self.nombre or self.email or 'anon'}"
+
+
+class MetricaManager(models.Manager):
+    def leer(self, *claves):
+        """
+        Devuelve {clave: valor} para las claves pedidas en una sola consulta
+        por clave primaria. Las claves ausentes valen 0.
+        """
+        valores = dict(self.filter(pk__in=claves).values_list('clave', 'valor'))
+        return {clave: valores.get(clave, 0) for clave in claves}
+
+    async def aleer(self, *claves):
+        valores = {clave: valor async for clave, valor in self.filter(pk__in=claves).values_list('clave', 'valor')}
+        return {clave: valores.get(clave, 0) for clave in claves}
+
+    def incrementar(self, deltas):
+        """
+        Aplica {clave: delta} con expresiones F para que escrituras
+        concurrentes no se pisen. Crea la fila si aún no existe.
+        """
+        with transaction.atomic():
+            faltantes = {}
+            for clave, delta in deltas.items():
+                if delta and not self.filter(pk=clave).update(valor=F('valor') + delta):
+                    faltantes[clave] = delta
+            if not faltantes:
+                return
+            # se crean en cero con un solo INSERT (ignorando las que otro worker
+            # creó entre medio) y el delta se aplica igual que al resto
+            self.bulk_create([Metrica(clave=clave, valor=0) for clave in faltantes], ignore_conflicts=True)
+            for clave, delta in faltantes.items():
+                self.filter(pk=clave).update(valor=F('valor') + delta)
+
+    def reconstruir(self):
+        """
+        Recalcula todas las métricas desde las tablas de origen y las
+        reemplaza. Devuelve el diccionario con los valores nuevos.
+        """
+        valores = {Metrica.RESERVAS: 0}
+        for tipo, _ in Reserva.TIPOS:
+            valores[Metrica.clave_tipo(tipo)] = 0
+        for tipo, total in Reserva.objects.values_list('tipo').annotate(total=Count('id')).order_by():
+            valores[Metrica.clave_tipo(tipo)] = total
+            valores[Metrica.RESERVAS] += total
+        ratings = Feedback.objects.aggregate(suma=Sum('rating'), total=Count('id'))
+        valores[Metrica.RATING_SUMA] = ratings['suma'] or 0
+        valores[Metrica.RATING_TOTAL] = ratings['total']
+        from . import fragments
+
+        with transaction.atomic():
+            # las descargas no tienen tabla de origen: se conservan
+            self.exclude(clave__startswith=Metrica.PREFIJO_DESCARGAS).delete()
+            self.bulk_create([Metrica(clave=k, valor=v) for k, v in valores.items()])
+            # el fragmento de estadísticas y el ETag de la home dependen de estos valores
+            fragments.bump(Reserva._meta.label)
+            fragments.bump(Feedback._meta.label)
+        return valores
+
+
+class Metrica(models.Model):
+    """
+    Contadores desnormalizados de la landing (una fila por métrica).
+    Se mantienen desde las señales de Reserva y Feedback y se pueden
+    reconciliar con `manage.py rebuild_metrics`.
+    """
+    RESERVAS = 'reservas'
+    RATING_SUMA = 'rating_suma'
+    RATING_TOTAL = 'rating_total'
+    PREFIJO_DESCARGAS = 'descargas_'
+
+    clave = models.CharField(max_length=50, primary_key=True)
+    valor = models.BigIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    objects = MetricaManager()
+
+    def __str__(self):
+        return f"{self.clave} = {self.valor}"
+
+    @staticmethod
+    def clave_tipo(tipo):
+        return f"reservas_{tipo}"
+
+    @staticmethod
+    def clave_descarga(nombre):
+        return f"{Metrica.PREFIJO_DESCARGAS}{nombre}"
+
+
+class ResumenManager(models.Manager):
+    def incrementar(self, deltas):
+        """
+        Aplica {(serie, periodo, inicio, clave): (cantidad, monto)} en una
+        sola sentencia INSERT ... ON CONFLICT DO UPDATE (SQLite >= 3.24 y
+        PostgreSQL): los buckets que aún no existen se crean con el delta y
+        los demás lo suman en la base, así que escrituras concurrentes no se
+        pisan y la primera reserva de la hora no cuesta consultas extra.
+        """
+        filas = [(clave, delta) for clave, delta in deltas.items() if any(delta)]
+        if not filas:
+            return
+        conexion = connections[self.db]
+        campos = [self.model._meta.get_field(nombre) for nombre in self.model.CAMPOS_BUCKET]
+        cantidad, monto = (self.model._meta.get_field(nombre) for nombre in ('cantidad', 'monto'))
+        parametros = []
+        for clave, (delta_cantidad, delta_monto) in filas:
+            for campo, valor in zip(campos + [cantidad, monto], clave + (delta_cantidad, delta_monto)):
+                parametros.append(campo.get_db_prep_save(valor, conexion))
+        q = conexion.ops.quote_name
+        tabla = q(self.model._meta.db_table)
+        columnas = [q(campo.column) for campo in campos]
+        sumas = ', '.join(f'{c} = {tabla}.{c} + excluded.{c}' for c in (q(cantidad.column), q(monto.column)))
+        marcadores = ', '.join(['(%s)' % ', '.join(['%s'] * (len(campos) + 2))] * len(filas))
+        sql = (
+            f"INSERT INTO {tabla} ({', '.join(columnas)}, {q(cantidad.column)}, {q(monto.column)}) "
+            f"VALUES {marcadores} ON CONFLICT ({', '.join(columnas)}) DO UPDATE SET {sumas}"
+        )
+        with conexion.cursor() as cursor:
+            cursor.execute(sql, parametros)
+
+    def reconstruir(self, desde=None):
+        """
+        Recalcula los buckets desde Reserva y Feedback con GROUP BY (a partir
+        del día de `desde`, o todos) y los reemplaza. Devuelve cuántos escribió.
+        """
+        if desde is not None:
+            desde = Resumen.inicio_de(desde, Resumen.DIA)
+        filas = []
+        fuentes = (
+            (Resumen.RESERVAS, Reserva.objects.all(), 'tipo', Sum('deposito')),
+            (Resumen.FEEDBACK, Feedback.objects.all(), 'rating', Value(0)),
+        )
+        for serie, queryset, campo, monto in fuentes:
+            if desde is not None:
+                queryset = queryset.filter(creado__gte=desde)
+            for periodo, trunc in ((Resumen.HORA, TruncHour), (Resumen.DIA, TruncDay)):
+                agrupado = (
+                    queryset.annotate(bucket=trunc('creado')).values('bucket', campo)
+                    .annotate(cantidad=Count('pk'), suma=monto).order_by()
+                )
+                filas += [
+                    Resumen(serie=serie, periodo=periodo, inicio=f['bucket'], clave=str(f[campo]),
+                            cantidad=f['cantidad'], monto=f['suma'] or 0)
+                    for f in agrupado
+                ]
+        with transaction.atomic():
+            viejos = self.all() if desde is None else self.filter(inicio__gte=desde)
+            viejos.delete()
+            self.bulk_create(filas, batch_size=1000)
+        return len(filas)
+
+
+class Resumen(models.Model):
+    """
+    Rollups de Reserva (por tipo, con la suma de depósitos) y de Feedback
+    (histograma por rating) en buckets por hora y por día. Se mantienen desde
+    las señales y el journal, y se reconstruyen con `manage.py rebuild_rollups`.
+    Se consultan con `landing.resumenes`.
+    """
+    RESERVAS = 'reservas'
+    FEEDBACK = 'feedback'
+    SERIES = ((RESERVAS, 'Reservas por tipo'), (FEEDBACK, 'Feedback por rating'))
+    HORA = 'hora'
+    DIA = 'dia'
+    PERIODOS = ((HORA, 'Hora'), (DIA, 'Día'))
+    # identifican el bucket (resumen_bucket_unico)
+    CAMPOS_BUCKET = ('serie', 'periodo', 'inicio', 'clave')
+
+    serie = models.CharField(max_length=20, choices=SERIES)
+    periodo = models.CharField(max_length=10, choices=PERIODOS)
+    inicio = models.DateTimeField()
+    # tipo de reserva o rating
+    clave = models.CharField(max_length=50)
+    cantidad = models.BigIntegerField(default=0)
+    monto = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    objects = ResumenManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['serie', 'periodo', 'inicio', 'clave'], name='resumen_bucket_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.serie}/{self.periodo} {self.inicio:%Y-%m-%d %H:%M} {self.clave} = {self.cantidad}"
+
+    @staticmethod
+    def inicio_de(momento, periodo):
+        """Inicio del bucket (hora o día, en la zona horaria actual) que contiene `momento`."""
+        local = timezone.localtime(momento)
+        if periodo == Resumen.DIA:
+            return local.replace(hour=0, minute=0, second=0, microsecond=0)
+        return local.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def deltas(serie, clave, creado, cantidad, monto=0):
+        """Deltas para incrementar() de un evento en los buckets de hora y día."""
+        return {
+            (serie, periodo, Resumen.inicio_de(creado, periodo), str(clave)): (cantidad, monto)
+            for periodo in (Resumen.HORA, Resumen.DIA)
+        }
+
+    @staticmethod
+    def sumar_deltas(*deltas):
+        """Suma por bucket varios dicts de deltas; un cambio que no mueve nada queda en (0, 0)."""
+        total = {}
+        for d in deltas:
+            for clave, (cantidad, monto) in d.items():
+                previo = total.get(clave, (0, 0))
+                total[clave] = (previo[0] + cantidad, previo[1] + monto)
+        return total
+
+
+class SegmentoJournal(models.Model):
+    """
+    Segmentos del journal write-behind ya volcados a la base de datos.
+    Se registra en la misma transacción que el bulk_create para que un
+    segmento nunca se inserte dos veces si el worker muere antes de borrarlo.
+    """
+    nombre = models.CharField(max_length=100, primary_key=True)
+    volcado = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.nombre
@@ -0,0 +1,186 @@
+"""
+Cabeceras `Link: rel=preload` (y 103 Early Hints) por página.
+
+Al arrancar se recorre una sola vez el árbol compilado de cada plantilla de
+critico.PAGINAS (siguiendo {% extends %}, bloques e {% include %} con nombre
+constante) y se juntan, en orden de aparición:
+
+- las hojas de `{% critical_css %}` (LANDING_CRITICAL_CSS), as=style;
+- los `{% static %}` de hojas de estilo y fuentes;
+- las imágenes de `{% responsive_image %}` que no son `loading='lazy'`
+  (hasta MAX_IMAGENES), as=image con el imagesrcset del formato preferido.
+
+Las URLs salen de `static()`, así que en producción son las del manifest
+(con hash). `PreloadMiddleware` solo copia la cabecera ya armada a las
+respuestas 200 de esas vistas. `EarlyHints` envuelve la app ASGI y, si el
+servidor ofrece la extensión `http.response.early_hint` (p. ej. Hypercorn),
+manda los mismos enlaces como 103 antes de ejecutar la vista. gunicorn (WSGI)
+no puede enviar respuestas 1xx; detrás de un CDN que soporte Early Hints, la
+cabecera Link de las respuestas basta para que el CDN las genere.
+"""
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template import Context
+from django.template.library import SimpleNode
+from django.template.loader import get_template
+from django.template.loader_tags import BlockNode, ExtendsNode, IncludeNode
+from django.templatetags.static import StaticNode, static
+from django.urls import Resolver404, resolve
+
+from . import critico, imagenes
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGENES = 2
+TIPOS_ESTATICOS = {'.css': 'style', '.woff2': 'font'}
+
+# nombre de vista (landing:home) -> (cabecera Link, enlaces en bytes para el 103)
+_enlaces = None
+
+
+def _valor(expresion):
+    return expresion.resolve(Context())
+
+
+def _nodos(nodelist, bloques):
+    """Nodos en orden de documento, resolviendo herencia e includes constantes."""
+    for nodo in nodelist:
+        if isinstance(nodo, ExtendsNode):
+            propios = {b.name: b for b in nodo.nodelist.get_nodes_by_type(BlockNode)}
+            padre = get_template(_valor(nodo.parent_name)).template
+            # los bloques de la plantilla más derivada ganan
+            yield from _nodos(padre.nodelist, {**propios, **bloques})
+            return
+        if isinstance(nodo, BlockNode):
+            yield from _nodos(bloques.get(nodo.name, nodo).nodelist, bloques)
+        elif isinstance(nodo, IncludeNode):
+            nombre = _valor(nodo.template)
+            if isinstance(nombre, str):
+                yield from _nodos(get_template(nombre).template.nodelist, {})
+        else:
+            yield nodo
+            for atributo in nodo.child_nodelists:
+                yield from _nodos(getattr(nodo, atributo, None) or [], bloques)
+
+
+def _enlace_imagen(nodo):
+    from .templatetags.landing_extras import responsive_image
+
+    if nodo.func is not responsive_image:
+        return None
+    opciones = {k: _valor(v) for k, v in nodo.kwargs.items()}
+    if opciones.get('loading') == 'lazy':
+        return None
+    ruta = _valor(nodo.args[0])
+    prioridad = '; fetchpriority=high' if opciones.get('fetchpriority') == 'high' else ''
+    datos = imagenes.datos(ruta)
+    if not datos:
+        return f'<{static(ruta)}>; rel=preload; as=image{prioridad}'
+    # el primer formato (AVIF): los navegadores que no lo soportan ignoran el preload por `type`
+    tipo, variantes = next(iter(datos['variantes'].items()))
+    srcset = ', '.join(f'{static(nombre)} {ancho}w' for nombre, ancho in variantes)
+    sizes = opciones.get('sizes', '100vw')
+    return (
+        f'<{static(variantes[-1][0])}>; rel=preload; as=image; type="{tipo}"; '
+        f'imagesrcset="{srcset}"; imagesizes="{sizes}"{prioridad}'
+    )
+
+
+def enlaces_plantilla(nombre):
+    """Lista de valores `Link` para la plantilla, en orden de documento."""
+    from .templatetags.landing_extras import critical_css
+
+    estilos, fotos = [], []
+    for nodo in _nodos(get_template(nombre).template.nodelist, {}):
+        if isinstance(nodo, StaticNode):
+            ruta = _valor(nodo.path)
+            tipo = next((t for ext, t in TIPOS_ESTATICOS.items() if ruta.endswith(ext)), None)
+            if tipo:
+                cruzado = '; crossorigin' if tipo == 'font' else ''
+                estilos.append(f'<{static(ruta)}>; rel=preload; as={tipo}{cruzado}')
+        elif isinstance(nodo, SimpleNode):
+            # {% critical_css %} y {% responsive_image %} de landing_extras
+            if nodo.func is critical_css:
+                estilos += [f'<{static(r)}>; rel=preload; as=style' for r in settings.LANDING_CRITICAL_CSS]
+            elif len(fotos) < MAX_IMAGENES:
+                enlace = _enlace_imagen(nodo)
+                if enlace:
+                    fotos.append(enlace)
+    return list(dict.fromkeys(estilos + fotos))
+
+
+def calcular():
+    """Arma (una vez por proceso) las cabeceras de todas las páginas."""
+    global _enlaces
+    enlaces = {}
+    for plantilla, vista in critico.PAGINAS.items():
+        try:
+            valores = enlaces_plantilla(plantilla)
+        except ValueError as e:
+            # p. ej. sin manifest de collectstatic con DEBUG=False
+            logger.warning('preload: sin cabeceras para %s: %s', plantilla, e)
+            continue
+        if valores:
+            enlaces[f'landing:{vista}'] = (', '.join(valores), [v.encode() for v in valores])
+    _enlaces = enlaces
+    return enlaces
+
+
+def para_vista(view_name):
+    """(cabecera, enlaces) de la vista, o None."""
+    if _enlaces is None:
+        calcular()
+    return _enlaces.get(view_name)
+
+
+class PreloadMiddleware:
+    """Agrega la cabecera Link precalculada a las páginas de critico.PAGINAS."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        calcular()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._agregar(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._agregar(request, await self.get_response(request))
+
+    @staticmethod
+    def _agregar(request, response):
+        match = getattr(request, 'resolver_match', None)
+        if match and response.status_code == 200 and request.method in ('GET', 'HEAD'):
+            enlaces = para_vista(match.view_name)
+            if enlaces and 'Link' not in response:
+                response['Link'] = enlaces[0]
+        return response
+
+
+class EarlyHints:
+    """App ASGI que manda un 103 con los preloads antes de la respuesta."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope['type'] == 'http'
+            and scope['method'] in ('GET', 'HEAD')
+            and 'http.response.early_hint' in scope.get('extensions', {})
+        ):
+            try:
+                enlaces = para_vista(resolve(scope['path']).view_name)
+            except Resolver404:
+                enlaces = None
+            if enlaces:
+                await send({'type': 'http.response.early_hint', 'links': enlaces[1]})
+        await self.app(scope, receive, send)
@@ -0,0 +1,346 @@
+"""
+Registro de métricas estilo Prometheus seguro entre workers de gunicorn.
+
+Cada proceso escribe en su propio archivo mmap (`metricas-<esquema>-<pid>.db`)
+de valores float64 con un layout fijo: rutas, códigos de estado, buckets
+del histograma, tipos de reserva y ratings se conocen de antemano, así que
+registrar es buscar un offset en un dict y hacer pack_into, sin locks entre
+workers. `/metrics` suma los archivos de todos los procesos (incluidos los
+de workers ya terminados, para que los contadores no retrocedan) y los
+devuelve en formato de texto de Prometheus.
+"""
+import glob
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+from django.conf import settings
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+ESTADOS = ('200', '201', '204', '206', '301', '302', '304', '400', '403', '404', '405', '412', '416', '429', '500', '503')
+ESTADO_OTRO = 'otro'
+RUTA_ADMIN = 'admin'
+RUTA_OTRA = 'otra'
+RATINGS = ('1', '2', '3', '4', '5')
+# landing.backends.postgresql: gauges (solo procesos vivos) y contadores del pool
+POOL_GAUGES = ('en_uso', 'libres')
+POOL_CONTADORES = ('creadas', 'cerradas', 'checkouts', 'esperas', 'timeouts', 'pings_fallidos')
+ENGINE_POOL = 'landing.backends.postgresql'
+# landing.limites: qué bucket rechazó la petición
+AMBITOS_RATELIMIT = ('ip', 'global')
+# landing.admision: umbral que hizo descartar la petición
+MOTIVOS_ADMISION = ('en_curso', 'latencia', 'espera')
+
+_DOUBLE = struct.Struct('d')
+
+
+@lru_cache(maxsize=None)
+def esquema():
+    """Offsets de cada serie; igual en todos los procesos del mismo deploy."""
+    from .models import Reserva
+    from .urls import urlpatterns
+
+    rutas = tuple(f'landing:{p.name}' for p in urlpatterns if p.name) + (RUTA_ADMIN, RUTA_OTRA)
+    estados = ESTADOS + (ESTADO_OTRO,)
+    tipos = tuple(tipo for tipo, _ in Reserva.TIPOS)
+    pools = tuple(alias for alias, db in settings.DATABASES.items() if db['ENGINE'] == ENGINE_POOL)
+    descargas = tuple(settings.LANDING_DESCARGAS)
+    limitadas = tuple(sorted(settings.LANDING_RATELIMIT))
+    descartables = tuple(settings.LANDING_ADMISION['rutas'])
+    offsets = {}
+    siguiente = 0
+
+    def reservar(clave, slots=1):
+        nonlocal siguiente
+        offsets[clave] = siguiente * _DOUBLE.size
+        siguiente += slots
+
+    for ruta in rutas:
+        for estado in estados:
+            reservar(('peticiones', ruta, estado))
+        # buckets no acumulados + desborde (+Inf) y suma de segundos
+        reservar(('latencia', ruta), len(BUCKETS) + 1)
+        reservar(('latencia_suma', ruta))
+    for tipo in tipos:
+        reservar(('reservas', tipo))
+    for rating in RATINGS:
+        reservar(('feedback', rating))
+    for alias in pools:
+        for nombre in POOL_GAUGES + POOL_CONTADORES:
+            reservar(('pool', alias, nombre))
+    for nombre in descargas:
+        reservar(('descargas', nombre))
+    for vista in limitadas:
+        for ambito in AMBITOS_RATELIMIT:
+            reservar(('rechazos', vista, ambito))
+    for ruta in descartables:
+        for motivo in MOTIVOS_ADMISION:
+            reservar(('descartes', ruta, motivo))
+    reservar(('en_curso',))
+    firma = hashlib.md5(repr(sorted(offsets.items())).encode()).hexdigest()[:10]
+    return {
+        'rutas': rutas, 'estados': estados, 'tipos': tipos, 'pools': pools, 'descargas': descargas,
+        'limitadas': limitadas, 'descartables': descartables, 'offsets': offsets, 'tamano': siguiente * _DOUBLE.size, 'firma': firma,
+    }
+
+
+def _directorio():
+    directorio = str(settings.LANDING_METRICS_DIR)
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+class _ArchivoProceso:
+    """mmap propio del proceso actual; se reabre tras un fork."""
+
+    def __init__(self):
+        self.pid = None
+        self.mm = None
+        # solo lo comparten los hilos de este proceso (p. ej. el flusher del journal)
+        self.lock = threading.Lock()
+
+    def obtener(self):
+        if self.pid != os.getpid():
+            e = esquema()
+            ruta = os.path.join(_directorio(), f"metricas-{e['firma']}-{os.getpid()}.db")
+            with open(ruta, 'a+b') as archivo:
+                if os.path.getsize(ruta) < e['tamano']:
+                    archivo.truncate(e['tamano'])
+                self.mm = mmap.mmap(archivo.fileno(), e['tamano'])
+            self.pid = os.getpid()
+        return self.mm
+
+
+_archivo = _ArchivoProceso()
+
+
+def _sumar(offset, valor):
+    mm = _archivo.obtener()
+    with _archivo.lock:
+        _DOUBLE.pack_into(mm, offset, _DOUBLE.unpack_from(mm, offset)[0] + valor)
+
+
+def ruta_de(view_name):
+    if view_name and view_name.startswith('admin:'):
+        return RUTA_ADMIN
+    if view_name in esquema()['rutas']:
+        return view_name
+    return RUTA_OTRA
+
+
+def registrar_peticion(view_name, status, segundos):
+    e = esquema()
+    offsets = e['offsets']
+    ruta = ruta_de(view_name)
+    estado = str(status)
+    if estado not in ESTADOS:
+        estado = ESTADO_OTRO
+    peticiones = offsets[('peticiones', ruta, estado)]
+    bucket = offsets[('latencia', ruta)] + bisect_left(BUCKETS, segundos) * _DOUBLE.size
+    suma = offsets[('latencia_suma', ruta)]
+    mm = _archivo.obtener()
+    with _archivo.lock:
+        _DOUBLE.pack_into(mm, peticiones, _DOUBLE.unpack_from(mm, peticiones)[0] + 1)
+        _DOUBLE.pack_into(mm, bucket, _DOUBLE.unpack_from(mm, bucket)[0] + 1)
+        _DOUBLE.pack_into(mm, suma, _DOUBLE.unpack_from(mm, suma)[0] + segundos)
+
+
+def registrar_reservas(tipo, cantidad=1):
+    offset = esquema()['offsets'].get(('reservas', tipo))
+    if offset is not None:
+        _sumar(offset, cantidad)
+
+
+def registrar_feedback(rating, cantidad=1):
+    offset = esquema()['offsets'].get(('feedback', str(rating)))
+    if offset is not None:
+        _sumar(offset, cantidad)
+
+
+def registrar_descarga(nombre):
+    offset = esquema()['offsets'].get(('descargas', nombre))
+    if offset is not None:
+        _sumar(offset, 1)
+
+
+def registrar_rechazo(vista, ambito):
+    offset = esquema()['offsets'].get(('rechazos', vista, ambito))
+    if offset is not None:
+        _sumar(offset, 1)
+
+
+def registrar_descarte(ruta, motivo):
+    offset = esquema()['offsets'].get(('descartes', ruta, motivo))
+    if offset is not None:
+        _sumar(offset, 1)
+
+
+def registrar_en_curso(valor):
+    """Peticiones en curso en este proceso (valor absoluto)."""
+    mm = _archivo.obtener()
+    with _archivo.lock:
+        _DOUBLE.pack_into(mm, esquema()['offsets'][('en_curso',)], valor)
+
+
+def registrar_pool(alias, estadisticas):
+    """Copia las estadísticas del pool de este proceso (valores absolutos)."""
+    offsets = esquema()['offsets']
+    mm = _archivo.obtener()
+    with _archivo.lock:
+        for nombre in POOL_GAUGES + POOL_CONTADORES:
+            _DOUBLE.pack_into(mm, offsets[('pool', alias, nombre)], estadisticas[nombre])
+
+
+def limpiar():
+    """Borra los archivos de métricas (lo llama gunicorn al arrancar el master)."""
+    for ruta in glob.glob(os.path.join(_directorio(), 'metricas-*.db')):
+        os.remove(ruta)
+
+
+def _vivo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _totales():
+    """Suma de todos los procesos, y aparte solo de los que siguen vivos (gauges)."""
+    e = esquema()
+    n = e['tamano'] // _DOUBLE.size
+    totales = [0.0] * n
+    vivos = [0.0] * n
+    for ruta in glob.glob(os.path.join(_directorio(), f"metricas-{e['firma']}-*.db")):
+        with open(ruta, 'rb') as archivo:
+            datos = archivo.read(e['tamano'])
+        if len(datos) < e['tamano']:
+            continue
+        valores = struct.unpack(f'{n}d', datos)
+        for i, valor in enumerate(valores):
+            totales[i] += valor
+        if _vivo(int(ruta.rsplit('-', 1)[1].split('.')[0])):
+            for i, valor in enumerate(valores):
+                vivos[i] += valor
+    return totales, vivos
+
+
+def peticiones(rutas):
+    """{ruta: {estado: total}} de todos los procesos, sin pasar por el texto de /metrics."""
+    e = esquema()
+    totales, _ = _totales()
+    return {
+        ruta: {
+            estado: totales[e['offsets'][('peticiones', ruta, estado)] // _DOUBLE.size]
+            for estado in e['estados']
+        }
+        for ruta in rutas
+    }
+
+
+def _fmt(valor):
+    return str(int(valor)) if valor == int(valor) else repr(valor)
+
+
+def exposicion():
+    """Texto en formato de exposición de Prometheus (0.0.4)."""
+    e = esquema()
+    totales, vivos = _totales()
+
+    def valor(clave, extra=0, fuente=totales):
+        return fuente[(e['offsets'][clave] // _DOUBLE.size) + extra]
+
+    lineas = [
+        '# HELP landing_http_requests_total Peticiones HTTP por ruta y código de estado.',
+        '# TYPE landing_http_requests_total counter',
+    ]
+    for ruta in e['rutas']:
+        for estado in e['estados']:
+            v = valor(('peticiones', ruta, estado))
+            if v:
+                lineas.append(f'landing_http_requests_total{{route="{ruta}",status="{estado}"}} {_fmt(v)}')
+
+    lineas += [
+        '# HELP landing_http_request_duration_seconds Latencia de las peticiones por ruta.',
+        '# TYPE landing_http_request_duration_seconds histogram',
+    ]
+    for ruta in e['rutas']:
+        acumulado = 0.0
+        for i, limite in enumerate(BUCKETS + (float('inf'),)):
+            acumulado += valor(('latencia', ruta), i)
+            le = '+Inf' if limite == float('inf') else repr(limite)
+            lineas.append(f'landing_http_request_duration_seconds_bucket{{route="{ruta}",le="{le}"}} {_fmt(acumulado)}')
+        lineas.append(f'landing_http_request_duration_seconds_sum{{route="{ruta}"}} {valor(("latencia_suma", ruta))!r}')
+        lineas.append(f'landing_http_request_duration_seconds_count{{route="{ruta}"}} {_fmt(acumulado)}')
+
+    lineas += [
+        '# HELP landing_reservas_creadas_total Reservas creadas por tipo.',
+        '# TYPE landing_reservas_creadas_total counter',
+    ]
+    for tipo in e['tipos']:
+        lineas.append(f'landing_reservas_creadas_total{{tipo="{tipo}"}} {_fmt(valor(("reservas", tipo)))}')
+
+    lineas += [
+        '# HELP landing_feedback_total Feedback recibido por rating.',
+        '# TYPE landing_feedback_total counter',
+    ]
+    for rating in RATINGS:
+        lineas.append(f'landing_feedback_total{{rating="{rating}"}} {_fmt(valor(("feedback", rating)))}')
+
+    if e['descargas']:
+        lineas += [
+            '# HELP landing_descargas_total Descargas de LANDING_DESCARGAS (desde el byte 0).',
+            '# TYPE landing_descargas_total counter',
+        ]
+        for nombre in e['descargas']:
+            lineas.append(f'landing_descargas_total{{archivo="{nombre}"}} {_fmt(valor(("descargas", nombre)))}')
+
+    if e['limitadas']:
+        lineas += [
+            '# HELP landing_ratelimit_rechazos_total POST rechazados con 429 por vista y bucket.',
+            '# TYPE landing_ratelimit_rechazos_total counter',
+        ]
+        for vista in e['limitadas']:
+            for ambito in AMBITOS_RATELIMIT:
+                v = valor(('rechazos', vista, ambito))
+                lineas.append(f'landing_ratelimit_rechazos_total{{route="{vista}",ambito="{ambito}"}} {_fmt(v)}')
+
+    if e['descartables']:
+        lineas += [
+            '# HELP landing_admision_descartadas_total Peticiones respondidas con 503 por sobrecarga, por ruta y motivo.',
+            '# TYPE landing_admision_descartadas_total counter',
+        ]
+        for ruta in e['descartables']:
+            for motivo in MOTIVOS_ADMISION:
+                v = valor(('descartes', ruta, motivo))
+                lineas.append(f'landing_admision_descartadas_total{{route="{ruta}",motivo="{motivo}"}} {_fmt(v)}')
+    lineas += [
+        '# HELP landing_http_requests_in_flight Peticiones en curso (procesos vivos).',
+        '# TYPE landing_http_requests_in_flight gauge',
+        f"landing_http_requests_in_flight {_fmt(valor(('en_curso',), fuente=vivos))}",
+    ]
+
+    if e['pools']:
+        lineas += [
+            '# HELP landing_db_pool_connections Conexiones del pool por estado (procesos vivos).',
+            '# TYPE landing_db_pool_connections gauge',
+        ]
+        for alias in e['pools']:
+            for nombre in POOL_GAUGES:
+                v = valor(('pool', alias, nombre), fuente=vivos)
+                lineas.append(f'landing_db_pool_connections{{alias="{alias}",estado="{nombre}"}} {_fmt(v)}')
+        for nombre in POOL_CONTADORES:
+            lineas += [
+                f'# HELP landing_db_pool_{nombre}_total Pool de conexiones: {nombre}.',
+                f'# TYPE landing_db_pool_{nombre}_total counter',
+            ]
+            for alias in e['pools']:
+                v = valor(('pool', alias, nombre))
+                lineas.append(f'landing_db_pool_{nombre}_total{{alias="{alias}"}} {_fmt(v)}')
+    return '\n'.join(lineas) + '\n'
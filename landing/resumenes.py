@@ -0,0 +1,83 @@
+"""
+Consultas sobre los rollups de Resumen (reservas por tipo, feedback por
+rating) para reportes y dashboards.
+
+Todo se lee de los buckets por hora o por día, así que el costo depende de
+la cantidad de buckets del rango y no de la cantidad de reservas. Semana
+(desde el lunes) y mes se agrupan en Python a partir de los buckets
+diarios. Los límites `desde`/`hasta` se alinean al inicio del bucket que
+los contiene.
+"""
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from .models import Resumen
+
+SEMANA = 'semana'
+MES = 'mes'
+PERIODOS = (Resumen.HORA, Resumen.DIA, SEMANA, MES)
+RATINGS = (1, 2, 3, 4, 5)
+
+Valor = namedtuple('Valor', 'cantidad monto')
+
+
+def _buckets(serie, periodo, desde, hasta):
+    queryset = Resumen.objects.filter(serie=serie, periodo=periodo)
+    if desde is not None:
+        queryset = queryset.filter(inicio__gte=Resumen.inicio_de(desde, periodo))
+    if hasta is not None:
+        queryset = queryset.filter(inicio__lt=hasta)
+    return queryset
+
+
+def _agrupar(inicio, periodo):
+    if periodo == SEMANA:
+        return inicio - timedelta(days=inicio.weekday())
+    if periodo == MES:
+        return inicio.replace(day=1)
+    return inicio
+
+
+def serie(nombre, periodo=Resumen.DIA, desde=None, hasta=None):
+    """
+    [(inicio, {clave: Valor}), ...] ordenado por inicio, solo con los
+    periodos que tienen datos. `nombre` es Resumen.RESERVAS (clave = tipo,
+    monto = depósitos) o Resumen.FEEDBACK (clave = rating).
+    """
+    if periodo not in PERIODOS:
+        raise ValueError(f'Periodo desconocido: {periodo}')
+    base = periodo if periodo in (Resumen.HORA, Resumen.DIA) else Resumen.DIA
+    puntos = {}
+    filas = _buckets(nombre, base, desde, hasta).order_by('inicio').values_list('inicio', 'clave', 'cantidad', 'monto')
+    for inicio, clave, cantidad, monto in filas:
+        if not cantidad:
+            continue
+        valores = puntos.setdefault(_agrupar(Resumen.inicio_de(inicio, base), periodo), {})
+        previo = valores.get(clave, Valor(0, Decimal(0)))
+        valores[clave] = Valor(previo.cantidad + cantidad, previo.monto + monto)
+    return list(puntos.items())
+
+
+def totales(nombre, desde=None, hasta=None):
+    """{clave: Valor} del rango (todo si no se acota), sumando los buckets diarios en la base."""
+    filas = (
+        _buckets(nombre, Resumen.DIA, desde, hasta).values('clave')
+        .annotate(cantidad=Sum('cantidad'), monto=Sum('monto')).order_by()
+    )
+    return {f['clave']: Valor(f['cantidad'], f['monto']) for f in filas if f['cantidad']}
+
+
+def histograma_ratings(desde=None, hasta=None):
+    """{rating: cantidad} con los cinco ratings, aunque no tengan feedback."""
+    conteos = totales(Resumen.FEEDBACK, desde, hasta)
+    return {r: conteos[str(r)].cantidad if str(r) in conteos else 0 for r in RATINGS}
+
+
+def rating_promedio(histograma):
+    total = sum(histograma.values())
+    if not total:
+        return None
+    return sum(int(r) * n for r, n in histograma.items()) / total
@@ -0,0 +1,122 @@
+"""
+Búsqueda indexada para los changelists del admin.
+
+SQLite: tablas FTS5 con tokenizer trigram (búsqueda por subcadena, sin
+distinguir mayúsculas, igual que `icontains`) sincronizadas por triggers,
+así también cubren bulk_create y el journal write-behind.
+Postgres: índices GIN trigram sobre `UPPER(col::text)`, la expresión que
+Django genera para `icontains`, de modo que la búsqueda normal del admin
+los usa sin cambios.
+
+Ojo: en SQLite, una migración que reconstruya la tabla (AlterField, etc.)
+borra los triggers; después hay que correr `manage.py rebuild_search_index`.
+"""
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.text import smart_split, unescape_string_literal
+
+INDICES = {
+    'landing_reserva': ('nombre', 'email'),
+    'landing_feedback': ('nombre', 'email', 'comentario'),
+}
+# el tokenizer trigram no puede buscar términos más cortos
+TRIGRAM_MIN = 3
+
+
+def _fts(tabla):
+    return f'{tabla}_fts'
+
+
+def _sql_sqlite(tabla, columnas):
+    fts = _fts(tabla)
+    cols = ', '.join(columnas)
+    nuevos = ', '.join(f'new.{c}' for c in columnas)
+    viejos = ', '.join(f'old.{c}' for c in columnas)
+    borrar = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {viejos});"
+    insertar = f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {nuevos});'
+    return [
+        f'DROP TRIGGER IF EXISTS {fts}_ai',
+        f'DROP TRIGGER IF EXISTS {fts}_ad',
+        f'DROP TRIGGER IF EXISTS {fts}_au',
+        f'DROP TABLE IF EXISTS {fts}',
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{tabla}', content_rowid='id', tokenize='trigram')",
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {tabla} BEGIN {insertar} END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {tabla} BEGIN {borrar} END',
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {tabla} BEGIN {borrar} {insertar} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _sql_postgres(tabla, columnas):
+    return ['CREATE EXTENSION IF NOT EXISTS pg_trgm'] + [
+        f'CREATE INDEX IF NOT EXISTS {tabla}_{col}_trgm ON {tabla} USING gin (UPPER("{col}"::text) gin_trgm_ops)'
+        for col in columnas
+    ]
+
+
+def _sql_borrar(vendor, tabla, columnas):
+    if vendor == 'sqlite':
+        fts = _fts(tabla)
+        return [f'DROP TRIGGER IF EXISTS {fts}_{t}' for t in ('ai', 'ad', 'au')] + [f'DROP TABLE IF EXISTS {fts}']
+    if vendor == 'postgresql':
+        return [f'DROP INDEX IF EXISTS {tabla}_{col}_trgm' for col in columnas]
+    return []
+
+
+def soportado(conn):
+    if conn.vendor == 'sqlite':
+        import sqlite3
+        return sqlite3.sqlite_version_info >= (3, 34, 0)
+    return conn.vendor == 'postgresql'
+
+
+def instalar(conn):
+    """Crea (o recrea y reindexa) los índices de búsqueda para la BD actual."""
+    if not soportado(conn):
+        return False
+    generar = _sql_sqlite if conn.vendor == 'sqlite' else _sql_postgres
+    with conn.cursor() as cursor:
+        for tabla, columnas in INDICES.items():
+            for sql in generar(tabla, columnas):
+                cursor.execute(sql)
+    return True
+
+
+def desinstalar(conn):
+    with conn.cursor() as cursor:
+        for tabla, columnas in INDICES.items():
+            for sql in _sql_borrar(conn.vendor, tabla, columnas):
+                cursor.execute(sql)
+
+
+def _expresion_fts(termino):
+    # cada palabra (o "frase entre comillas") debe aparecer, como en el admin
+    palabras = []
+    for bit in smart_split(termino):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit:
+            palabras.append(bit)
+    if not palabras or any(len(p) < TRIGRAM_MIN for p in palabras):
+        return None
+    return ' AND '.join('"%s"' % p.replace('"', '""') for p in palabras)
+
+
+class BusquedaIndexadaMixin:
+    """
+    Para ModelAdmin: en SQLite resuelve `search_fields` con la tabla FTS5;
+    en Postgres (o con términos cortos) usa la búsqueda estándar, que allí
+    ya está cubierta por los índices trigram.
+    """
+    # el conteo total del changelist es un COUNT(*) de toda la tabla
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        tabla = self.model._meta.db_table
+        if connection.vendor == 'sqlite' and tabla in INDICES and soportado(connection):
+            expresion = _expresion_fts(search_term)
+            if expresion:
+                fts = _fts(tabla)
+                ids = RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', (expresion,))
+                return queryset.filter(pk__in=ids), False
+        return super().get_search_results(request, queryset, search_term)
@@ -0,0 +1,110 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from django.db import transaction
+
+from . import fragments, prometheus
+from .models import Feedback, Metrica, Producto, Reserva, Resumen
+
+
+def _deltas_reserva(tipo, signo):
+    return {Metrica.RESERVAS: signo, Metrica.clave_tipo(tipo): signo}
+
+
+def _deltas_feedback(rating, signo):
+    return {Metrica.RATING_SUMA: signo * rating, Metrica.RATING_TOTAL: signo}
+
+
+def _sumar(*deltas):
+    total = {}
+    for d in deltas:
+        for clave, valor in d.items():
+            total[clave] = total.get(clave, 0) + valor
+    return total
+
+
+def _resumen_reserva(tipo, deposito, creado, signo):
+    return Resumen.deltas(Resumen.RESERVAS, tipo, creado, signo, signo * deposito)
+
+
+def _resumen_feedback(rating, creado, signo):
+    return Resumen.deltas(Resumen.FEEDBACK, rating, creado, signo)
+
+
+@receiver(pre_save, sender=Reserva)
+@receiver(pre_save, sender=Feedback)
+def recordar_valores_previos(sender, instance, raw=False, **kwargs):
+    # solo las ediciones (admin) necesitan leer la fila anterior
+    if raw or instance._state.adding or instance.pk is None:
+        instance._previo = None
+        return
+    # `creado` decide el bucket de Resumen: si se edita, el evento cambia de hora
+    if sender is Reserva:
+        # el depósito también puede cambiar (se recalcula con el catálogo vigente)
+        instance._previo = sender.objects.filter(pk=instance.pk).values_list('tipo', 'deposito', 'creado').first()
+    else:
+        instance._previo = sender.objects.filter(pk=instance.pk).values_list('rating', 'creado').first()
+
+
+@receiver(post_save, sender=Reserva)
+def reserva_guardada(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previo = getattr(instance, '_previo', None)
+    if created:
+        Metrica.objects.incrementar(_deltas_reserva(instance.tipo, 1))
+        Resumen.objects.incrementar(_resumen_reserva(instance.tipo, instance.deposito, instance.creado, 1))
+        transaction.on_commit(lambda: prometheus.registrar_reservas(instance.tipo))
+    elif previo is not None and previo != (instance.tipo, instance.deposito, instance.creado):
+        tipo_previo, deposito_previo, creado_previo = previo
+        if tipo_previo != instance.tipo:
+            Metrica.objects.incrementar(_sumar(
+                _deltas_reserva(tipo_previo, -1), _deltas_reserva(instance.tipo, 1),
+            ))
+        Resumen.objects.incrementar(Resumen.sumar_deltas(
+            _resumen_reserva(tipo_previo, deposito_previo, creado_previo, -1),
+            _resumen_reserva(instance.tipo, instance.deposito, instance.creado, 1),
+        ))
+
+
+@receiver(post_delete, sender=Reserva)
+def reserva_eliminada(sender, instance, **kwargs):
+    Metrica.objects.incrementar(_deltas_reserva(instance.tipo, -1))
+    Resumen.objects.incrementar(_resumen_reserva(instance.tipo, instance.deposito, instance.creado, -1))
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_guardado(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previo = getattr(instance, '_previo', None)
+    if created:
+        Metrica.objects.incrementar(_deltas_feedback(instance.rating, 1))
+        Resumen.objects.incrementar(_resumen_feedback(instance.rating, instance.creado, 1))
+        transaction.on_commit(lambda: prometheus.registrar_feedback(instance.rating))
+    elif previo is not None and previo != (instance.rating, instance.creado):
+        rating_previo, creado_previo = previo
+        if rating_previo != instance.rating:
+            Metrica.objects.incrementar({Metrica.RATING_SUMA: instance.rating - rating_previo})
+        Resumen.objects.incrementar(Resumen.sumar_deltas(
+            _resumen_feedback(rating_previo, creado_previo, -1),
+            _resumen_feedback(instance.rating, instance.creado, 1),
+        ))
+
+
+@receiver(post_delete, sender=Feedback)
+def feedback_eliminado(sender, instance, **kwargs):
+    Metrica.objects.incrementar(_deltas_feedback(instance.rating, -1))
+    Resumen.objects.incrementar(_resumen_feedback(instance.rating, instance.creado, -1))
+
+
+@receiver(post_save, sender=Reserva)
+@receiver(post_delete, sender=Reserva)
+@receiver(post_save, sender=Feedback)
+@receiver(post_delete, sender=Feedback)
+@receiver(post_save, sender=Producto)
+@receiver(post_delete, sender=Producto)
+def invalidar_fragmentos(sender, raw=False, **kwargs):
+    if raw:
+        return
+    fragments.bump(sender._meta.label)
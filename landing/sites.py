@@ -0,0 +1,27 @@
+from django.contrib import admin
+from django.urls import path, reverse
+
+from . import dashboard
+
+
+class LandingAdminSite(admin.AdminSite):
+    """Admin por defecto (LandingAdminConfig) con el dashboard de la landing."""
+
+    def get_urls(self):
+        return [
+            path('landing/dashboard/', self.admin_view(lambda request: dashboard.vista(request, self)),
+                 name='landing_dashboard'),
+        ] + super().get_urls()
+
+    def get_app_list(self, request, app_label=None):
+        app_list = super().get_app_list(request, app_label)
+        if not request.user.has_perm(dashboard.PERMISO):
+            return app_list
+        for app in app_list:
+            if app['app_label'] == 'landing':
+                app['models'].insert(0, {
+                    'name': 'Dashboard', 'object_name': 'Dashboard', 'perms': {'view': True},
+                    'admin_url': reverse('admin:landing_dashboard', current_app=self.name),
+                    'add_url': None, 'view_only': True,
+                })
+        return app_list
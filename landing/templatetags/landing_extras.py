@@ -0,0 +1,105 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from .. import critico, fragments, imagenes
+
+register = template.Library()
+
+# un día; la invalidación real la hacen las señales
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, nombre, dependencias):
+        self.nodelist = nodelist
+        self.nombre = nombre
+        self.dependencias = dependencias
+
+    def render(self, context):
+        nombre = self.nombre.resolve(context)
+        labels = [dep.resolve(context) for dep in self.dependencias]
+        html, versiones = fragments.obtener(nombre, labels)
+        if html is None:
+            html = self.nodelist.render(context)
+            fragments.guardar(nombre, versiones, html, FRAGMENT_TIMEOUT)
+        return html
+
+
+@register.tag
+def cachedfragment(parser, token):
+    """
+    Cachea el HTML del bloque hasta que cambie alguno de los modelos indicados:
+
+        {% cachedfragment "home_stats" "landing.Reserva" "landing.Feedback" %}
+          ...
+        {% endcachedfragment %}
+
+    Las variables que usa el bloque deberían ser perezosas (querysets,
+    SimpleLazyObject) para que un acierto no haga consultas.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' requiere un nombre y al menos un modelo del que depende."
+        )
+    nodelist = parser.parse(('endcachedfragment',))
+    parser.delete_first_token()
+    return CachedFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
+
+
+@register.simple_tag
+def responsive_image(ruta, alt='', sizes='100vw', lqip=True, **atributos):
+    """
+    <picture> con variantes AVIF/WebP (srcset por ancho), ancho y alto
+    intrínsecos y placeholder borroso mientras carga:
+
+        {% responsive_image 'landing/img.png' alt='Demo' sizes='(max-width: 992px) 100vw, 960px' class='x' loading='lazy' %}
+
+    Si la imagen no tiene variantes generadas cae a un <img> simple.
+    """
+    datos = imagenes.datos(ruta)
+    extra = format_html_join('', ' {}="{}"', ((k.replace('_', '-'), v) for k, v in atributos.items()))
+    if not datos:
+        return format_html('<img src="{}" alt="{}"{}>', static(ruta), alt, extra)
+    fuentes = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (tipo, ', '.join(f'{static(nombre)} {ancho}w' for nombre, ancho in variantes), sizes)
+            for tipo, variantes in datos['variantes'].items()
+        ),
+    )
+    estilo = format_html(
+        ' style="background:center/cover no-repeat url({})"', datos['lqip'],
+    ) if lqip else ''
+    return format_html(
+        '<picture class="responsive-image">{}<img src="{}" width="{}" height="{}" alt="{}" decoding="async"{}{}></picture>',
+        fuentes, static(ruta), datos['ancho'], datos['alto'], alt, estilo, extra,
+    )
+
+
+@register.simple_tag(takes_context=True)
+def critical_css(context):
+    """
+    Hojas de LANDING_CRITICAL_CSS: con CSS crítico generado para la página
+    (`manage.py build_critical_css`) lo inserta en línea y carga las hojas
+    completas sin bloquear el render; si no, <link> normales.
+    """
+    plantilla = context.template.origin.template_name if context.template else None
+    css = critico.obtener(plantilla) if plantilla else None
+    hojas = [static(ruta) for ruta in settings.LANDING_CRITICAL_CSS]
+    if css is None:
+        return format_html_join('\n', '<link rel="stylesheet" href="{}">', ((h,) for h in hojas))
+    # el CSS sale de nuestras propias hojas; solo se evita cerrar el <style>
+    enlaces = format_html_join(
+        '\n', '<link rel="stylesheet" href="{0}" media="print" onload="this.media=\'all\'">'
+        '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+        ((h,) for h in hojas),
+    )
+    return format_html('<style>{}</style>\n{}', mark_safe(css.replace('</', '<\\/')), enlaces)
@@ -0,0 +1,38 @@
+import shutil
+import tempfile
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class LandingTestRunner(DiscoverRunner):
+    """
+    Corre las pruebas con los directorios que la landing escribe (bundles,
+    variantes de imágenes, CSS crítico, buckets de rate limiting, métricas,
+    cache) en un directorio temporal: ni el árbol fuente (build/) ni el
+    estado compartido en /tmp de un servidor de desarrollo se tocan.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.temporal = tempfile.mkdtemp(prefix='landing-tests-')
+        self.ajustes = override_settings(
+            LANDING_BUNDLES_DIR=f'{self.temporal}/bundles',
+            LANDING_IMAGENES_DIR=f'{self.temporal}/imagenes',
+            LANDING_CRITICAL_CSS_DIR=f'{self.temporal}/critico',
+            LANDING_RATELIMIT_DIR=f'{self.temporal}/ratelimit',
+            LANDING_METRICS_DIR=f'{self.temporal}/metrics',
+            LANDING_JOURNAL_DIR=f'{self.temporal}/journal',
+            CACHES={
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': f'{self.temporal}/cache',
+                },
+            },
+        )
+        self.ajustes.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.ajustes.disable()
+        shutil.rmtree(self.temporal, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,25 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from landing import admision
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdmisionTests(TestCase):
+    def setUp(self):
+        parche = mock.patch.object(admision, 'estado', admision._Estado())
+        self.estado = parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_paginas_de_la_landing_alimentan_la_latencia(self):
+        self.client.get(reverse('landing:gracias'))
+        self.assertGreater(self.estado.latencia, 0)
+
+    def test_admin_y_otras_rutas_no_cuentan(self):
+        for url in (reverse('admin:login'), reverse('landing:ready'), '/no-existe/'):
+            with self.subTest(url):
+                self.client.get(url)
+        self.assertEqual(self.estado.latencia, 0)
+        self.assertEqual(self.estado.en_curso, 0)
@@ -0,0 +1,36 @@
+import re
+
+from asgiref.sync import SyncToAsync
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    LANDING_WRITE_BEHIND=False,
+    LANDING_SERVER_TIMING=True,
+)
+class ASGITests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def assertMedido(self, response):
+        # Server-Timing: consultas del ORM y render de la TemplateResponse
+        timing = response['Server-Timing']
+        self.assertNotIn('desc="0 consultas"', timing)
+        self.assertGreater(float(re.search(r'tpl;dur=([\d.]+)', timing)[1]), 0)
+
+    def test_cadena_de_middleware_async(self):
+        # un solo middleware solo-sync obliga a correr en un hilo todo lo que
+        # está por encima, y entonces el tope de la cadena queda adaptado
+        self.assertNotIsInstance(ASGIHandler()._middleware_chain, SyncToAsync)
+
+    async def test_asgi_mide_consultas_y_plantillas(self):
+        response = await self.async_client.get(reverse('landing:home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertMedido(response)
+
+    def test_wsgi_mide_consultas_y_plantillas(self):
+        self.assertMedido(self.client.get(reverse('landing:home')))
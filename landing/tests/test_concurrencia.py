@@ -0,0 +1,77 @@
+import copy
+import shutil
+import tempfile
+import threading
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test import TransactionTestCase
+
+from landing.models import Metrica, Reserva
+
+ESCRITORES = 8
+ESCRITURAS = 25
+
+
+def _usar(ajustes):
+    # como check_sqlite_concurrency: cada hilo abre su conexión con estos ajustes
+    connections['default'].close()
+    connections.settings['default'] = ajustes
+    del connections['default']
+
+
+@skipUnless(connection.vendor == 'sqlite', 'solo aplica a SQLite')
+class ConcurrenciaSQLiteTests(TransactionTestCase):
+    """
+    ESCRITORES hilos escriben a la vez sobre un archivo SQLite con
+    LANDING_SQLITE_PROFILE (WAL, BEGIN IMMEDIATE, reintentos), como los
+    workers de gunicorn, y ninguno debe recibir "database is locked".
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temporal = tempfile.mkdtemp(prefix='landing-sqlite-')
+        cls.original = connections.settings['default']
+        perfil = copy.deepcopy(cls.original)
+        perfil.update(copy.deepcopy(settings.LANDING_SQLITE_PROFILE), NAME=f'{cls.temporal}/concurrencia.sqlite3')
+        _usar(perfil)
+        call_command('migrate', verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        _usar(cls.original)
+        shutil.rmtree(cls.temporal, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_escritores_en_paralelo_sin_bloqueos(self):
+        errores = []
+        barrera = threading.Barrier(ESCRITORES)
+
+        def escritor(indice):
+            barrera.wait()
+            try:
+                for i in range(ESCRITURAS):
+                    try:
+                        # un POST de reservar (INSERT + Metrica y Resumen) intercalado
+                        # con lecturas del admin, que sin WAL bloquean al escritor
+                        Reserva.objects.create(nombre=f'Escritor {indice}', email=f'w{indice}-{i}@example.com', tipo='kit')
+                        Metrica.objects.leer(Metrica.RESERVAS)
+                        list(Reserva.objects.filter(tipo='kit').values_list('email', flat=True))
+                    except OperationalError as e:
+                        errores.append(str(e))
+            finally:
+                connection.close()
+
+        hilos = [threading.Thread(target=escritor, args=(i,)) for i in range(ESCRITORES)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        total = ESCRITORES * ESCRITURAS
+        self.assertEqual(Reserva.objects.count(), total)
+        self.assertEqual(Metrica.objects.leer(Metrica.RESERVAS)[Metrica.RESERVAS], total)
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from landing.models import Feedback
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class GetCondicionalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def assertNoModificado(self, url, **cabeceras):
+        response = self.client.get(url, **cabeceras)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        return response
+
+    def test_home_con_cookie_csrf(self):
+        url = reverse('landing:home')
+        # la primera visita recibe la cookie CSRF
+        self.client.get(url)
+        self.assertIn(settings.CSRF_COOKIE_NAME, self.client.cookies)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        self.assertNoModificado(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_home_sin_cookie_csrf_se_renderiza(self):
+        url = reverse('landing:home')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        self.client.cookies.clear()
+        for cabeceras in ({'HTTP_IF_NONE_MATCH': etag}, {'HTTP_IF_MODIFIED_SINCE': 'Fri, 01 Jan 2100 00:00:00 GMT'}):
+            with self.subTest(cabeceras):
+                response = self.client.get(url, **cabeceras)
+                self.assertEqual(response.status_code, 200)
+                # el formulario de feedback lleva un token para la cookie nueva
+                self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+                self.client.cookies.clear()
+
+    def test_home_cambia_con_un_feedback(self):
+        url = reverse('landing:home')
+        self.client.get(url)
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(nombre='Ana', rating=5)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_paginas_estaticas(self):
+        for nombre in ('landing:empresas', 'landing:gracias'):
+            url = reverse(nombre)
+            with self.subTest(nombre):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNoModificado(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertNoModificado(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                # un ETag distinto gana sobre If-Modified-Since
+                response = self.client.get(
+                    url, HTTP_IF_NONE_MATCH='"otro"', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+                )
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from landing.models import Feedback, Metrica, Reserva
+
+
+class ContadoresTests(TestCase):
+    """Las señales mantienen Metrica igual a lo que reconstruir() calcula desde las tablas."""
+
+    def setUp(self):
+        cache.clear()
+
+    def assertConsistente(self):
+        contadores = Metrica.objects.exclude(clave__startswith=Metrica.PREFIJO_DESCARGAS)
+        actuales = dict(contadores.values_list('clave', 'valor'))
+        reconstruidas = Metrica.objects.reconstruir()
+        self.assertEqual({k: actuales.get(k, 0) for k in reconstruidas}, reconstruidas)
+
+    def test_reserva_creada_editada_y_borrada(self):
+        ana = Reserva.objects.create(nombre='Ana', email='ana@example.com', tipo='kit')
+        Reserva.objects.create(nombre='Beto', email='beto@example.com', tipo='pilot')
+        self.assertEqual(Metrica.objects.leer(Metrica.RESERVAS)[Metrica.RESERVAS], 2)
+        self.assertConsistente()
+
+        ana.tipo = 'teclado'
+        ana.save()
+        valores = Metrica.objects.leer(Metrica.RESERVAS, Metrica.clave_tipo('kit'), Metrica.clave_tipo('teclado'))
+        self.assertEqual(list(valores.values()), [2, 0, 1])
+        self.assertConsistente()
+
+        # editar sin cambiar el tipo no mueve contadores
+        ana.nombre = 'Ana María'
+        ana.save()
+        self.assertConsistente()
+
+        ana.delete()
+        self.assertEqual(Metrica.objects.leer(Metrica.RESERVAS)[Metrica.RESERVAS], 1)
+        self.assertConsistente()
+
+    def test_feedback_creado_editado_y_borrado(self):
+        feedback = Feedback.objects.create(nombre='Ana', rating=3)
+        Feedback.objects.create(nombre='Beto', rating=5)
+        feedback.rating = 4
+        feedback.save()
+        self.assertEqual(
+            Metrica.objects.leer(Metrica.RATING_SUMA, Metrica.RATING_TOTAL),
+            {Metrica.RATING_SUMA: 9, Metrica.RATING_TOTAL: 2},
+        )
+        self.assertConsistente()
+        feedback.delete()
+        self.assertConsistente()
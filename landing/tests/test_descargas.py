@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+CONTENIDO = bytes(range(256)) * 4
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class DescargasTests(SimpleTestCase):
+    def setUp(self):
+        directorio = tempfile.mkdtemp(prefix='landing-descargas-')
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        with open(os.path.join(directorio, 'manual.pdf'), 'wb') as archivo:
+            archivo.write(CONTENIDO)
+        ajustes = override_settings(STATICFILES_DIRS=[directorio], LANDING_DESCARGAS={'manual.pdf': 'manual.pdf'})
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        # el conteo (Metrica, hilo de volcado) no es parte de estas pruebas
+        parche = mock.patch('landing.descargas.contar')
+        self.contar = parche.start()
+        self.addCleanup(parche.stop)
+        self.url = reverse('landing:descarga', args=['manual.pdf'])
+
+    def pedir(self, metodo='get', **cabeceras):
+        response = getattr(self.client, metodo)(self.url, **cabeceras)
+        self.addCleanup(response.close)
+        return response
+
+    def cuerpo(self, response):
+        return b''.join(response.streaming_content)
+
+    def assertParcial(self, response, inicio, fin):
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {inicio}-{fin}/{len(CONTENIDO)}')
+        self.assertEqual(self.cuerpo(response), CONTENIDO[inicio:fin + 1])
+
+    def assertCompleto(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Range', response)
+        self.assertEqual(self.cuerpo(response), CONTENIDO)
+
+    def test_archivo_completo(self):
+        response = self.pedir()
+        self.assertCompleto(response)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(CONTENIDO)))
+        self.contar.assert_called_once_with('manual.pdf')
+
+    def test_rango(self):
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=10-19'), 10, 19)
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=1000-'), 1000, 1023)
+        # el fin se recorta al tamaño del archivo
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=1020-5000'), 1020, 1023)
+        # solo cuentan las descargas que empiezan en el byte 0
+        self.contar.assert_not_called()
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=0-99'), 0, 99)
+        self.contar.assert_called_once_with('manual.pdf')
+
+    def test_rango_sufijo(self):
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=-5'), 1019, 1023)
+        # un sufijo mayor que el archivo es el archivo completo, como 206
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=-5000'), 0, 1023)
+
+    def test_rango_no_satisfacible(self):
+        for rango in ('bytes=1024-', 'bytes=2000-3000', 'bytes=-0'):
+            with self.subTest(rango):
+                response = self.pedir(HTTP_RANGE=rango)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENIDO)}')
+
+    def test_rangos_ignorados(self):
+        # varios rangos, sintaxis inválida o fin antes del inicio: archivo completo
+        for rango in ('bytes=0-1,5-6', 'bytes=a-b', 'items=0-1', 'bytes=20-10'):
+            with self.subTest(rango):
+                self.assertCompleto(self.pedir(HTTP_RANGE=rango))
+
+    def test_if_range(self):
+        completo = self.pedir()
+        etag, fecha = completo['ETag'], completo['Last-Modified']
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=etag), 10, 19)
+        self.assertParcial(self.pedir(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=fecha), 10, 19)
+        for if_range in ('"otro"', f'W/{etag}', 'Thu, 01 Jan 1970 00:00:00 GMT'):
+            with self.subTest(if_range):
+                self.assertCompleto(self.pedir(HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE=if_range))
+
+    def test_head(self):
+        response = self.pedir('head')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(CONTENIDO)))
+        self.assertEqual(response.content, b'')
+        response = self.pedir('head', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(CONTENIDO)}')
+        self.contar.assert_not_called()
+
+    def test_condicional(self):
+        completo = self.pedir()
+        response = self.pedir(HTTP_IF_NONE_MATCH=completo['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], completo['ETag'])
+
+    def test_descarga_desconocida(self):
+        self.assertEqual(self.client.get(reverse('landing:descarga', args=['otro.pdf'])).status_code, 404)
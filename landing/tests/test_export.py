@@ -0,0 +1,23 @@
+import csv
+import io
+
+from django.test import TestCase
+
+from landing import export
+from landing.models import Feedback
+
+
+class ExportCSVTests(TestCase):
+    def test_textos_con_formula_se_neutralizan(self):
+        comentarios = ['=HYPERLINK("http://x")', '+1', '-2', '@SUM(A1)', '\tx', '\rx', 'normal', 'a=b']
+        for comentario in comentarios:
+            Feedback.objects.create(nombre='Ana', rating=5, comentario=comentario)
+
+        filas = list(csv.reader(io.StringIO(''.join(export.lineas(Feedback.objects.all(), 'csv')))))
+        indice = filas[0].index('comentario')
+        self.assertEqual(
+            [fila[indice] for fila in filas[1:]],
+            ["'" + c for c in comentarios[:6]] + ['normal', 'a=b'],
+        )
+        # los números no se tocan
+        self.assertEqual({fila[filas[0].index('rating')] for fila in filas[1:]}, {'5'})
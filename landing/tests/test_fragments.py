@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import connection
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from landing.models import Feedback, Reserva
+
+PLANTILLA = Template(
+    '{% load landing_extras %}'
+    '{% cachedfragment "prueba" "landing.Feedback" %}{{ valor }}{% endcachedfragment %}'
+)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class FragmentosTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def render(self, valor):
+        return PLANTILLA.render(Context({'valor': valor}))
+
+    def test_se_invalida_al_cambiar_su_modelo(self):
+        self.assertEqual(self.render(1), '1')
+        self.assertEqual(self.render(2), '1')
+        # otro modelo no lo invalida
+        with self.captureOnCommitCallbacks(execute=True):
+            Reserva.objects.create(nombre='Ana', email='ana@example.com', tipo='kit')
+        self.assertEqual(self.render(2), '1')
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback = Feedback.objects.create(nombre='Ana', rating=5)
+        self.assertEqual(self.render(2), '2')
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback.delete()
+        self.assertEqual(self.render(3), '3')
+
+    def test_testimonios_de_la_home(self):
+        url = reverse('landing:home')
+        self.assertNotContains(self.client.get(url), 'Teclas muy suaves')
+        # un acierto no consulta Feedback
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(url)
+        self.assertFalse([q for q in consultas if 'landing_feedback' in q['sql']])
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(nombre='Ana', rating=5, comentario='Teclas muy suaves')
+        self.assertContains(self.client.get(url), 'Teclas muy suaves')
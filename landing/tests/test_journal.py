@@ -0,0 +1,59 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from landing import journal
+from landing.models import Feedback, Reserva, Resumen
+
+
+@mock.patch('landing.journal.iniciar_flusher')
+class JournalTests(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix='landing-journal-')
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        ajustes = override_settings(LANDING_JOURNAL_DIR=self.directorio)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def escribir_segmento(self, nombre, registros):
+        with open(os.path.join(self.directorio, nombre), 'w', encoding='utf-8') as archivo:
+            for registro in registros:
+                archivo.write(json.dumps(registro) + '\n')
+
+    def test_creado_es_la_hora_del_post(self, _):
+        hace = timezone.now().replace(microsecond=0) - timedelta(hours=3)
+        with mock.patch('landing.journal.timezone.now', return_value=hace):
+            journal.anotar('reserva', {'nombre': 'Ana', 'email': 'ana@example.com', 'telefono': '', 'tipo': 'kit'})
+            journal.anotar('feedback', {'nombre': 'Ana', 'email': '', 'rating': 5, 'comentario': ''})
+
+        self.assertEqual(journal.drenar(), 2)
+        self.assertEqual(Reserva.objects.get().creado, hace)
+        self.assertEqual(Feedback.objects.get().creado, hace)
+        # los rollups quedan en el bucket de la hora del POST, no en el del volcado
+        hora = Resumen.inicio_de(hace, Resumen.HORA)
+        for serie, clave in ((Resumen.RESERVAS, 'kit'), (Resumen.FEEDBACK, '5')):
+            with self.subTest(serie):
+                buckets = Resumen.objects.filter(serie=serie, periodo=Resumen.HORA, clave=clave, cantidad__gt=0)
+                self.assertEqual(list(buckets.values_list('inicio', flat=True)), [hora])
+
+    def test_segmento_invalido_queda_en_cuarentena(self, _):
+        self.escribir_segmento('segmento-1.ndjson', [{'m': 'reserva', 'd': {'columna_inexistente': 1}}])
+        self.escribir_segmento('segmento-2.ndjson', [
+            {'m': 'feedback', 't': timezone.now().isoformat(), 'd': {'nombre': 'Ana', 'rating': 4}},
+        ])
+
+        with self.assertLogs('landing.journal', 'ERROR'):
+            self.assertEqual(journal.drenar(), 1)
+        self.assertEqual(Feedback.objects.count(), 1)
+        self.assertEqual(
+            sorted(n for n in os.listdir(self.directorio) if n.endswith('.ndjson')),
+            ['cuarentena-segmento-1.ndjson'],
+        )
+        # en la pasada siguiente la cuarentena ya no se reintenta
+        self.assertEqual(journal.drenar(), 0)
@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from landing.models import Feedback
+
+FEEDBACK = {'nombre': 'Ana', 'rating': 5, 'comentario': 'Muy cómodo'}
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    LANDING_WRITE_BEHIND=False,
+    LANDING_RATELIMIT_PROXIES=0,
+    LANDING_RATELIMIT={'landing:feedback': {'ip': (3, 1 / 60), 'global': (30, 1.0)}},
+)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        # buckets propios: nada de estado compartido con otras corridas en /tmp
+        directorio = tempfile.mkdtemp(prefix='landing-ratelimit-')
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        ajustes = override_settings(LANDING_RATELIMIT_DIR=directorio)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.url = reverse('landing:feedback')
+
+    def assertRechazado(self, response):
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60, response['Retry-After'])
+
+    def test_rafaga_por_ip(self):
+        for _ in range(3):
+            self.assertEqual(self.client.post(self.url, FEEDBACK).status_code, 302)
+        # rechazado sin validar el formulario ni tocar la base
+        with self.assertNumQueries(0):
+            self.assertRechazado(self.client.post(self.url, FEEDBACK))
+        self.assertEqual(Feedback.objects.count(), 3)
+        # otra IP tiene su propio bucket
+        self.assertEqual(self.client.post(self.url, FEEDBACK, REMOTE_ADDR='10.0.0.2').status_code, 302)
+
+    def test_antes_de_csrf(self):
+        cliente = Client(enforce_csrf_checks=True)
+        for _ in range(3):
+            self.assertEqual(cliente.post(self.url, FEEDBACK).status_code, 403)
+        # los POST sin token también gastan el bucket: el 429 llega antes que el 403
+        self.assertRechazado(cliente.post(self.url, FEEDBACK))
+
+    def test_get_no_cuenta(self):
+        for _ in range(5):
+            self.client.get(self.url)
+        self.assertEqual(self.client.post(self.url, FEEDBACK).status_code, 302)
@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class MetricsTests(SimpleTestCase):
+    @override_settings(DEBUG=False, LANDING_METRICS_TOKEN='')
+    def test_sin_token_en_produccion_no_existe(self):
+        self.assertEqual(self.client.get(reverse('landing:metrics')).status_code, 404)
+
+    @override_settings(DEBUG=True, LANDING_METRICS_TOKEN='')
+    def test_sin_token_en_debug_responde(self):
+        self.assertEqual(self.client.get(reverse('landing:metrics')).status_code, 200)
+
+    @override_settings(DEBUG=False, LANDING_METRICS_TOKEN='secreto')
+    def test_con_token_lo_exige(self):
+        url = reverse('landing:metrics')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer otro').status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer secreto')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE', response.content)
@@ -0,0 +1,56 @@
+import io
+import re
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from landing import views
+from landing.models import Feedback, Reserva
+
+# recorrido completo de una tabla de la landing (SQLite / PostgreSQL); recorrer
+# en orden un índice parcial con LIMIT (testimonios) no cuenta
+ESCANEO = re.compile(r'\bSCAN landing_\w+\b(?! USING)|Seq Scan on landing_\w+')
+
+
+class PlanesTests(TestCase):
+    """
+    Las consultas calientes deben resolverse con sus índices: si un cambio
+    de modelo o de consulta hace que el plan recorra la tabla, falla el test.
+    """
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # que el plan refleje los índices disponibles, no el tamaño de la tabla
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsaIndice(self, queryset, indice):
+        plan = queryset.explain()
+        self.assertIn(indice, plan)
+        self.assertIsNone(ESCANEO.search(plan), plan)
+
+    def test_reservas_por_tipo_y_fecha(self):
+        desde = timezone.now() - timedelta(days=7)
+        queryset = Reserva.objects.filter(tipo='kit', creado__gte=desde).order_by('-creado')
+        self.assertUsaIndice(queryset, 'reserva_tipo_creado_idx')
+
+    def test_reservas_por_fecha(self):
+        hasta = timezone.now()
+        queryset = Reserva.objects.filter(creado__gte=hasta - timedelta(days=30), creado__lt=hasta)
+        self.assertUsaIndice(queryset, 'reserva_creado_idx')
+
+    def test_testimonios_de_la_home(self):
+        # índice parcial rating >= 4, ordenado por -creado
+        self.assertUsaIndice(views._testimonios(), 'feedback_publicado_idx')
+
+    def test_feedback_por_rating(self):
+        queryset = Feedback.objects.filter(rating=5).order_by('-creado')
+        self.assertUsaIndice(queryset, 'feedback_rating_creado_idx')
+
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_vistas_y_admin_sin_escaneos(self):
+        # check_query_plans recorre la landing y los changelists; CommandError si algo escanea
+        call_command('check_query_plans', stdout=io.StringIO())
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from landing import catalogo
+from landing.models import Feedback, Metrica, Reserva, Resumen
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    LANDING_WRITE_BEHIND=False,
+    LANDING_RATELIMIT={},
+)
+class PresupuestoSQLTests(TransactionTestCase):
+    """
+    Recorre las vistas en su peor caso (cache vacío, sin métricas ni
+    rollups: la primera reserva de la hora crea los buckets) y falla si
+    PresupuestoSQLMiddleware registra que alguna excedió LANDING_SQL_BUDGETS.
+    """
+    # el catálogo (Producto) viene de una migración de datos
+    serialized_rollback = True
+
+    def setUp(self):
+        cache.clear()
+        Metrica.objects.all().delete()
+        Resumen.objects.all().delete()
+        # el catálogo se recarga una vez por proceso después de un cambio de
+        # versión (aquí, el cache vacío), no en cada petición: se deja
+        # cargado para que el conteo no dependa de cuándo toca revisarlo
+        with mock.patch.object(catalogo, 'INTERVALO_VERSION', 0):
+            catalogo.obtener()
+
+    def pedir(self, metodo, url, datos=None, estado=200):
+        with self.assertNoLogs('landing.sql', 'WARNING'):
+            response = getattr(self.client, metodo)(url, datos)
+        self.assertEqual(response.status_code, estado)
+        return response
+
+    def test_paginas(self):
+        for nombre in ('landing:home', 'landing:reservar', 'landing:empresas', 'landing:gracias'):
+            with self.subTest(nombre):
+                self.pedir('get', reverse(nombre))
+
+    def test_primera_reserva_de_la_hora(self):
+        datos = {'nombre': 'Ana', 'email': 'ana@example.com', 'tipo': 'kit'}
+        self.pedir('post', reverse('landing:reservar'), datos, estado=302)
+        self.pedir('post', reverse('landing:reservar'), datos, estado=302)
+        self.assertEqual(Reserva.objects.count(), 2)
+        self.assertEqual(Metrica.objects.leer(Metrica.RESERVAS)[Metrica.RESERVAS], 2)
+
+    def test_primer_feedback_de_la_hora(self):
+        datos = {'nombre': 'Ana', 'rating': 5, 'comentario': 'Muy cómodo'}
+        self.pedir('post', reverse('landing:feedback'), datos, estado=302)
+        self.pedir('post', reverse('landing:feedback'), datos, estado=302)
+        self.assertEqual(Feedback.objects.count(), 2)
+
+    def test_dashboard(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', None))
+        self.pedir('get', reverse('admin:landing_dashboard'))
@@ -0,0 +1,87 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import Case, Count, F, Value, When
+from django.test import TestCase
+
+from landing.models import Metrica, Producto, Reserva, Resumen
+
+
+class ReservasMasivasTests(TestCase):
+    """
+    Las operaciones masivas de ReservaQuerySet no disparan señales: deben
+    dejar `deposito`, Metrica y Resumen igual que si cada fila pasara por save().
+    """
+
+    def setUp(self):
+        cache.clear()
+        Reserva.objects.bulk_create([
+            Reserva(nombre='Ana', email='ana@example.com', tipo='kit'),
+            Reserva(nombre='Beto', email='beto@example.com', tipo='kit'),
+            Reserva(nombre='Carla', email='carla@example.com', tipo='teclado'),
+            Reserva(nombre='Dora', email='dora@example.com', tipo='pilot'),
+        ])
+
+    def assertSincronizado(self):
+        for reserva in Reserva.objects.all():
+            self.assertEqual(reserva.deposito, Reserva.deposito_para(reserva.tipo), reserva)
+        esperadas = {Metrica.clave_tipo(tipo): 0 for tipo, _ in Reserva.TIPOS}
+        for tipo, total in Reserva.objects.values_list('tipo').annotate(total=Count('pk')).order_by():
+            esperadas[Metrica.clave_tipo(tipo)] = total
+        esperadas[Metrica.RESERVAS] = Reserva.objects.count()
+        self.assertEqual(Metrica.objects.leer(*esperadas), esperadas)
+        # los buckets incrementales coinciden con un GROUP BY sobre Reserva
+        buckets = self.buckets()
+        Resumen.objects.reconstruir()
+        self.assertEqual(buckets, self.buckets())
+
+    def buckets(self):
+        return {
+            (r.serie, r.periodo, r.inicio, r.clave): (r.cantidad, r.monto)
+            for r in Resumen.objects.filter(serie=Resumen.RESERVAS).exclude(cantidad=0, monto=0)
+        }
+
+    def test_bulk_create(self):
+        self.assertEqual(Reserva.objects.get(nombre='Ana').deposito, Decimal('350000'))
+        self.assertEqual(Reserva.objects.get(nombre='Dora').deposito, Decimal('0'))
+        self.assertSincronizado()
+
+    def test_update_con_valor(self):
+        Reserva.objects.filter(tipo='kit').update(tipo='pilot')
+        self.assertFalse(Reserva.objects.filter(tipo='kit').exists())
+        self.assertSincronizado()
+
+    def test_update_con_f_conserva_el_deposito(self):
+        ana = Reserva.objects.get(nombre='Ana')
+        Reserva.objects.filter(pk=ana.pk).update(tipo=F('tipo'))
+        ana.refresh_from_db()
+        self.assertEqual((ana.tipo, ana.deposito), ('kit', Decimal('350000')))
+        self.assertSincronizado()
+
+    def test_update_con_expresion(self):
+        Reserva.objects.update(tipo=Case(When(tipo='kit', then=Value('teclado')), default=Value('kit')))
+        self.assertEqual(
+            dict(Reserva.objects.values_list('nombre', 'tipo')),
+            {'Ana': 'teclado', 'Beto': 'teclado', 'Carla': 'kit', 'Dora': 'kit'},
+        )
+        self.assertSincronizado()
+
+    def test_bulk_update(self):
+        reservas = list(Reserva.objects.order_by('nombre'))
+        reservas[0].tipo = 'teclado'
+        reservas[2].tipo = 'pilot'
+        reservas[3].nombre = 'Dora María'
+        Reserva.objects.bulk_update(reservas, ['tipo', 'nombre'])
+        self.assertEqual(Reserva.objects.get(nombre='Dora María').tipo, 'pilot')
+        self.assertSincronizado()
+
+    def test_recalcular_depositos(self):
+        Producto.objects.filter(tipo='kit').update(deposito=300000)
+        # el catálogo del proceso se vuelve a leer en la próxima consulta
+        with mock.patch('landing.catalogo._actual', None):
+            Reserva.objects.recalcular_depositos()
+            self.assertEqual(
+                set(Reserva.objects.filter(tipo='kit').values_list('deposito', flat=True)), {Decimal('300000')},
+            )
+            self.assertSincronizado()
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from landing.models import Feedback, Reserva, Resumen
+
+
+class RollupsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def buckets(self, serie=Resumen.RESERVAS):
+        """{(periodo, inicio, clave): (cantidad, monto)} sin los buckets que quedaron en cero."""
+        return {
+            (r.periodo, r.inicio, r.clave): (r.cantidad, r.monto)
+            for r in Resumen.objects.filter(serie=serie).exclude(cantidad=0, monto=0)
+        }
+
+    def esperados(self, *eventos):
+        """Buckets de hora y día para [(creado, clave, cantidad, monto)]."""
+        total = Resumen.sumar_deltas(*(
+            Resumen.deltas(Resumen.RESERVAS, clave, creado, cantidad, Decimal(monto))
+            for creado, clave, cantidad, monto in eventos
+        ))
+        return {(periodo, inicio, clave): valores for (_, periodo, inicio, clave), valores in total.items()}
+
+    def test_crear_editar_y_borrar_reserva(self):
+        reserva = Reserva.objects.create(nombre='Ana', email='ana@example.com', tipo='kit')
+        self.assertEqual(self.buckets(), self.esperados((reserva.creado, 'kit', 1, 350000)))
+
+        reserva.tipo = 'teclado'
+        reserva.save()
+        self.assertEqual(self.buckets(), self.esperados((reserva.creado, 'teclado', 1, 250000)))
+
+        # editar la fecha mueve la reserva de bucket de hora y de día
+        reserva.creado -= timedelta(days=2, hours=3)
+        reserva.save()
+        self.assertEqual(self.buckets(), self.esperados((reserva.creado, 'teclado', 1, 250000)))
+
+        reserva.delete()
+        self.assertEqual(self.buckets(), {})
+
+    def test_editar_feedback(self):
+        feedback = Feedback.objects.create(nombre='Ana', rating=3)
+        feedback.rating = 5
+        feedback.creado -= timedelta(hours=5)
+        feedback.save()
+        hora = Resumen.inicio_de(feedback.creado, Resumen.HORA)
+        dia = Resumen.inicio_de(feedback.creado, Resumen.DIA)
+        self.assertEqual(
+            self.buckets(Resumen.FEEDBACK),
+            {(Resumen.HORA, hora, '5'): (1, Decimal('0')), (Resumen.DIA, dia, '5'): (1, Decimal('0'))},
+        )
+
+    def test_rebuild_rollups_coincide_con_reserva(self):
+        ahora = timezone.now()
+        reservas = [
+            Reserva.objects.create(nombre=f'Cliente {i}', email=f'c{i}@example.com', tipo=tipo)
+            for i, tipo in enumerate(['kit', 'kit', 'teclado', 'pilot', 'teclado'])
+        ]
+        for i, reserva in enumerate(reservas):
+            reserva.creado = ahora - timedelta(hours=7 * i)
+            reserva.save()
+        esperados = self.esperados(*((r.creado, r.tipo, 1, r.deposito) for r in Reserva.objects.all()))
+        self.assertEqual(self.buckets(), esperados)
+
+        # desde cero, y solo los días desde --desde sin tocar los anteriores
+        Resumen.objects.all().delete()
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertEqual(self.buckets(), esperados)
+        Resumen.objects.filter(inicio__gte=Resumen.inicio_de(ahora, Resumen.DIA)).update(cantidad=99)
+        desde = timezone.localtime(ahora).strftime('%Y-%m-%d')
+        call_command('rebuild_rollups', desde=desde, stdout=StringIO())
+        self.assertEqual(self.buckets(), esperados)
@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from landing import warmup
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ReadyTests(TestCase):
+    def setUp(self):
+        # proceso sin el hook post_worker_init de gunicorn
+        parche = mock.patch.object(warmup, '_listo', False)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_primera_consulta_precalienta(self):
+        with mock.patch.object(warmup, 'warmup', wraps=warmup.warmup) as precalentar:
+            self.assertEqual(self.client.get(reverse('landing:ready')).status_code, 200)
+            self.assertEqual(self.client.get(reverse('landing:ready')).status_code, 200)
+        precalentar.assert_called_once_with()
+
+    def test_error_responde_503_y_reintenta(self):
+        with mock.patch.object(warmup, 'abrir_conexion', side_effect=OperationalError('sin base')):
+            with self.assertLogs('landing.warmup', 'ERROR'):
+                self.assertEqual(self.client.get(reverse('landing:ready')).status_code, 503)
+        self.assertEqual(self.client.get(reverse('landing:ready')).status_code, 200)
@@ -1,12 +1,21 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.LANDING_ASYNC_VIEWS:
+    from . import async_views as vistas
+else:
+    vistas = views
+
 app_name = 'landing'
 
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('reservar/', views.reservar, name='reservar'),
+    path('', vistas.home, name='home'),
+    path('reservar/', vistas.reservar, name='reservar'),
     path('gracias/', views.gracias, name='gracias'),
-    path('empresas/', views.empresas, name='empresas'),
-    path('feedback/', views.feedback, name='feedback'),
+    path('empresas/', vistas.empresas, name='empresas'),
+    path('feedback/', vistas.feedback, name='feedback'),
+    path('descargas/<str:nombre>', views.descarga, name='descarga'),
+    path('ready/', views.ready, name='ready'),
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -1,103 +1,164 @@
-from django.shortcuts import render, redirect
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.http import condition, require_safe
+from . import catalogo, descargas, journal, prometheus
+from .conditional import (
+    catalogo_etag, catalogo_last_modified, home_etag, plantillas_etag, plantillas_last_modified,
+)
 from .forms import ReservaForm
-from .models import Reserva, Feedback
+from .models import Feedback, Metrica
+from .warmup import asegurar_listo
 
 
-def home(request):
-    # calcular métricas
-    reservas_count = Reserva.objects.count()
-    empresas_count = Reserva.objects.filter(tipo='pilot').count()
-    feedbacks = Feedback.objects.all()
+CLAVES_HOME = (Metrica.RESERVAS, Metrica.clave_tipo('pilot'), Metrica.RATING_SUMA, Metrica.RATING_TOTAL)
+
+
+def _stats_desde(metricas):
     satisfaccion = 0
-    if feedbacks.exists():
-        avg_rating = sum(f.rating for f in feedbacks) / feedbacks.count()
+    if metricas[Metrica.RATING_TOTAL]:
+        avg_rating = metricas[Metrica.RATING_SUMA] / metricas[Metrica.RATING_TOTAL]
         satisfaccion = round(avg_rating * 20)  # convertir 1-5 a porcentaje 20-100
+    return {
+        'reservas_count': metricas[Metrica.RESERVAS],
+        'empresas_count': metricas[Metrica.clave_tipo('pilot')],
+        'satisfaccion': satisfaccion,
+    }
+
+
+def _stats_home():
+    # calcular métricas (tabla desnormalizada, una sola consulta)
+    return _stats_desde(Metrica.objects.leer(*CLAVES_HOME))
 
-    # si llega email desde CTA (GET), lo mostramos en el enlace a reservar
-    cta_email = request.GET.get('email', '')
 
+def _testimonios():
     # testimonios publicados (rating >=4)
-    published_feedbacks = Feedback.objects.filter(rating__gte=4).order_by('-creado')[:6]
+    return Feedback.objects.filter(rating__gte=4).order_by('-creado')[:6]
+
+
+@condition(etag_func=home_etag)
+def home(request):
+    # perezoso: si el fragmento de estadísticas está en cache no se consulta
+    stats = SimpleLazyObject(_stats_home)
+
+    # si llega email desde CTA (GET), lo mostramos en el enlace a reservar
+    cta_email = request.GET.get('email', '')
 
     context = {
-        'reservas_count': reservas_count,
-        'empresas_count': empresas_count,
-        'satisfaccion': satisfaccion,
+        'stats': stats,
         'cta_email': cta_email,
-        'published_feedbacks': published_feedbacks,
+        'published_feedbacks': _testimonios(),
         'fb_error': request.GET.get('fb_error', ''),
+        'catalogo': catalogo.obtener().productos,
     }
-    return render(request, 'landing/home.html', context)
+    return TemplateResponse(request, 'landing/home.html', context)
 
 
-def reservar(request):
+def _form_inicial(request):
     # aceptar prefill via GET
+    initial = {}
+    email = request.GET.get('email')
+    tipo = request.GET.get('tipo')
+    if email:
+        initial['email'] = email
+    if tipo:
+        initial['tipo'] = tipo
+    return ReservaForm(initial=initial)
+
+
+def _contexto_reservar(request, form):
+    # valores iniciales para la plantilla, desde el catálogo cacheado (sin consultas)
+    tipo_effective = request.GET.get('tipo') or (form.initial.get('tipo') if hasattr(form, 'initial') else None) or 'kit'
+    actual = catalogo.obtener()
+    producto = catalogo.producto(tipo_effective) or {}
+    return {
+        'form': form,
+        'request': request,
+        'producto_inicial': producto,
+        'initial_product_price': producto.get('precio_clp', ''),
+        'initial_deposit': producto.get('deposito_clp', ''),
+        # precios de todos los tipos para bundle.js (reservar.js)
+        'catalogo_json': actual.json,
+    }
+
+
+def reservar(request):
     if request.method == 'POST':
         form = ReservaForm(request.POST)
         if form.is_valid():
-            reserva = form.save(commit=False)
-            # establecer deposito según tipo
-            tipo = reserva.tipo
-            # precios del producto
-            if tipo == 'teclado':
-                precio = 250000.00
-                reserva.deposito = precio  # 100% reembolsable
-            elif tipo == 'kit':
-                precio = 350000.00
-                reserva.deposito = precio  # 100% reembolsable
-            elif tipo == 'pilot':
-                precio = 200000.00
-                reserva.deposito = 0.00  # empresas no pagan depósito
+            if settings.LANDING_WRITE_BEHIND:
+                journal.anotar('reserva', form.cleaned_data)
             else:
-                precio = 250000.00
-                reserva.deposito = precio
-            reserva.save()
+                # Reserva.save() toma el depósito del catálogo
+                form.save()
             return redirect(reverse('landing:gracias'))
     else:
-        initial = {}
-        email = request.GET.get('email')
-        tipo = request.GET.get('tipo')
-        if email:
-            initial['email'] = email
-        if tipo:
-            initial['tipo'] = tipo
-        form = ReservaForm(initial=initial)
-    # calcular valores iniciales para mostrar en la plantilla
-    tipo_effective = request.GET.get('tipo') or (form.initial.get('tipo') if hasattr(form, 'initial') else None) or 'kit'
-    if tipo_effective == 'teclado':
-        initial_product_price = 'CLP $250.000'
-        initial_deposit = 'CLP $250.000'
-    elif tipo_effective == 'kit':
-        initial_product_price = 'CLP $350.000'
-        initial_deposit = 'CLP $350.000'
-    elif tipo_effective == 'pilot':
-        initial_product_price = 'CLP $200.000'
-        initial_deposit = 'CLP $0'
-    else:
-        initial_product_price = 'CLP $250.000'
-        initial_deposit = 'CLP $250.000'
-    return render(request, 'landing/reservar.html', {'form': form, 'request': request, 'initial_product_price': initial_product_price, 'initial_deposit': initial_deposit})
+        form = _form_inicial(request)
+    return TemplateResponse(request, 'landing/reservar.html', _contexto_reservar(request, form))
 
 
+@condition(
+    etag_func=plantillas_etag('landing/gracias.html', 'landing/base.html'),
+    last_modified_func=plantillas_last_modified('landing/gracias.html', 'landing/base.html'),
+)
 def gracias(request):
-    return render(request, 'landing/gracias.html')
+    return TemplateResponse(request, 'landing/gracias.html')
 
 
+@condition(
+    etag_func=catalogo_etag('landing/empresas.html', 'landing/base.html'),
+    last_modified_func=catalogo_last_modified('landing/empresas.html', 'landing/base.html'),
+)
 def empresas(request):
-    return render(request, 'landing/empresas.html')
+    return TemplateResponse(request, 'landing/empresas.html', {'catalogo': catalogo.obtener().productos})
+
+
+def _datos_feedback(request):
+    # pequeño formulario manual sin ModelForm
+    nombre = request.POST.get('nombre', '').strip()
+    email = request.POST.get('email', '')
+    rating = int(request.POST.get('rating', 0) or 0)
+    comentario = request.POST.get('comentario', '')
+    return {'nombre': nombre, 'email': email, 'rating': rating, 'comentario': comentario}
 
 
 def feedback(request):
     if request.method == 'POST':
-        # pequeño formulario manual sin ModelForm
-        nombre = request.POST.get('nombre', '').strip()
-        email = request.POST.get('email', '')
-        rating = int(request.POST.get('rating', 0) or 0)
-        comentario = request.POST.get('comentario', '')
+        datos = _datos_feedback(request)
         # nombre obligatorio para publicar feedback
-        if not nombre:
+        if not datos['nombre']:
             return redirect(reverse('landing:home') + '?fb_error=1')
-        if rating and 1 <= rating <= 5:
-            Feedback.objects.create(nombre=nombre, email=email, rating=rating, comentario=comentario)
+        if datos['rating'] and 1 <= datos['rating'] <= 5:
+            if settings.LANDING_WRITE_BEHIND:
+                journal.anotar('feedback', datos)
+            else:
+                Feedback.objects.create(**datos)
     return redirect(reverse('landing:home'))
+
+
+@require_safe
+def descarga(request, nombre):
+    # Range/If-Range, ETag y sendfile: ver landing/descargas.py
+    return descargas.servir(request, nombre)
+
+
+def ready(request):
+    # readiness por worker: 200 solo cuando el precalentamiento terminó
+    # (si ningún hook lo corrió, se hace ahora)
+    if asegurar_listo():
+        return HttpResponse('ok', content_type='text/plain')
+    return HttpResponse('warming up', status=503, content_type='text/plain')
+
+
+def metrics(request):
+    # exposición Prometheus agregada de todos los workers
+    token = settings.LANDING_METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # en producción sin token configurado el endpoint no existe
+        raise Http404
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    return HttpResponse(prometheus.exposicion(), content_type='text/plain; version=0.0.4; charset=utf-8')
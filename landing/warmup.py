@@ -0,0 +1,99 @@
+"""
+Precalentamiento por worker antes de aceptar tráfico.
+
+Lo llama el hook `post_worker_init` de gunicorn (ver gunicorn.conf.py):
+compila las plantillas de la landing en el loader cacheado, llena el
+resolver de URLs, abre la conexión a la base de datos y carga el catálogo
+de precios. La vista `ready` responde 200 solo cuando esto terminó en el
+proceso actual; sin el hook (runserver, uvicorn sin gunicorn.conf.py) la
+primera consulta a /ready/ lo ejecuta.
+"""
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.template.loader import get_template
+from django.urls import get_resolver, resolve, reverse
+
+TEMPLATE_SUBDIRS = ('landing', 'snippets')
+
+logger = logging.getLogger(__name__)
+
+_listo = False
+_lock = threading.Lock()
+
+
+def asegurar_listo():
+    """
+    Precalienta este proceso si el hook de gunicorn no lo hizo. Devuelve si
+    quedó listo; un error (p. ej. la base caída) se registra y se reintenta
+    en la próxima consulta.
+    """
+    if _listo:
+        return True
+    with _lock:
+        if not _listo:
+            try:
+                logger.info('warmup: sin post_worker_init, se precalienta desde /ready/: %s', warmup())
+            except Exception:
+                logger.exception('warmup: falló el precalentamiento')
+    return _listo
+
+
+def _plantillas():
+    for base in settings.TEMPLATES[0]['DIRS']:
+        for subdir in TEMPLATE_SUBDIRS:
+            raiz = os.path.join(base, subdir)
+            for carpeta, _, archivos in os.walk(raiz):
+                for archivo in archivos:
+                    if archivo.endswith('.html'):
+                        yield os.path.relpath(os.path.join(carpeta, archivo), base)
+
+
+def cargar_plantillas():
+    nombres = sorted(_plantillas())
+    for nombre in nombres:
+        get_template(nombre)
+    return len(nombres)
+
+
+def cargar_urls():
+    from .urls import urlpatterns
+
+    get_resolver()._populate()
+    # las rutas con parámetros (descargas/<nombre>) no se pueden revertir sin argumentos
+    nombres = [p.name for p in urlpatterns if p.name and not p.pattern.converters]
+    for nombre in nombres:
+        resolve(reverse(f'landing:{nombre}'))
+    return len(nombres)
+
+
+def abrir_conexion():
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def cargar_catalogo():
+    # la primera reserva no paga la consulta de precios
+    from . import catalogo
+
+    return len(catalogo.obtener().productos)
+
+
+def warmup():
+    """Ejecuta el precalentamiento y devuelve un resumen para el log."""
+    global _listo
+    inicio = time.perf_counter()
+    resumen = {
+        'plantillas': cargar_plantillas(),
+        'urls': cargar_urls(),
+    }
+    abrir_conexion()
+    resumen['productos'] = cargar_catalogo()
+    resumen['ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+    _listo = True
+    return resumen
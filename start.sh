@@ -15,9 +15,26 @@ fi
 echo "[start.sh] Ejecutando migraciones..."
 python manage.py migrate --noinput
 
+echo "[start.sh] Volcando journal write-behind pendiente..."
+python manage.py flush_journal
+
+echo "[start.sh] Poblando rollups de reservas y feedback (solo la primera vez)..."
+python manage.py rebuild_rollups --si-vacio
+
 echo "[start.sh] Ejecutando collectstatic..."
 python manage.py collectstatic --noinput
 
-echo "[start.sh] Arrancando gunicorn..."
+echo "[start.sh] Generando CSS crítico por página..."
+python manage.py build_critical_css
+
 # Bind al puerto que Render expone en $PORT
-exec gunicorn config.wsgi --bind 0.0.0.0:${PORT:-8000} --workers 3 --log-file -
+# gunicorn.conf.py precalienta cada worker antes de aceptar tráfico (/ready/)
+if [ "${DJANGO_SERVER_MODE:-wsgi}" = "asgi" ]; then
+  echo "[start.sh] Arrancando gunicorn (ASGI, workers uvicorn, vistas async)..."
+  export DJANGO_ASYNC_VIEWS=1
+  exec gunicorn config.asgi -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:${PORT:-8000} --workers 3 --log-file -
+fi
+
+echo "[start.sh] Arrancando gunicorn..."
+# con DJANGO_WORKER_THREADS > 1 gunicorn usa workers gthread (settings ajusta LANDING_ADMISION)
+exec gunicorn config.wsgi -c gunicorn.conf.py --bind 0.0.0.0:${PORT:-8000} --workers 3 --threads ${DJANGO_WORKER_THREADS:-1} --log-file -